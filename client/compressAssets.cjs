@@ -0,0 +1,72 @@
+/**
+ * Writes a gzip (.gz) and a brotli (.br) copy of every compressible file of the production build,
+ * so that the Flask server can send them as they are, instead of compressing them on every request.
+ * Run automatically after vite build (see the build script in package.json).
+ */
+
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+// CONSTANTS
+
+/** The location of the production build, starting from the client folder. */
+const DIST_PATH = "./dist";
+
+/** The size, in bytes, from which a file is compressed. Should match COMPRESSION_MIN_SIZE in server/compression.py. */
+const COMPRESSION_MIN_SIZE = 1024;
+
+/** The extensions of the files that are compressed. Images and fonts are already compressed. */
+const COMPRESSIBLE_EXTENSIONS = [".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".xml"];
+
+/** Mapping of the extensions of the compressed copies to their compressors, at their highest levels. */
+const COMPRESSORS = {
+    ".gz": (data) => zlib.gzipSync(data, { level: zlib.constants.Z_BEST_COMPRESSION }),
+    ".br": (data) => zlib.brotliCompressSync(data, {
+        params: {
+            [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+            [zlib.constants.BROTLI_PARAM_SIZE_HINT]: data.length
+        }
+    })
+};
+
+/**
+ * Lists every file in a directory and its subdirectories.
+ *
+ * @param {String} directory the directory.
+ * @returns {String[]} the paths of the files.
+ */
+function listFiles(directory) {
+    return fs.readdirSync(directory, { withFileTypes: true }).flatMap((entry) => {
+        const entryPath = path.join(directory, entry.name);
+        return entry.isDirectory() ? listFiles(entryPath) : [entryPath];
+    });
+}
+
+/**
+ * Writes the compressed copies of a file, unless the file is too small or does not compress well.
+ *
+ * @param {String} filePath the path of the file.
+ * @returns {Number} the number of copies written.
+ */
+function compressFile(filePath) {
+    const data = fs.readFileSync(filePath);
+    if (data.length < COMPRESSION_MIN_SIZE) {
+        return 0;
+    }
+    let written = 0;
+    for (const [extension, compress] of Object.entries(COMPRESSORS)) {
+        const compressed = compress(data);
+        if (compressed.length < data.length) {
+            fs.writeFileSync(filePath + extension, compressed);
+            written++;
+        }
+    }
+    return written;
+}
+
+const files = listFiles(DIST_PATH).filter((filePath) => {
+    return COMPRESSIBLE_EXTENSIONS.includes(path.extname(filePath));
+});
+const written = files.reduce((total, filePath) => total + compressFile(filePath), 0);
+console.log(`Precompressed ${files.length} files of ${DIST_PATH} (${written} copies written).`);
@@ -18,8 +18,11 @@ const SelectedItemContext = createContext();
  */
 const SuperProvider = ({ children }) => {
 
+    // The user's session profile: the user's own information and a summary of each membership
+    // (id, user_id, organization_id, organization_name, role). Anything else is fetched when needed.
     const [currentUser, setCurrentUser] = useState(null);
     const [items, setItems] = useState(null);
+    const [nextItemCursor, setNextItemCursor] = useState(null);
     const [selectedItem, setSelectedItem] = useState(null);
 
     useEffect(() => {
@@ -31,13 +34,39 @@ const SuperProvider = ({ children }) => {
             });
     }, []);
 
-    useEffect(() => {
-        fetch(correctRoute("/items"))
+    /**
+     * Fetches a page of items from the server. The filtering is done by the server,
+     * and the items are returned sorted by name.
+     * 
+     * @param {Object} filters the filters to apply on the items (text and userItemsOnly).
+     * @param {String} cursor the cursor of the page to fetch. If null, the first page is fetched and replaces the current items;
+     * otherwise, the page is appended to the current items.
+     * @returns the fetch promise.
+     */
+    const fetchItems = (filters = { text: "", userItemsOnly: false }, cursor = null) => {
+        const params = new URLSearchParams();
+        if (filters.text) {
+            params.set("name", filters.text);
+        }
+        if (filters.userItemsOnly) {
+            params.set("mine_only", "true");
+        }
+        if (cursor) {
+            params.set("cursor", cursor);
+        }
+        return fetch(correctRoute(`/items?${params}`))
             .then((response) => {
                 if (response.ok) {
-                    return response.json().then((items) => setItems(items));
+                    return response.json().then((page) => {
+                        setItems((currentItems) => cursor ? [...(currentItems ?? []), ...page.items] : page.items);
+                        setNextItemCursor(page.next_cursor);
+                    });
                 }
-            })
+            });
+    };
+
+    useEffect(() => {
+        fetchItems();
     }, [currentUser]);
 
     /**
@@ -72,7 +101,7 @@ const SuperProvider = ({ children }) => {
 
     return (
         <UserContext.Provider value={{ currentUser, setCurrentUser, login, logout }}>
-            <ItemContext.Provider value={{ items, setItems }}>
+            <ItemContext.Provider value={{ items, setItems, nextItemCursor, fetchItems }}>
                 <SelectedItemContext.Provider value={{ selectedItem, setSelectedItem }}>
                     {children}
                 </SelectedItemContext.Provider>
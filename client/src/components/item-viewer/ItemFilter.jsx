@@ -5,6 +5,7 @@ import { useScreenSize } from "../../helperHooks";
  * for searching items.
  * 
  * @version 1.0 7 July 2024 - Filter to show only your items, or to search for items that contain a substring.
+ * @version 1.1 18 October 2026 - Filters are applied by the server (GET /items), instead of on the loaded items.
  * 
  * @param {Object} props
  * @param {Object} props.filters the filter set state value.
@@ -8,14 +8,11 @@ import { useScreenSize } from "../../helperHooks";
  * 
  * @param {Object} props
  * @param {Object} props.user the current user.
- * @param {Array} props.items the items in the system.
- * @param {Object} props.filters the filters to apply on the items.
+ * @param {Array} props.items the items in the system (already filtered by the server).
  * @param {Function} props.onSelectItem the callback function to execute when an ItemCard is clicked on. 
  * @returns a list of items in the system, displayed as a grid.
  */
-export default function ItemList({ user, items, filters, onSelectItem }) {
-
-    // console.log(filters);
+export default function ItemList({ user, items, onSelectItem }) {
 
     const { scaleByWidth, scaleByHeight, scaleByRatio } = useScreenSize();
 
@@ -36,25 +33,6 @@ export default function ItemList({ user, items, filters, onSelectItem }) {
         margin: `${scaleByWidth(25, 'px')} ${scaleByHeight(25, 'px')}`
     };
 
-    /**
-     * Applies the given filters onto the items, so that only such items that
-     * satisfy the filter constraints will be rendered.
-     * 
-     * @returns the filtered list of items.
-     */
-    const filteredItems = () => {
-        if (filters.text === "" && !filters.userItemsOnly) {
-            return items;
-        } else {
-            return items.filter((item) => {
-                return (
-                    (filters.text === "" ? true : item.name.toLowerCase().includes(filters.text.toLowerCase()))
-                    && (!filters.userItemsOnly ? true : item.user_id === user.id)
-                );
-            });
-        }
-    };
-
     /**
      * Sorts the list of items by name.
      * 
@@ -68,7 +46,7 @@ export default function ItemList({ user, items, filters, onSelectItem }) {
         return 0;
     }
 
-    const itemCards = filteredItems()?.toSorted(sortByName).map((item) => {
+    const itemCards = items?.toSorted(sortByName).map((item) => {
         return (
             <li
                 key={item.id}
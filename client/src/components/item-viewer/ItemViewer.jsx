@@ -1,4 +1,4 @@
-import { useState, useContext } from "react";
+import { useState, useContext, useEffect } from "react";
 import "../../styles/components/ItemViewer.css";
 import ItemCardDetail from "./ItemCardDetail";
 import ItemList from "./ItemList";
@@ -15,13 +15,19 @@ import { ItemContext, SelectedItemContext } from "../../SuperContext";
  * @returns a directory of all public and owned items.
  */
 export default function ItemViewer({ user, allowEdits = false }) {
-    const { items, setItems } = useContext(ItemContext);
+    const { items, setItems, nextItemCursor, fetchItems } = useContext(ItemContext);
     const { selectedItem, setSelectedItem } = useContext(SelectedItemContext);
     const [filters, setFilters] = useState({
         text: "",
         userItemsOnly: false
     });
 
+    // Filtering is done by the server, so the first page is refetched shortly after the filters stop changing.
+    useEffect(() => {
+        const timer = setTimeout(() => fetchItems(filters), 300);
+        return () => clearTimeout(timer);
+    }, [filters]);
+
     /**
      * Updates the filters state value according to the type
      * of event.
@@ -78,7 +84,10 @@ export default function ItemViewer({ user, allowEdits = false }) {
                 <ItemCardDetail user={user} item={selectedItem} onUpdate={allowEdits ? updateItem : null} onDelete={deleteItem} />
                 <div>
                     <ItemFilter filters={filters} onChange={handleChange} />
-                    <ItemList user={user} items={items} filters={filters} onSelectItem={setSelectedItem} />
+                    <ItemList user={user} items={items} onSelectItem={setSelectedItem} />
+                    {nextItemCursor ? (
+                        <button onClick={() => fetchItems(filters, nextItemCursor)}>Load More Items</button>
+                    ) : null}
                 </div>
             </div>
         </>
@@ -20,23 +20,31 @@ export default function AdjustQuantityForm({ operation, currentQuantity, assignm
     const labelName = quantityAdjuster.targetOperation === "MINUS" ? "Items Used" : "New Received";
 
     /**
-     * Updates the assigned item's quantity.
+     * Updates the assigned item's quantity. Only the adjustment is sent, and the server applies it
+     * to the quantity that it currently holds, so that adjustments made by other members at the
+     * same time are never overwritten.
      * 
      * @param {Event} e the event. 
      */
     function handleSubmit(e) {
         e.preventDefault();
-        const newQuantity = quantityAdjuster.adjustQuantity(currentQuantity, adjustment);
-        fetch(correctRoute(`/assignments/${assignmentId}`), {
-            method: "PATCH",
+        const delta = quantityAdjuster.adjustQuantity(0, adjustment);
+        fetch(correctRoute(`/assignments/${assignmentId}/adjust`), {
+            method: "POST",
             headers: { "Content-Type": "application/json" },
             body: JSON.stringify({
-                current_quantity: newQuantity
+                delta: delta
             })
         })
-            .then((response) => response.json())
-            .then((data) => {
-                onUpdate(data);
+            .then((response) => response.json().then((data) => (
+                { data, ok: response.ok }
+            )))
+            .then(({ data, ok }) => {
+                if (ok) {
+                    onUpdate(data);
+                } else {
+                    alert(data.message || data.error);
+                }
             })
             .finally(() => {
                 setAdjustment(1);
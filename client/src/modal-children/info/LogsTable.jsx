@@ -1,28 +1,85 @@
+import { useEffect, useRef, useState } from "react";
 import { useScreenSize } from "../../helperHooks";
-import { dtStringToSystemTimeZone } from "../../helpers";
+import { correctRoute, dtStringToSystemTimeZone } from "../../helpers";
 
 /**
- * Renders a modal table of all the organization's logs from the last seven days.
+ * Renders a modal table of the organization's logs from the last seven days, newest first.
+ * The logs are fetched from the server one page at a time, and can be searched by text,
+ * username, and date range.
  * 
  * @param {Object} props
- * @param {Array} props.logs the current organization's logs. 
+ * @param {Number} props.orgId the current organization's id. 
  * @returns a table of the organization's logs.
  */
-export default function LogsTable({ logs }) {
+export default function LogsTable({ orgId }) {
 
     const { scaleByHeight } = useScreenSize();
+    const [logs, setLogs] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [filters, setFilters] = useState({ q: "", username: "", from: "", to: "" });
+    // The request in flight, which is aborted when a newer one is sent, so that a slow response never replaces a newer page.
+    const pendingRequest = useRef(null);
 
     const tableSizing = {
         height: scaleByHeight(500, 'px')
     };
 
-    const sortByTime = (logA, logB) => {
-        if (logA.occurrence < logB.occurrence) return -1;
-        if (logA.occurrence > logB.occurrence) return 1;
-        return 0;
+    /**
+     * Fetches a page of logs from the server, and appends it to the logs already shown.
+     * Any request still in flight is aborted first.
+     * 
+     * @param {String} cursor the cursor of the page to fetch. If null, the newest logs are fetched.
+     */
+    function fetchLogs(cursor = null) {
+        const params = new URLSearchParams();
+        Object.entries(filters).forEach(([name, value]) => {
+            if (value) {
+                params.set(name, value);
+            }
+        });
+        const route = params.size ? `/organizations/${orgId}/logs/search` : `/organizations/${orgId}/logs`;
+        if (cursor) {
+            params.set("before", cursor);
+        }
+        pendingRequest.current?.abort();
+        const controller = new AbortController();
+        pendingRequest.current = controller;
+        fetch(correctRoute(`${route}?${params}`), { signal: controller.signal })
+            .then((response) => {
+                if (response.ok) {
+                    return response.json().then((page) => {
+                        setLogs((currentLogs) => cursor ? [...currentLogs, ...page.logs] : page.logs);
+                        setNextCursor(page.next_cursor);
+                    });
+                }
+            })
+            .catch((error) => {
+                if (error.name !== "AbortError") {
+                    throw error;
+                }
+            });
     }
 
-    const logRows = logs.toSorted(sortByTime).toReversed().map((log, logIndex) => {
+    // The search is done by the server, so the first page is refetched shortly after the filters stop changing,
+    // rather than on every keystroke.
+    useEffect(() => {
+        const timer = setTimeout(() => fetchLogs(), 300);
+        return () => {
+            clearTimeout(timer);
+            pendingRequest.current?.abort();
+        };
+    }, [orgId, filters]);
+
+    /**
+     * Updates a search filter. The first page of matching logs is then fetched, once the filters stop changing.
+     * 
+     * @param {Event} e the event.
+     */
+    function handleFilterChange(e) {
+        setFilters({ ...filters, [e.target.name]: e.target.value });
+    }
+
+    const logRows = logs.map((log, logIndex) => {
 
         /**
          * In this case, it's justified to use the index
@@ -57,6 +114,26 @@ export default function LogsTable({ logs }) {
     return (
         <>
             <h1>Logs</h1>
+            <div id="log-search">
+                <input
+                    name="q"
+                    type="text"
+                    value={filters.q}
+                    onChange={handleFilterChange}
+                    placeholder="Search (e.g. item name)"
+                />
+                <input
+                    name="username"
+                    type="text"
+                    value={filters.username}
+                    onChange={handleFilterChange}
+                    placeholder="Username"
+                />
+                <label htmlFor="logsFrom">From</label>
+                <input id="logsFrom" name="from" type="date" value={filters.from} onChange={handleFilterChange} />
+                <label htmlFor="logsTo">Before</label>
+                <input id="logsTo" name="to" type="date" value={filters.to} onChange={handleFilterChange} />
+            </div>
             <div className="table-container" style={tableSizing}>
                 <table className="modal-table">
                     <thead>
@@ -70,6 +147,9 @@ export default function LogsTable({ logs }) {
                         {logRows}
                     </tbody>
                 </table>
+                {nextCursor ? (
+                    <button onClick={() => fetchLogs(nextCursor)}>Load Older Logs</button>
+                ) : null}
             </div>
         </>
     )
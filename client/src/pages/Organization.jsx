@@ -86,13 +86,13 @@ export default function Organization() {
     /**
      * Updates an assignment's information on the frontend.
      * 
-     * @param {Object} updatedItemAssignment the assignment to update.
+     * @param {Object} updatedItemAssignment the assignment to update (or only its updated attributes, along with its id).
      */
     function updateAssignment(updatedItemAssignment) {
         setOrganization({
             ...organization,
             assignments: organization.assignments.map((assignment) => {
-                return assignment.id !== updatedItemAssignment.id ? assignment : updatedItemAssignment;
+                return assignment.id !== updatedItemAssignment.id ? assignment : { ...assignment, ...updatedItemAssignment };
             })
         });
     }
@@ -237,7 +237,7 @@ export default function Organization() {
             <RequestsTable requests={organization.requests} onProcessRequest={processRequest} />
         ),
         [ButtonId.VIEW_LOGS]: (
-            <LogsTable logs={organization.organization_logs} />
+            <LogsTable orgId={organization.id} />
         ),
         [ButtonId.ABOUT]: (
             <OrgDescription name={organization.name} description={organization.description} />
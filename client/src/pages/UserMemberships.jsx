@@ -1,4 +1,4 @@
-import { useContext, useEffect } from "react";
+import { useContext, useEffect, useState } from "react";
 import { UserContext } from "../SuperContext";
 import StyledTitle from "../components/StyledTitle";
 import BigText from "../components/BigText";
@@ -8,6 +8,7 @@ import { useNavigate } from "react-router-dom";
 import LoadingScreen from "../components/LoadingScreen";
 import { useLoadingTimer, useModalManager } from "../helperHooks";
 import NewOrgForm from "../modal-children/NewOrgForm";
+import { correctRoute } from "../helpers";
 
 /**
  * Displays all the organization and membership details that the current user belongs to.
@@ -17,12 +18,38 @@ import NewOrgForm from "../modal-children/NewOrgForm";
 export default function UserMemberships() {
     const modalManager = useModalManager();
     const { currentUser, setCurrentUser } = useContext(UserContext);
+    const [memberships, setMemberships] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
     const navigate = useNavigate();
 
+    /**
+     * Fetches a page of the user's memberships, along with their organizations, from the server.
+     * The memberships are returned sorted by organization name.
+     * 
+     * @param {String} cursor the cursor of the page to fetch. If null, the first page is fetched and replaces the current memberships;
+     * otherwise, the page is appended to the current memberships.
+     */
+    function fetchMemberships(cursor = null) {
+        const params = new URLSearchParams();
+        if (cursor) {
+            params.set("cursor", cursor);
+        }
+        fetch(correctRoute(`/current_user/memberships?${params}`))
+            .then((response) => {
+                if (response.ok) {
+                    return response.json().then((page) => {
+                        setMemberships((currentMemberships) => cursor ? [...currentMemberships, ...page.memberships] : page.memberships);
+                        setNextCursor(page.next_cursor);
+                    });
+                }
+            });
+    }
+
     useEffect(() => {
         if (!currentUser) {
             return useLoadingTimer(navigate, "/unauthorized", 2000);
         }
+        fetchMemberships();
     }, [currentUser?.id]);
 
     if (!currentUser) {
@@ -42,7 +69,7 @@ export default function UserMemberships() {
         return 0;
     }
 
-    const membershipCards = currentUser.memberships?.toSorted(sortByName).map((membership) => {
+    const membershipCards = memberships.toSorted(sortByName).map((membership) => {
         return (
             <li key={membership.id} className="three-d-round-border">
                 <MembershipCard membership={membership} />
@@ -51,8 +78,8 @@ export default function UserMemberships() {
     });
 
     /**
-     * Updates the currentUser state value by adding a new membership
-     * object to its membership array.
+     * Adds a new membership to the displayed memberships, and a summary of it
+     * to the currentUser state value's membership array.
      * 
      * This function is only called when a user creates a new organization.
      * A membership is added because the user now owns that new organization. 
@@ -60,9 +87,19 @@ export default function UserMemberships() {
      * @param {Object} membershipToAdd the membership to add.
      */
     function addNewMembership(membershipToAdd) {
+        setMemberships([...memberships, membershipToAdd]);
         setCurrentUser({
             ...currentUser,
-            memberships: [...currentUser.memberships, membershipToAdd]
+            memberships: [
+                ...currentUser.memberships,
+                {
+                    id: membershipToAdd.id,
+                    user_id: membershipToAdd.user_id,
+                    organization_id: membershipToAdd.organization_id,
+                    organization_name: membershipToAdd.organization.name,
+                    role: membershipToAdd.role
+                }
+            ]
         });
     }
 
@@ -92,6 +129,9 @@ export default function UserMemberships() {
                 <ul id="membership-list">
                     {membershipCards}
                 </ul>
+                {nextCursor ? (
+                    <button onClick={() => fetchMemberships(nextCursor)}>Load More Organizations</button>
+                ) : null}
             </div>
             {modalManager.modal}
         </>
@@ -6,36 +6,58 @@ from flask import (
     session,
     g,
     render_template,
-    render_template_string,
-    send_from_directory,
-    make_response,
 )
 from flask_restful import Resource
-import datetime
-import pytz
+from sqlalchemy.orm import joinedload, selectinload
 
 # Local imports
 from models.models import *
 from resources.resources import *
-from config import app, db, api, scheduler, send_email
-from model_log_mapping import ModelLogMap
-
-LOG_DURATION_LIMIT = 7
-""" The maximum number of days that a log remains in the organization.
-    This should be more than enough time for admins to read through all
-    their logs.
+from config import app, db, api
+from email_outbox import send_email
+from template_registry import render_html_template
+from log_writer import log_writer
+from identity import get_identity
+from etags import ENDPOINT_VERSIONS, check_etag, not_modified
+from compression import compress_response, send_precompressed, send_static_file
+
+ENDPOINT_LOADER_OPTIONS = {
+    "organization_by_id": (
+        selectinload(Organization.memberships).joinedload(Membership.user),
+        selectinload(Organization.assignments)
+        .joinedload(Assignment.item)
+        .joinedload(Item.user),
+        selectinload(Organization.requests).joinedload(Request.user),
+    ),
+    "item_by_id": (joinedload(Item.user),),
+    "assignment_by_id": (
+        joinedload(Assignment.item).joinedload(Item.user),
+        joinedload(Assignment.organization),
+    ),
+    "membership_by_id": (
+        joinedload(Membership.user),
+        joinedload(Membership.organization),
+    ),
+    "request_by_id": (
+        joinedload(Request.user),
+        joinedload(Request.organization),
+    ),
+}
+""" Relationship loading strategies to apply when fetching a record in get_record_by_id.
+    Every relationship that the endpoint serializes is loaded up front (selectin loading for
+    collections, joined loading for many-to-one), so that serializing a record takes a fixed
+    number of queries, no matter how many rows are related to it.
 """
 
-SCHEDULER_INTERVAL = 86400
-""" The standard interval, in seconds, to execute a background job. """
-
 
 @app.before_request
 def check_if_logged_in():
     """This view will be run to check if there's a logged in user before attempting to access other data.
+    The user's identity is cached per worker (see identity.py), so this usually makes no query.
 
     Returns:
-        JSON: if a user is not logged in, then an "Unauthorized" message will be returned.
+        JSON: if a user is not logged in, then an "Unauthorized" message will be returned; if the user
+        is banned, then the user is logged out and a "Forbidden" message will be returned.
     """
     # breakpoint()
     # print(f"Current endpoint: {request.endpoint}", flush=True)
@@ -54,7 +76,13 @@ def check_if_logged_in():
         "password_reset_form",
         "password_reset",
     ]
-    if not (session.get("user_id") or request.endpoint in endpoint_whitelist):
+    if request.endpoint in endpoint_whitelist:
+        return
+    identity = get_identity()
+    if identity and identity.is_banned:
+        session["user_id"] = None
+        return {"error": "Forbidden! This account is banned."}, 403
+    if not identity:
         # print("Returning unauthorized message", flush=True)
         return {"error": "Unauthorized! You must be logged in ree"}, 401
 
@@ -62,10 +90,12 @@ def check_if_logged_in():
 @app.before_request
 def get_record_by_id():
     """If accessing a model record, this view will run to get the model by id. The correct model will be matched by
-      the endpoint.
+      the endpoint. When getting a record that the client already has the current version of (If-None-Match),
+      the record is not loaded at all.
 
     Returns:
-        any: if the model record does not exist, then a "not found" message will be returned; otherwise, returns nothing.
+        any: if the model record does not exist, then a "not found" message will be returned; if the client's copy
+        of the record is current, then a "not modified" response will be returned; otherwise, returns nothing.
     """
     endpoint_model_map = {
         "user_by_id": User,
@@ -77,7 +107,11 @@ def get_record_by_id():
     }
     if model := endpoint_model_map.get(request.endpoint):
         id = request.view_args.get("id")
-        if record := model.query.filter_by(id=id).first():
+        versions = ENDPOINT_VERSIONS.get(request.endpoint)
+        if request.method == "GET" and versions and check_etag(*versions(id)):
+            return not_modified()
+        loader_options = ENDPOINT_LOADER_OPTIONS.get(request.endpoint, ())
+        if record := model.query.options(*loader_options).filter_by(id=id).first():
             g.record = record
         else:
             return {
@@ -86,84 +120,50 @@ def get_record_by_id():
     # # print(request.endpoint)
 
 
+# after_request functions run in the reverse order of their registration. This one is registered
+# first, so that responses are compressed once everything else is done with them.
+app.after_request(compress_response)
+
+# The built client is served with its precompressed copies, and cached according to its file names.
+app.view_functions["static"] = send_static_file
+
+
 @app.after_request
-def create_log(response):
-    """Creates a new OrganizationLog instance if one of the following took place:
-
-    A user created a new organization.
-    A user updated the organization's information.
-    A user added a new item.
-    A user created a new item assignment.
-    A user updated an assigned item.
-    A user removed an item from the system.
-    An admin removed an item from the organization.
-    An admin updated a user's membership status.
-    An admin removed a user from the organization.
-    An admin accepted a requested user's request to join an organization.
-    A user left the organization.
-    The owner of an organization left and transferred ownership to another member.
-
-    Article of Reference: https://stackoverflow.com/questions/2612610/how-to-access-get-or-set-object-attribute-given-string-corresponding-to-name-o
+def commit_transaction(response):
+    """Ends the unit of work of the request. Resources only flush their changes, so that all the
+    writes of a request are committed in a single transaction. Once committed, the log events recorded
+    by the resources are handed to the log writer.
 
     Args:
         response (Response): the response.
 
     Returns:
-        Response: the response. If a log was created or the organization is deleted, then the response is modified before returning.
+        Response: the response. If the request was not successful, all of its changes are rolled back.
     """
-    endpoint_blacklist = [
-        "signup",
-        "login",
-        "logout",
-        "checksession",
-        "confirm",
-        "index",
-        "static",
-        "get",
-        "currentuser",
-        "contact",
-        "forgotpassword",
-        "password_reset_form",
-        "password_reset",
-        "leave_and_transfer",
-    ]
-    response_loggable = request.method != "GET"
-    status_ok = 200 <= response.status_code < 300
-    is_dict = type(body := response.get_json()) is dict
-    # print(f"AFTER REQUEST ENDPOINT: {request.endpoint}", flush=True)
-    if (
-        (request.endpoint not in endpoint_blacklist)
-        and response_loggable
-        and status_ok
-        and is_dict
-    ):
-        # print(f"JSON: {body}", flush=True)
-        key = list(body.keys())[0]
-        model_log_mapping = ModelLogMap.mappings.get(key)
-        if model_log_mapping:
-            # print(f"Key: {key}", flush=True)
-            # print(f"Map: {model_log_mapping}", flush=True)
-            # print(f"Real Response: {body[key]}", flush=True)
-            user = User.query.filter_by(id=session.get("user_id")).first()
-            # Get appropriate CRUD method
-            map_method = getattr(model_log_mapping, request.method.lower())
-            # Get org_id
-            if key in ["item_l", "assignment_l"] and request.method == "POST":
-                org_id = body[key]["assignment"]["organization_id"]
-            elif key == "organization_l":
-                if request.method == "DELETE":
-                    return make_response(body[key], response.status_code)
-                org_id = body[key]["id"]
-            else:
-                org_id = body[key]["organization_id"]
-            # Create new log.
-            log = OrganizationLog(
-                contents=map_method(body[key], user), organization_id=org_id
-            )
-            db.session.add(log)
-            db.session.commit()
-            # Modify response and return.
-            return make_response(body[key], response.status_code)
+    if 200 <= response.status_code < 300:
+        db.session.commit()
+        for log_event in g.pop("log_events", []):
+            log_writer.write(**log_event)
+    else:
+        db.session.rollback()
+    return response
+
+
+@app.after_request
+def add_etag(response):
+    """Sends the entity tag computed for a successful GET request (see etags.py) with its response.
+    The response must be revalidated before it is reused, so that clients always get the current version.
+
+    Args:
+        response (Response): the response.
+
+    Returns:
+        Response: the response.
+    """
+    if "etag" in g and response.status_code == 200:
+        response.set_etag(g.etag, weak=True)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
     return response
 
 
@@ -180,7 +180,7 @@ class Index(Resource):
             Response: the index.html document.
         """
         # print(f"The CWD at index call is: {os.getcwd()}", flush=True)
-        return send_from_directory("../client/dist", "index.html")
+        return send_precompressed("../client/dist", "index.html")
 
 
 class Contact(Resource):
@@ -197,10 +197,8 @@ class Contact(Resource):
             Response: a response with no content if the operation was successful, an error message otherwise.
         """
         try:
-            with open("./html-templates/emails/inquiry.html", "r") as file:
-                template_content = file.read()
-            html = render_template_string(
-                template_content,
+            html = render_html_template(
+                "emails/inquiry.html",
                 first_name=request.get_json().get("firstName"),
                 last_name=request.get_json().get("lastName"),
                 email=request.get_json().get("email"),
@@ -213,25 +211,6 @@ class Contact(Resource):
             return {"error": "Unprocessable entry"}, 422
 
 
-def delete_old_logs():
-    """
-    Deletes all logs from all organizations that are at least seven days old.
-
-    Articles of Reference:
-    https://www.geeksforgeeks.org/how-to-make-a-timezone-aware-datetime-object-in-python/
-    https://stackoverflow.com/questions/21214270/how-to-schedule-a-function-to-run-every-hour-on-flask
-    https://apscheduler.readthedocs.io/en/3.x/userguide.html
-    https://stackoverflow.com/questions/63693872/flask-how-can-i-delete-data-ranging-back-x-days
-    """
-    with app.app_context():
-        cutoff = datetime.datetime.now(pytz.utc) - datetime.timedelta(
-            days=LOG_DURATION_LIMIT
-        )
-        OrganizationLog.query.filter(OrganizationLog.occurrence <= cutoff).delete()
-        db.session.commit()
-        # print("Old logs have been cleared.", flush=True)
-
-
 api.add_resource(
     Index,
     "/",
@@ -247,8 +226,7 @@ api.add_resource(
 )
 api.add_resource(Contact, "/contact")
 
-scheduler.add_job(delete_old_logs, "interval", seconds=SCHEDULER_INTERVAL)
-scheduler.start()
+log_writer.start()
 
 
 # Views go here! use either route!
@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
-from config import app, db, send_email
+from config import app, db
+from email_outbox import send_email, send_pending_emails
 from models.models import *
-from flask import render_template_string
+from template_registry import render_html_template
 
 # Server side script to run by developers to ban/unban users.
 # When a user is banned or unbanned, an email will be sent to the user informing them.
-# The user must refresh the current page in order for the ban/unban to sync.
+# A ban takes effect on the user's next request, within IDENTITY_CACHE_TTL seconds (see identity.py).
 if __name__ == "__main__":
     with app.app_context():
         while True:
@@ -54,17 +55,16 @@ if __name__ == "__main__":
                     continue
                 # Ban/Unban user
                 db.session.add(user)
-                db.session.commit()
                 # Notify user that he/she has been banned
-                with open(
-                    f"./html-templates/emails/{file_word}_notice.html", "r"
-                ) as file:
-                    template_content = file.read()
-                html = render_template_string(
-                    template_content, first_name=user.first_name, reason=reason
+                html = render_html_template(
+                    f"emails/{file_word}_notice.html",
+                    first_name=user.first_name,
+                    reason=reason,
                 )
                 subject = f"Notice of {subject_action}"
                 send_email(subject, [user.email], html)
+                db.session.commit()
+                send_pending_emails()
                 print(
                     f'User, "{user.username}", has been {file_word}ned from Easy Itemizer.\n'
                 )
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+import argparse
+import datetime
+import json
+import time
+from config import app, db
+from models.models import (
+    User,
+    Organization,
+    Item,
+    Membership,
+    Assignment,
+    Request,
+    OrganizationLog,
+)
+from helpers import RoleType
+from maintenance import LOG_DURATION_LIMIT
+from purge import PURGE_BATCH_SIZE
+
+# Checks that the queries that filter on foreign keys (the validators, the relationship loads of
+# get_record_by_id, and the log retention) read the indexes of migration d3a9e61f5c20 instead of
+# sequentially scanning their tables. The tables are seeded within the benchmark's transaction, which
+# is rolled back, then analyzed, and the plan of each query is read with EXPLAIN (FORMAT JSON).
+# Run from the server directory, against a scratch database: python -m benchmarks.foreign_key_indexes
+
+DEFAULT_ROW_COUNT = 1_000_000
+""" The number of memberships, assignments, requests and logs seeded, unless --rows is given. """
+
+MEMBERS_PER_ORGANIZATION = 100
+""" The number of memberships, assignments and requests of each seeded organization. """
+
+USER_SHARE = 10
+""" The seeded rows per seeded user (and per seeded item). """
+
+LOG_TIME_SPAN_DAYS = 2 * LOG_DURATION_LIMIT
+""" The number of days that the occurrences of the seeded logs are spread over. Half of the logs are expired. """
+
+INDEXED_TABLES = ("memberships", "assignments", "requests", "organization_logs", "items")
+""" The tables whose foreign keys were indexed. The partitions of organization_logs share its prefix. """
+
+
+def seed_tables(row_count):
+    """Seeds the tables with row_count memberships, assignments, requests and logs, spread over
+    row_count / MEMBERS_PER_ORGANIZATION organizations, and row_count / USER_SHARE users and items.
+    The seeded records get ids after the existing ones, so that any existing data is left as is.
+
+    Args:
+        row_count (int): the number of rows.
+
+    Returns:
+        dict: the id of a seeded record of each model, for the queries to look up.
+    """
+    offsets = {
+        model: db.session.scalar(
+            db.select(db.func.coalesce(db.func.max(model.id), 0))
+        )
+        for model in (User, Organization, Item, Membership, Assignment, Request)
+    }
+    counts = {
+        "row_count": row_count,
+        "user_count": row_count // USER_SHARE,
+        "organization_count": row_count // MEMBERS_PER_ORGANIZATION,
+        "members": MEMBERS_PER_ORGANIZATION,
+        "time_span": LOG_TIME_SPAN_DAYS * 86400,
+        **{f"{model.__tablename__}_offset": offset for model, offset in offsets.items()},
+    }
+    statements = (
+        """
+        INSERT INTO users (id, first_name, last_name, username, email, is_verified, is_banned)
+        SELECT :users_offset + n, 'First', 'Last', 'seed_user' || n, 'seed_user' || n || '@example.com',
+            true, false
+        FROM generate_series(1, :user_count) AS n
+        """,
+        """
+        INSERT INTO organizations (id, name)
+        SELECT :organizations_offset + n, 'Seed Organization ' || n
+        FROM generate_series(1, :organization_count) AS n
+        """,
+        """
+        INSERT INTO items (id, name, part_number, is_public, user_id)
+        SELECT :items_offset + n, 'Seed Item ' || n, 'S-' || n, n % 2 = 0, :users_offset + n
+        FROM generate_series(1, :user_count) AS n
+        """,
+        # Each organization has MEMBERS_PER_ORGANIZATION distinct members, the first of whom is its owner.
+        f"""
+        INSERT INTO memberships (id, role, user_id, organization_id)
+        SELECT :memberships_offset + 1 + n,
+            CASE WHEN n % :members = 0 THEN '{RoleType.OWNER}' ELSE '{RoleType.REGULAR}' END::role_enum,
+            :users_offset + 1 + n % :user_count, :organizations_offset + 1 + n / :members
+        FROM generate_series(0, :row_count - 1) AS n
+        """,
+        """
+        INSERT INTO assignments (id, current_quantity, enough_threshold, item_id, organization_id)
+        SELECT :assignments_offset + 1 + n, n % 100, 10,
+            :items_offset + 1 + n % :user_count, :organizations_offset + 1 + n / :members
+        FROM generate_series(0, :row_count - 1) AS n
+        """,
+        """
+        INSERT INTO requests (id, reason_to_join, user_id, organization_id)
+        SELECT :requests_offset + 1 + n, 'Reason',
+            :users_offset + 1 + (n + :members) % :user_count, :organizations_offset + 1 + n / :members
+        FROM generate_series(0, :row_count - 1) AS n
+        """,
+        """
+        INSERT INTO organization_logs (event_type, params, occurrence, organization_id)
+        SELECT 1, '{}'::jsonb, now() - make_interval(secs => n % :time_span),
+            :organizations_offset + 1 + n % :organization_count
+        FROM generate_series(0, :row_count - 1) AS n
+        """,
+    )
+    for statement in statements:
+        db.session.execute(db.text(statement), counts)
+    # The planner chooses between the indexes and sequential scans from the statistics of the tables.
+    db.session.execute(
+        db.text(f"ANALYZE {', '.join(INDEXED_TABLES)}, users, organizations")
+    )
+    return {model: offset + 1 for model, offset in offsets.items()}
+
+
+def get_hot_queries(ids):
+    """
+    Args:
+        ids (dict): the id of a seeded record of each model.
+
+    Returns:
+        dict: the queries that filter on the indexed columns, by description.
+    """
+    user_id, organization_id, item_id = ids[User], ids[Organization], ids[Item]
+    cutoff = db.func.now() - datetime.timedelta(days=LOG_DURATION_LIMIT)
+    return {
+        "Membership.validate_role (first member)": db.select(Membership)
+        .filter(Membership.organization_id == organization_id)
+        .limit(1),
+        "Request.validate_organization_id": db.select(Membership)
+        .filter(
+            Membership.user_id == user_id,
+            Membership.organization_id == organization_id,
+        )
+        .limit(1),
+        "organization_by_id: memberships": db.select(Membership).filter(
+            Membership.organization_id.in_([organization_id])
+        ),
+        "organization_by_id: assignments": db.select(Assignment).filter(
+            Assignment.organization_id.in_([organization_id])
+        ),
+        "organization_by_id: requests": db.select(Request).filter(
+            Request.organization_id.in_([organization_id])
+        ),
+        "session profile: memberships of a user": db.select(Membership).filter(
+            Membership.user_id == user_id
+        ),
+        "requests of a user": db.select(Request).filter(Request.user_id == user_id),
+        "items of a user": db.select(Item).filter(Item.user_id == user_id),
+        "ItemById.delete: assignments of an item": db.select(Assignment).filter(
+            Assignment.item_id == item_id
+        ),
+        "organization log feed": db.select(OrganizationLog)
+        .filter(OrganizationLog.organization_id == organization_id)
+        .order_by(OrganizationLog.occurrence.desc(), OrganizationLog.id)
+        .limit(50),
+        "delete_old_logs (unpartitioned): batch of expired logs": db.select(OrganizationLog.id)
+        .filter(OrganizationLog.occurrence <= cutoff)
+        .order_by(OrganizationLog.id)
+        .limit(PURGE_BATCH_SIZE),
+    }
+
+
+def get_scans(plan):
+    """Lists the scans of a query plan and of all its subplans.
+
+    Args:
+        plan (dict): the plan, as returned by EXPLAIN (FORMAT JSON).
+
+    Returns:
+        list: the (node type, relation name, index name) of each scan. Bitmap index scans have no
+        relation name, and sequential scans no index name.
+    """
+    scans = []
+    if "Relation Name" in plan or "Index Name" in plan:
+        scans.append(
+            (plan["Node Type"], plan.get("Relation Name"), plan.get("Index Name"))
+        )
+    for subplan in plan.get("Plans", ()):
+        scans.extend(get_scans(subplan))
+    return scans
+
+
+def explain(query):
+    """
+    Args:
+        query (Select): the query.
+
+    Returns:
+        dict: the plan of the query.
+    """
+    compiled = query.compile(
+        dialect=db.engine.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    result = (
+        db.session.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+        .scalar()
+    )
+    return (json.loads(result) if isinstance(result, str) else result)[0]["Plan"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Checks that the hot queries on foreign keys use their indexes."
+    )
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROW_COUNT)
+    row_count = parser.parse_args().rows
+    sequential_scans = []
+    with app.app_context():
+        try:
+            start = time.perf_counter()
+            ids = seed_tables(row_count)
+            print(
+                f"Seeded {row_count:,} rows per table "
+                f"in {time.perf_counter() - start:.0f} s."
+            )
+            for description, query in get_hot_queries(ids).items():
+                scans = get_scans(explain(query))
+                print(f"  {description}:")
+                for node_type, relation, index in scans:
+                    print(
+                        f"    {node_type}"
+                        + (f" on {relation}" if relation else "")
+                        + (f" using {index}" if index else "")
+                    )
+                    if node_type == "Seq Scan" and relation.startswith(INDEXED_TABLES):
+                        sequential_scans.append((description, relation))
+        finally:
+            db.session.rollback()
+    assert (
+        not sequential_scans
+    ), f"Sequential scans of indexed tables: {sequential_scans}"
+    print("No hot query sequentially scans an indexed table.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+import time
+from flask.json.provider import DefaultJSONProvider
+from config import app, db
+from app import ENDPOINT_LOADER_OPTIONS
+from models.models import User, Organization, Membership, Item, Assignment
+from helpers import RoleType
+
+# Measures the time to encode the response of GET /organizations/<id> for an organization with 5,000
+# assigned items, with Flask's own JSON provider (the standard library's json) and with the app's
+# provider (orjson, if installed), both compact and pretty printed (?pretty=true).
+# The organization is created within the benchmark's transaction, which is rolled back.
+# Run from the server directory, against a scratch database: python -m benchmarks.json_encoding
+
+ASSIGNMENT_COUNT = 5000
+""" The number of items assigned to the organization. """
+
+MEMBER_COUNT = 50
+""" The number of members of the organization. Each assigned item was added by one of them. """
+
+RUN_COUNT = 5
+""" The number of runs of each variant. The fastest run is reported. """
+
+
+def create_organization():
+    """Creates an organization with MEMBER_COUNT members and ASSIGNMENT_COUNT assigned items,
+    without committing it.
+
+    Returns:
+        int: the organization id.
+    """
+    users = []
+    for number in range(MEMBER_COUNT):
+        user = User(
+            first_name=f"First{number}",
+            last_name=f"Last{number}",
+            username=f"benchmark_user{number}",
+            email=f"benchmark_user{number}@example.com",
+            is_verified=True,
+        )
+        # Hashing a password is slow, and the benchmark never logs in.
+        user._password_hash = "unused"
+        users.append(user)
+    organization = Organization(name="Benchmark Organization")
+    db.session.add_all([organization, *users])
+    db.session.flush()
+    items = [
+        Item(
+            name=f"Benchmark Item {number}",
+            description=f"Description of benchmark item {number}",
+            part_number=f"BM-{number:05}",
+            user_id=users[number % MEMBER_COUNT].id,
+        )
+        for number in range(ASSIGNMENT_COUNT)
+    ]
+    db.session.add_all(items)
+    # The owner is added first, as the other members are validated against it.
+    db.session.add(
+        Membership(
+            user_id=users[0].id, organization_id=organization.id, role=RoleType.OWNER
+        )
+    )
+    db.session.flush()
+    db.session.add_all(
+        [
+            Membership(
+                user_id=user.id,
+                organization_id=organization.id,
+                role=RoleType.REGULAR,
+            )
+            for user in users[1:]
+        ]
+        + [
+            Assignment(
+                item_id=item.id,
+                organization_id=organization.id,
+                current_quantity=number % 100,
+                enough_threshold=10,
+            )
+            for number, item in enumerate(items)
+        ]
+    )
+    db.session.flush()
+    return organization.id
+
+
+def time_encoding(dumps, data):
+    """Times the encoding of the data.
+
+    Args:
+        dumps (function): the encoding function.
+        data (dict): the data.
+
+    Returns:
+        tuple: the time of the fastest run, in milliseconds, and the size of the JSON, in bytes.
+    """
+    timings = []
+    for _ in range(RUN_COUNT):
+        start = time.perf_counter()
+        encoded = dumps(data)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), len(encoded.encode("utf-8"))
+
+
+def main():
+    with app.app_context():
+        try:
+            id = create_organization()
+            db.session.expire_all()
+            # The record is loaded and serialized as the organization_by_id endpoint does.
+            organization = (
+                Organization.query.options(*ENDPOINT_LOADER_OPTIONS["organization_by_id"])
+                .filter_by(id=id)
+                .first()
+            )
+            data = organization.to_dict()
+        finally:
+            db.session.rollback()
+        default_json = DefaultJSONProvider(app)
+        variants = {
+            "json, compact": lambda data: default_json.dumps(
+                data, separators=(",", ":")
+            ),
+            "json, pretty": lambda data: default_json.dumps(data, indent=2),
+            f"{type(app.json).__name__}, compact": app.json.dumps,
+            f"{type(app.json).__name__}, pretty": lambda data: app.json.dumps(
+                data, indent=2
+            ),
+        }
+        timings = {name: time_encoding(dumps, data) for name, dumps in variants.items()}
+    print(f"Encoding an organization with {ASSIGNMENT_COUNT:,} assigned items:")
+    for name, (timing, size) in timings.items():
+        print(f"  {name:24}{timing:8.1f} ms{size / 2**20:8.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import random
+import time
+from faker import Faker
+from config import app, db
+from helpers import LogEventType, RoleType
+from model_log_mapping import format_log
+from models.organization_log import OrganizationLog
+from seeds.item_seed import ITEM_SEED
+
+# Compares the size on disk of organization_logs in its two layouts: formatted sentences in a text array
+# (before migration e2c94d7a1b58), and event codes with JSONB parameters (after it). Both layouts are
+# filled with the same logs, in temporary tables that only exist within the benchmark's transaction.
+# Run from the server directory, against a scratch database: python -m benchmarks.log_storage
+
+DEFAULT_ROW_COUNT = 10_000_000
+""" The number of logs that each table is filled with, unless --rows is given. """
+
+SAMPLE_COUNT = 10_000
+""" The number of distinct logs generated. The tables are filled by repeating them. """
+
+ORGANIZATION_COUNT = 1_000
+""" The number of organizations that the logs are spread over. """
+
+LOG_TIME_SPAN_SECONDS = 7 * 86400
+""" The span of time that the occurrences of the logs are spread over (the retention period). """
+
+fake = Faker()
+Faker.seed(0)
+random.seed(0)
+
+SAMPLE_PAYLOADS = {
+    LogEventType.ORGANIZATION_CREATED: lambda: {"org_name": fake.company()},
+    LogEventType.ORGANIZATION_UPDATED: lambda: {},
+    LogEventType.REQUEST_SUBMITTED: lambda: {"username": fake.user_name()},
+    LogEventType.MEMBER_JOINED: lambda: {"username": fake.user_name()},
+    LogEventType.MEMBER_ROLE_CHANGED: lambda: {
+        "username": fake.user_name(),
+        "role": random.choice((RoleType.REGULAR, RoleType.ADMIN)),
+    },
+    LogEventType.MEMBER_LEFT: lambda: {},
+    LogEventType.MEMBER_REMOVED: lambda: {"username": fake.user_name()},
+    LogEventType.OWNERSHIP_TRANSFERRED: lambda: {"new_owner": fake.user_name()},
+    LogEventType.ITEM_CREATED: lambda: get_item_payload(),
+    LogEventType.ITEM_ASSIGNED: lambda: get_item_payload(),
+    LogEventType.ASSIGNMENT_UPDATED: lambda: {},
+    LogEventType.ITEM_UNASSIGNED: lambda: get_item_payload(),
+    LogEventType.ITEM_REMOVED: lambda: {
+        **get_item_payload(),
+        "current_quantity": random.randint(0, 500),
+        "enough_threshold": random.randint(1, 50),
+    },
+}
+"""
+Mapping of the event types that existed when the layout was changed to functions that generate a
+random payload for them. Every event is logged with the user who performed it, as log_event does.
+"""
+
+
+def get_item_payload():
+    """
+    Returns:
+        dict: the payload of a random seeded item.
+    """
+    return {
+        "item_name": random.choice(list(ITEM_SEED)),
+        "part_number": "".join(fake.random_uppercase_letter() for _ in range(4))
+        + "-"
+        + str(fake.random_number(digits=5)),
+    }
+
+
+def generate_samples():
+    """Generates random logs, spread evenly over the event types.
+
+    Returns:
+        list: the logs, as dictionaries with the number, event type, parameters and contents of each.
+    """
+    samples = []
+    event_types = list(SAMPLE_PAYLOADS)
+    for number in range(SAMPLE_COUNT):
+        event_type = event_types[number % len(event_types)]
+        payload = SAMPLE_PAYLOADS[event_type]()
+        actor = fake.user_name()
+        samples.append(
+            {
+                "number": number,
+                "event_type": event_type,
+                "params": json.dumps(OrganizationLog.get_params(payload, actor)),
+                "contents": format_log(event_type, payload, actor),
+            }
+        )
+    return samples
+
+
+def fill_tables(connection, row_count):
+    """Creates a temporary table for each layout, with the indexes that organization_logs had,
+    and fills both with the same row_count logs.
+
+    Args:
+        connection (Connection): the connection, within a transaction.
+        row_count (int): the number of logs.
+    """
+    connection.execute(
+        db.text(
+            """
+            CREATE TEMP TABLE log_samples (
+                number INTEGER PRIMARY KEY,
+                event_type SMALLINT NOT NULL,
+                params JSONB NOT NULL,
+                contents VARCHAR[] NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+    )
+    connection.execute(
+        db.text(
+            "INSERT INTO log_samples VALUES "
+            "(:number, :event_type, CAST(:params AS JSONB), :contents)"
+        ),
+        generate_samples(),
+    )
+    connection.execute(
+        db.text(
+            """
+            CREATE TEMP TABLE logs_as_sentences (
+                id SERIAL PRIMARY KEY,
+                contents VARCHAR[] NOT NULL,
+                occurrence TIMESTAMP NOT NULL DEFAULT now(),
+                organization_id INTEGER NOT NULL
+            ) ON COMMIT DROP;
+            CREATE TEMP TABLE logs_as_events (
+                id SERIAL PRIMARY KEY,
+                event_type SMALLINT NOT NULL,
+                params JSONB NOT NULL DEFAULT '{}'::jsonb,
+                occurrence TIMESTAMP NOT NULL DEFAULT now(),
+                organization_id INTEGER NOT NULL
+            ) ON COMMIT DROP;
+            CREATE INDEX ON logs_as_sentences (occurrence);
+            CREATE INDEX ON logs_as_sentences (organization_id);
+            CREATE INDEX ON logs_as_events (occurrence);
+            CREATE INDEX ON logs_as_events (organization_id);
+            """
+        )
+    )
+    for table, columns in (
+        ("logs_as_sentences", "contents"),
+        ("logs_as_events", "event_type, params"),
+    ):
+        connection.execute(
+            db.text(
+                f"""
+                INSERT INTO {table} ({columns}, occurrence, organization_id)
+                SELECT {columns},
+                    now() - make_interval(secs => series.number % :time_span),
+                    1 + series.number % :organization_count
+                FROM generate_series(1, :row_count) AS series (number)
+                JOIN log_samples ON log_samples.number = series.number % :sample_count
+                """
+            ),
+            {
+                "time_span": LOG_TIME_SPAN_SECONDS,
+                "organization_count": ORGANIZATION_COUNT,
+                "row_count": row_count,
+                "sample_count": SAMPLE_COUNT,
+            },
+        )
+
+
+def get_sizes(connection, table, columns):
+    """Measures the size of a table.
+
+    Args:
+        connection (Connection): the connection.
+        table (str): the table name.
+        columns (str): the expression of the columns that hold the contents of a log.
+
+    Returns:
+        dict: the average size of the contents of a log, and the sizes of the table, its indexes, and both.
+    """
+    return (
+        connection.execute(
+            db.text(
+                f"""
+                SELECT
+                    (SELECT avg({columns}) FROM {table}) AS contents,
+                    pg_relation_size('{table}') AS heap,
+                    pg_indexes_size('{table}') AS indexes,
+                    pg_total_relation_size('{table}') AS total
+                """
+            )
+        )
+        .mappings()
+        .one()
+    )
+
+
+def format_size(size):
+    """
+    Returns:
+        str: a size in bytes, in MiB.
+    """
+    return f"{size / 2**20:10.1f} MiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compares the size on disk of the two layouts of organization_logs."
+    )
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROW_COUNT)
+    row_count = parser.parse_args().rows
+    with app.app_context(), db.engine.connect() as connection:
+        start = time.perf_counter()
+        with connection.begin() as transaction:
+            fill_tables(connection, row_count)
+            sentences = get_sizes(
+                connection, "logs_as_sentences", "pg_column_size(contents)"
+            )
+            events = get_sizes(
+                connection,
+                "logs_as_events",
+                "pg_column_size(event_type) + pg_column_size(params)",
+            )
+            transaction.rollback()
+    print(
+        f"organization_logs with {row_count:,} rows "
+        f"({time.perf_counter() - start:.0f} s to fill):"
+    )
+    print(f"{'':22}{'sentences':>14}{'events':>14}{'change':>9}")
+    print(
+        f"{'contents per row':22}{sentences['contents']:12.1f} B{events['contents']:12.1f} B"
+        f"{events['contents'] / sentences['contents'] - 1:+9.0%}"
+    )
+    for name, key in (("table", "heap"), ("indexes", "indexes"), ("total", "total")):
+        print(
+            f"{name:22}{format_size(sentences[key])}{format_size(events[key])}"
+            f"{events[key] / sentences[key] - 1:+9.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
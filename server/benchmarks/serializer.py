@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+import time
+from sqlalchemy_serializer import SerializerMixin
+from config import app, db
+from app import ENDPOINT_LOADER_OPTIONS
+from models.models import Organization, Item, User
+from resources.item_resource import ITEM_PAGE_SIZE
+from resources.user_resource import SESSION_PROFILE_FIELDS
+from benchmarks.json_encoding import create_organization, ASSIGNMENT_COUNT
+
+# Measures the time that to_dict() takes on the payloads of GET /organizations/<id>, GET /check_session and
+# GET /items, with the precompiled serializers (CompiledSerializerMixin) and with sqlalchemy_serializer's
+# SerializerMixin, which they replaced. Both must produce the same dictionaries.
+# The organization of benchmarks.json_encoding is created within the benchmark's transaction, which is rolled back.
+# Run from the server directory, against a scratch database: python -m benchmarks.serializer
+
+RUN_COUNT = 5
+""" The number of runs of each variant. The fastest run is reported. """
+
+CATALOG_FIELDS = ("id", "name", "part_number", "image_url", "user_id")
+""" The attributes of an item that a page of the item catalog includes (see ItemResource.get). """
+
+
+def time_serialization(serialize):
+    """Times a serialization.
+
+    Args:
+        serialize (function): the serialization, which returns the serialized payload.
+
+    Returns:
+        tuple: the time of the fastest run, in milliseconds, and the serialized payload.
+    """
+    timings = []
+    for _ in range(RUN_COUNT):
+        start = time.perf_counter()
+        payload = serialize()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), payload
+
+
+def main():
+    with app.app_context():
+        try:
+            id = create_organization()
+            db.session.expire_all()
+            # The records are loaded as the endpoints load them, so that no lazy load is timed.
+            organization = (
+                Organization.query.options(*ENDPOINT_LOADER_OPTIONS["organization_by_id"])
+                .filter_by(id=id)
+                .first()
+            )
+            user = organization.memberships[0].user
+            items = (
+                Item.query.options(db.joinedload(Item.user))
+                .filter(Item.name.startswith("Benchmark Item"))
+                .order_by(Item.name, Item.id)
+                .limit(ITEM_PAGE_SIZE)
+                .all()
+            )
+            payloads = {
+                f"organization ({ASSIGNMENT_COUNT:,} assignments)": (organization, ()),
+                "check_session profile": (user, SESSION_PROFILE_FIELDS),
+                f"items page ({ITEM_PAGE_SIZE} items)": (items, CATALOG_FIELDS),
+            }
+            timings = {}
+            for name, (records, only) in payloads.items():
+                if isinstance(records, (Organization, User)):
+                    records = [records]
+                compiled_time, compiled = time_serialization(
+                    lambda: [record.to_dict(only=only) for record in records]
+                )
+                mixin_time, expected = time_serialization(
+                    lambda: [
+                        SerializerMixin.to_dict(record, only=only) for record in records
+                    ]
+                )
+                assert compiled == expected, f"The serializations of {name} differ."
+                timings[name] = (mixin_time, compiled_time)
+        finally:
+            db.session.rollback()
+    print("Serializing with to_dict():")
+    print(f"  {'':36}{'SerializerMixin':>16}{'compiled':>12}{'speedup':>10}")
+    for name, (mixin_time, compiled_time) in timings.items():
+        print(
+            f"  {name:36}{mixin_time:13.2f} ms{compiled_time:9.2f} ms"
+            f"{mixin_time / compiled_time:9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import gzip
+import mimetypes
+import os
+from flask import request, current_app, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_MIN_SIZE = 1024
+"""
+The size, in bytes, from which a response is compressed. Smaller responses gain too little to be worth the time.
+"""
+
+COMPRESSIBLE_MIMETYPES = [
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+]
+"""
+The content types of the responses that are compressed. Images and fonts are already compressed.
+"""
+
+CONTENT_CODINGS = {
+    **({"br": lambda data: brotli.compress(data, quality=5)} if brotli else {}),
+    "gzip": lambda data: gzip.compress(data, compresslevel=6),
+}
+"""
+Mapping of the content codings that dynamic responses can be compressed with to their compressors,
+in order of preference. Brotli is only offered if the brotli package is installed.
+"""
+
+PRECOMPRESSED_EXTENSIONS = {"br": ".br", "gzip": ".gz"}
+"""
+Mapping of content codings to the extensions of the precompressed copies of the built client
+files (see client/compressAssets.cjs), in order of preference.
+"""
+
+IMMUTABLE_ASSETS_PATH = "assets/"
+"""
+The folder of the built client whose files have a content hash in their names, so they never change.
+"""
+
+IMMUTABLE_MAX_AGE = 31536000
+"""
+The time, in seconds, that browsers keep the immutable built client files (one year).
+"""
+
+
+def negotiate_encoding(codings):
+    """Picks the content coding to send the response with, from those accepted by the client (Accept-Encoding).
+
+    Args:
+        codings (iterable): the available content codings, in order of preference.
+
+    Returns:
+        str: the content coding, or None if the client accepts none of them.
+    """
+    return request.accept_encodings.best_match(list(codings))
+
+
+def compress_response(response):
+    """Compresses a dynamic response with the best content coding that the client accepts.
+    File responses (see send_precompressed), streamed responses, and small responses are left as they are.
+
+    Args:
+        response (Response): the response.
+
+    Returns:
+        Response: the response.
+    """
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add("Accept-Encoding")
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or (response.content_length or 0) < COMPRESSION_MIN_SIZE
+    ):
+        return response
+    if encoding := negotiate_encoding(CONTENT_CODINGS):
+        response.set_data(CONTENT_CODINGS[encoding](response.get_data()))
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def send_precompressed(directory, filename):
+    """Sends a built client file. If the client accepts it, the file's precompressed copy is sent instead.
+    The files with a content hash in their names are cached by browsers for good, while the others
+    (such as index.html) must be revalidated before they are reused.
+
+    Args:
+        directory (str): the directory of the built client.
+        filename (str): the path of the file, relative to the directory.
+
+    Returns:
+        Response: the file.
+    """
+    mimetype = mimetypes.guess_type(filename)[0]
+    encoding = None
+    path = filename
+    if mimetype in COMPRESSIBLE_MIMETYPES:
+        directory = os.path.join(current_app.root_path, directory)
+        available = [
+            coding
+            for coding, extension in PRECOMPRESSED_EXTENSIONS.items()
+            if (compressed := safe_join(directory, filename + extension))
+            and os.path.isfile(compressed)
+        ]
+        if encoding := negotiate_encoding(available):
+            path = filename + PRECOMPRESSED_EXTENSIONS[encoding]
+    is_immutable = filename.startswith(IMMUTABLE_ASSETS_PATH)
+    # Without a max age, the file is sent with no-cache, so it is revalidated with its ETag.
+    response = send_from_directory(
+        directory,
+        path,
+        mimetype=mimetype,
+        max_age=IMMUTABLE_MAX_AGE if is_immutable else None,
+    )
+    response.cache_control.immutable = is_immutable
+    if mimetype in COMPRESSIBLE_MIMETYPES:
+        response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def send_static_file(filename):
+    """View of the static files of the app (i.e. the built client in production), which replaces Flask's own.
+
+    Args:
+        filename (str): the path of the file, relative to the static folder.
+
+    Returns:
+        Response: the file.
+    """
+    return send_precompressed(current_app.static_folder, filename)
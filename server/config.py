@@ -3,17 +3,18 @@ import os
 
 # Remote library imports
 from flask import Flask
+from flask.sessions import SecureCookieSessionInterface
 from flask_cors import CORS
 from flask_migrate import Migrate
 from flask_restful import Api
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
-from flask_mail import Mail, Message
+from flask_mail import Mail
 from sqlalchemy import MetaData
 import secrets
 from itsdangerous import URLSafeTimedSerializer
 from dotenv import load_dotenv
-from apscheduler.schedulers.background import BackgroundScheduler
+from json_provider import JSONProvider, output_json
 
 load_dotenv()
 
@@ -57,6 +58,50 @@ SERVER_CONFIGS = {
 Mapping of flask and routing settings for each configuration type.
 """
 
+def get_secret_keys():
+    """Retrieves the keys that cookies and tokens are signed with, from the SECRET_KEY and
+    SECRET_KEY_FALLBACKS (comma-separated) environment variables. New signatures are made with
+    SECRET_KEY, while signatures made with any of the fallback keys are still accepted. To rotate
+    the key, move the current SECRET_KEY to SECRET_KEY_FALLBACKS, set a new SECRET_KEY, and remove
+    the fallback once the sessions signed with it have expired.
+
+    Raises:
+        ValueError: if SECRET_KEY is not set in production.
+
+    Returns:
+        list: the fallback keys, followed by the current key.
+    """
+    secret_key = os.getenv("SECRET_KEY")
+    if not secret_key:
+        if CONFIG_TYPE == "production":
+            raise ValueError("The SECRET_KEY environment variable must be set.")
+        # A development server runs in a single process, so a random key is enough.
+        secret_key = secrets.token_hex(16)
+    fallbacks = os.getenv("SECRET_KEY_FALLBACKS", "").split(",")
+    return [key.strip() for key in fallbacks if key.strip()] + [secret_key]
+
+
+class RotatingSessionInterface(SecureCookieSessionInterface):
+    """
+    Session interface that signs session cookies with the current secret key, and accepts the
+    cookies signed with any of the keys of get_secret_keys, so that rotating the key does not
+    log every user out.
+    """
+
+    def get_signing_serializer(self, app):
+        if not app.secret_key:
+            return None
+        return URLSafeTimedSerializer(
+            SECRET_KEYS,
+            salt=self.salt,
+            serializer=self.serializer,
+            signer_kwargs={
+                "key_derivation": self.key_derivation,
+                "digest_method": self.digest_method,
+            },
+        )
+
+
 # Get configuration type and instantiate app & other appropriate variables based on config type.
 CONFIG_TYPE = get_route_configuration_type()
 app = SERVER_CONFIGS[CONFIG_TYPE]["app"]
@@ -65,8 +110,15 @@ route_prefix = SERVER_CONFIGS[CONFIG_TYPE]["route_prefix"]
 # Set app attributes
 app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URI")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-app.json.compact = False
-app.secret_key = secrets.token_hex(16)
+# Recompile changed templates without restarting the server, during development only.
+app.config["TEMPLATES_AUTO_RELOAD"] = CONFIG_TYPE == "development"
+app.json = JSONProvider(app)
+# Responses are compact in production; add ?pretty=true to a request to pretty print its response.
+app.json.compact = CONFIG_TYPE == "production"
+# Every worker and restart must sign with the same key, or sessions fail across them.
+SECRET_KEYS = get_secret_keys()
+app.secret_key = SECRET_KEYS[-1]
+app.session_interface = RotatingSessionInterface()
 app.config["MAIL_SERVER"] = os.getenv("MAIL_SERVER")
 app.config["MAIL_PORT"] = 587
 app.config["MAIL_USERNAME"] = os.getenv("MAIL_USERNAME")
@@ -76,7 +128,6 @@ app.config["MAIL_USE_SSL"] = False
 app.config["MAIL_DEFAULT_SENDER"] = os.getenv("MAIL_DEFAULT_SENDER")
 app.config["SECURITY_PASSWORD_SALT"] = os.getenv("SECURITY_PASSWORD_SALT")
 mail = Mail(app)
-scheduler = BackgroundScheduler()
 
 
 # Define metadata, instantiate db
@@ -96,6 +147,7 @@ db.init_app(app)
 
 # Instantiate REST API
 api = Api(app)
+api.representation("application/json")(output_json)
 
 # Instantiate CORS
 CORS(app)
@@ -115,7 +167,7 @@ def generate_confirmation_token(email):
     Returns:
         str: the email confirmation token.
     """
-    serializer = URLSafeTimedSerializer(app.config["SECRET_KEY"])
+    serializer = URLSafeTimedSerializer(SECRET_KEYS)
     # print(serializer, flush=True)
     return serializer.dumps(email, salt=app.config["SECURITY_PASSWORD_SALT"])
 
@@ -130,7 +182,7 @@ def confirm_token(token, expiration=600):
     Returns:
         str: the email, or false if there is no email for that token.
     """
-    seralizer = URLSafeTimedSerializer(app.config["SECRET_KEY"])
+    seralizer = URLSafeTimedSerializer(SECRET_KEYS)
     try:
         email = seralizer.loads(
             token, salt=app.config["SECURITY_PASSWORD_SALT"], max_age=expiration
@@ -149,7 +201,7 @@ def generate_invitation_token(org_name):
     Returns:
         str: the invitation token.
     """
-    serializer = URLSafeTimedSerializer(app.config["SECRET_KEY"])
+    serializer = URLSafeTimedSerializer(SECRET_KEYS)
     return serializer.dumps(org_name, salt=app.config["SECURITY_PASSWORD_SALT"])
 
 
@@ -163,7 +215,7 @@ def invitation_token(token, expiration=300):
     Returns:
         str: the organization name, or False if there is no organization name for that token.
     """
-    seralizer = URLSafeTimedSerializer(app.config["SECRET_KEY"])
+    seralizer = URLSafeTimedSerializer(SECRET_KEYS)
     try:
         org_name = seralizer.loads(
             token, salt=app.config["SECURITY_PASSWORD_SALT"], max_age=expiration
@@ -182,7 +234,7 @@ def generate_password_reset_link(salted_email):
     Returns:
         str: the email confirmation token.
     """
-    serializer = URLSafeTimedSerializer(app.config["SECRET_KEY"])
+    serializer = URLSafeTimedSerializer(SECRET_KEYS)
     return serializer.dumps(salted_email, salt=app.config["SECURITY_PASSWORD_SALT"])
 
 
@@ -196,7 +248,7 @@ def password_reset_token(token, expiration=120):
     Returns:
         str: the salted email, or false if there is no salted email for that token.
     """
-    seralizer = URLSafeTimedSerializer(app.config["SECRET_KEY"])
+    seralizer = URLSafeTimedSerializer(SECRET_KEYS)
     try:
         salted_email = seralizer.loads(
             token, salt=app.config["SECURITY_PASSWORD_SALT"], max_age=expiration
@@ -204,20 +256,3 @@ def password_reset_token(token, expiration=120):
     except:
         return False
     return salted_email
-
-
-def send_email(subject, recipients, template, sender=app.config["MAIL_DEFAULT_SENDER"]):
-    """
-    Sends an email.
-
-    Args:
-        subject (string): the subject of the email.
-        recipients (list): the list of recipients of the email.
-        template (html document): the contents of the email.
-        sender (string, optional): the sender. Defaults to app.config['MAIL_DEFAULT_SENDER'].
-    """
-    message = Message(
-        subject=subject, recipients=recipients, html=template, sender=sender
-    )
-    # print(message, flush=True)
-    mail.send(message)
@@ -0,0 +1,111 @@
+import datetime
+from flask_mail import Message
+from config import app, db, mail
+from models.outbox_email import OutboxEmail
+from helpers import EmailStatus
+from jobs import register_job
+
+OUTBOX_POLL_INTERVAL = 5
+""" The interval, in seconds, at which the outbox is checked for emails to send. """
+
+OUTBOX_BATCH_SIZE = 50
+""" The maximum number of emails sent over a single SMTP connection. """
+
+MAX_SEND_ATTEMPTS = 5
+""" The number of times that sending an email is attempted before it is marked as failed. """
+
+RETRY_BACKOFF_SECONDS = 30
+""" The delay before the first retry of a failed email. The delay doubles after every attempt. """
+
+
+def send_email(subject, recipients, template, sender=None):
+    """
+    Adds an email to the outbox. The email is stored as part of the current transaction,
+    and is sent in the background once that transaction is committed.
+
+    Args:
+        subject (string): the subject of the email.
+        recipients (list): the list of recipients of the email.
+        template (html document): the contents of the email.
+        sender (string, optional): the sender. Defaults to app.config['MAIL_DEFAULT_SENDER'].
+    """
+    db.session.add(
+        OutboxEmail(
+            subject=subject,
+            recipients=list(recipients),
+            html=template,
+            sender=sender or app.config["MAIL_DEFAULT_SENDER"],
+        )
+    )
+
+
+def schedule_retry(email, error):
+    """Records a failed delivery attempt of an email, and schedules the next attempt with
+    exponential backoff. After MAX_SEND_ATTEMPTS, the email is marked as failed.
+
+    Args:
+        email (OutboxEmail): the email.
+        error (Exception): the error that caused the delivery to fail.
+    """
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= MAX_SEND_ATTEMPTS:
+        email.status = EmailStatus.FAILED
+    else:
+        delay = RETRY_BACKOFF_SECONDS * 2 ** (email.attempts - 1)
+        email.next_attempt_at = db.func.now() + datetime.timedelta(seconds=delay)
+
+
+@register_job(interval=OUTBOX_POLL_INTERVAL)
+def send_pending_emails():
+    """
+    Sends the pending emails of the outbox that are due, in batches of OUTBOX_BATCH_SIZE.
+    Each batch is sent over a single SMTP connection. The emails of a batch are locked while
+    they are being sent, so that concurrent senders never send the same email twice.
+
+    Returns:
+        int: the number of emails that were sent.
+    """
+    sent = 0
+    with app.app_context():
+        while True:
+            batch = (
+                OutboxEmail.query.filter(
+                    OutboxEmail.status == EmailStatus.PENDING,
+                    OutboxEmail.next_attempt_at <= db.func.now(),
+                )
+                .order_by(OutboxEmail.id)
+                .limit(OUTBOX_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if not batch:
+                break
+            handled = set()
+            try:
+                with mail.connect() as connection:
+                    for email in batch:
+                        handled.add(email.id)
+                        try:
+                            connection.send(
+                                Message(
+                                    subject=email.subject,
+                                    recipients=email.recipients,
+                                    html=email.html,
+                                    sender=email.sender,
+                                )
+                            )
+                            email.status = EmailStatus.SENT
+                            email.sent_at = db.func.now()
+                            sent += 1
+                        except Exception as e:
+                            schedule_retry(email, e)
+            except Exception as e:
+                # The connection could not be opened (or closed); retry whatever was not sent.
+                for email in batch:
+                    if email.id not in handled:
+                        schedule_retry(email, e)
+            db.session.commit()
+            if len(batch) < OUTBOX_BATCH_SIZE:
+                break
+    return sent
@@ -0,0 +1,195 @@
+import hashlib
+from flask import request, g, make_response
+from config import db
+from models.models import Organization, Membership, User, Assignment, Item, Request
+
+VERSION_TIMESTAMPS = {
+    Organization: db.func.coalesce(Organization.last_updated, Organization.created_at),
+    Membership: db.func.coalesce(Membership.last_updated, Membership.joined_at),
+    User: db.func.coalesce(User.last_updated, User.created_at),
+    Assignment: db.func.coalesce(Assignment.last_updated, Assignment.added_at),
+    Item: db.func.coalesce(Item.last_updated, Item.created_at),
+    Request: Request.submitted_at,
+}
+"""
+Mapping of models to the time at which each of their records was last written (updated or created).
+"""
+
+
+def version_of(model, *criteria, joins=()):
+    """Builds the query of the version of a set of records: the last time that any of them was written,
+    and the number of them. Updating, adding or removing a record changes the version.
+
+    Args:
+        model (db.Model): the model of the records.
+        criteria (ColumnElement): the filter conditions of the records.
+        joins (tuple, optional): the (target, onclause) pairs to join the records with, to filter them. Defaults to ().
+
+    Returns:
+        Select: the query of the version.
+    """
+    query = db.select(
+        db.func.max(VERSION_TIMESTAMPS[model]), db.func.count()
+    ).select_from(model)
+    for target, onclause in joins:
+        query = query.join(target, onclause)
+    return query.filter(*criteria)
+
+
+ENDPOINT_VERSIONS = {
+    "organization_by_id": lambda id: (
+        version_of(Organization, Organization.id == id),
+        version_of(Membership, Membership.organization_id == id),
+        version_of(
+            User,
+            Membership.organization_id == id,
+            joins=((Membership, Membership.user_id == User.id),),
+        ),
+        version_of(Assignment, Assignment.organization_id == id),
+        version_of(
+            Item,
+            Assignment.organization_id == id,
+            joins=((Assignment, Assignment.item_id == Item.id),),
+        ),
+        version_of(
+            User,
+            Assignment.organization_id == id,
+            joins=(
+                (Item, Item.user_id == User.id),
+                (Assignment, Assignment.item_id == Item.id),
+            ),
+        ),
+        version_of(Request, Request.organization_id == id),
+        version_of(
+            User,
+            Request.organization_id == id,
+            joins=((Request, Request.user_id == User.id),),
+        ),
+    ),
+    "item_by_id": lambda id: (
+        version_of(Item, Item.id == id),
+        version_of(User, Item.id == id, joins=((Item, Item.user_id == User.id),)),
+    ),
+    "assignment_by_id": lambda id: (
+        version_of(Assignment, Assignment.id == id),
+        version_of(
+            Item,
+            Assignment.id == id,
+            joins=((Assignment, Assignment.item_id == Item.id),),
+        ),
+        version_of(
+            User,
+            Assignment.id == id,
+            joins=(
+                (Item, Item.user_id == User.id),
+                (Assignment, Assignment.item_id == Item.id),
+            ),
+        ),
+        version_of(
+            Organization,
+            Assignment.id == id,
+            joins=((Assignment, Assignment.organization_id == Organization.id),),
+        ),
+    ),
+    "membership_by_id": lambda id: (
+        version_of(Membership, Membership.id == id),
+        version_of(
+            User,
+            Membership.id == id,
+            joins=((Membership, Membership.user_id == User.id),),
+        ),
+        version_of(
+            Organization,
+            Membership.id == id,
+            joins=((Membership, Membership.organization_id == Organization.id),),
+        ),
+    ),
+    "request_by_id": lambda id: (
+        version_of(Request, Request.id == id),
+        version_of(
+            User, Request.id == id, joins=((Request, Request.user_id == User.id),)
+        ),
+        version_of(
+            Organization,
+            Request.id == id,
+            joins=((Request, Request.organization_id == Organization.id),),
+        ),
+    ),
+}
+"""
+Mapping of endpoints that serialize a record to the versions of every record that the serialization includes
+(the record, and the related records that ENDPOINT_LOADER_OPTIONS loads for it).
+"""
+
+
+def get_etag(*versions, key=()):
+    """Computes a weak entity tag from the versions of the records that a response is made of.
+    All the versions are read in a single query, without loading any record.
+
+    Args:
+        versions (Select): the queries of the versions (see version_of).
+        key (tuple, optional): anything else that the response depends on, such as the current user. Defaults to ().
+
+    Returns:
+        str: the entity tag.
+    """
+    # Each version is a single row, so the versions are read side by side.
+    subqueries = [version.subquery() for version in versions]
+    versions_row = subqueries[0]
+    for subquery in subqueries[1:]:
+        versions_row = versions_row.join(subquery, db.true())
+    row = db.session.execute(
+        db.select(*(column for subquery in subqueries for column in subquery.columns))
+        .select_from(versions_row)
+    ).one()
+    return hash_etag(*key, *row)
+
+
+def hash_etag(*parts):
+    """
+    Returns:
+        str: a weak entity tag of the current request's URL (path and query) and of everything else that
+        its response depends on.
+    """
+    return hashlib.sha1(repr((request.full_path, *parts)).encode("utf-8")).hexdigest()
+
+
+def check_etag(*versions, key=()):
+    """Computes the entity tag of the current GET request's response (see get_etag), and
+    remembers it so that it is sent with the response.
+
+    Args:
+        versions (Select): the queries of the versions of the records that the response is made of.
+        key (tuple, optional): anything else that the response depends on. Defaults to ().
+
+    Returns:
+        bool: True if the client already has this version of the response (If-None-Match), False otherwise.
+    """
+    g.etag = get_etag(*versions, key=key)
+    return request.if_none_match.contains_weak(g.etag)
+
+
+def check_records_etag(records, key=()):
+    """Computes the entity tag of the current GET request's response from the records that it is made of,
+    once they have been loaded, and remembers it so that it is sent with the response. Unlike check_etag,
+    it costs no query, so it suits responses whose records are only known after querying them, such as a page.
+
+    Args:
+        records (list): the ids and times last written of the records that the response is made of.
+        key (tuple, optional): anything else that the response depends on. Defaults to ().
+
+    Returns:
+        bool: True if the client already has this version of the response (If-None-Match), False otherwise.
+    """
+    g.etag = hash_etag(*key, *records)
+    return request.if_none_match.contains_weak(g.etag)
+
+
+def not_modified():
+    """
+    Returns:
+        Response: an empty 304 Not Modified response, with the entity tag of the current request.
+    """
+    response = make_response("", 304)
+    response.set_etag(g.etag, weak=True)
+    return response
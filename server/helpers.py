@@ -1,6 +1,9 @@
-import inspect
+import base64
+import json
 import sys
 import types
+from contextlib import contextmanager
+from contextvars import ContextVar
 from sqlalchemy.exc import IntegrityError
 import random
 
@@ -25,6 +28,54 @@ def random_alphanumeric_sequence(size=0):
     return sequence
 
 
+def encode_cursor(*values):
+    """Encodes the sort key values of the last record of a page into an opaque cursor,
+    which is used for fetching the next page (keyset pagination).
+
+    Args:
+        values (any): the JSON serializable sort key values.
+
+    Returns:
+        str: the cursor.
+    """
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor, size):
+    """Decodes a cursor generated by encode_cursor.
+
+    Args:
+        cursor (str): the cursor.
+        size (int): the number of sort key values that the cursor must hold.
+
+    Raises:
+        ValueError: if the cursor is malformed.
+
+    Returns:
+        list: the sort key values.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid pagination cursor.")
+    if not (isinstance(values, list) and len(values) == size):
+        raise ValueError("Invalid pagination cursor.")
+    return values
+
+
+def escape_like(text):
+    """Escapes the wildcard characters of a string, so that it can be used in a LIKE pattern.
+    The escape character is a backslash.
+
+    Args:
+        text (str): the text to escape.
+
+    Returns:
+        str: the escaped text.
+    """
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 def is_non_empty_string(var):
     """Validates whether a given variable is a non-empty string.
 
@@ -76,39 +127,198 @@ class RoleType:
         return (cls.REGULAR, cls.ADMIN, cls.OWNER)
 
 
-INVOKED_STACK_INDEX = 2
+UNIQUE_CONSTRAINT_MESSAGES = {
+    "uq_users_username": "Username must be a unique, non-empty string.",
+    "uq_users_email": "An account with the email, {email}, already exists.",
+    "uq_organizations_name": "Name must be a unique, non-empty string.",
+    "uq_items_name": "An item with name, {name}, already exists.",
+    "uq_assignments_item_id": "Item with id {item_id} already exists for organization_id {organization_id}",
+    "uq_memberships_user_id": "User {user_id} already belongs to organization {organization_id}.",
+    "uq_memberships_one_owner": "Only one member of an organization can be the owner.",
+    "uq_requests_user_id": "User of ID {user_id} is already in the request queue for organization ID {organization_id}",
+}
 """
-The index of the stack array that corresponds to the function that another function was invoked on.
+Mapping of unique constraint names to the error messages returned when a write violates them.
+The messages are formatted with the parameters of the failing statement.
 """
 
-MODEL_INVOKER_INDEX = 7
-"""
-The index of the stack array that corresponds to the function that another function was invoked on, when being invoked from a db.Model.
-"""
 
-INVOKED_METHOD_NAME_INDEX = 3
+def get_integrity_error_message(error):
+    """Converts an IntegrityError raised by a database constraint into a readable error message.
+
+    Args:
+        error (IntegrityError): the error.
+
+    Returns:
+        str: the message mapped to the violated constraint, or the database error message if the
+        constraint is not mapped.
+    """
+    constraint_name = getattr(getattr(error.orig, "diag", None), "constraint_name", None)
+    template = UNIQUE_CONSTRAINT_MESSAGES.get(constraint_name)
+    params = error.params if isinstance(error.params, dict) else {}
+    try:
+        return template.format_map(params)
+    except (AttributeError, KeyError):
+        return str(error.orig).split("\n")[0]
+
+
+class EmailStatus:
+    """
+        Static class that holds constants for the delivery status of emails in the outbox.
+
+    Raises:
+        TypeError: if anyone tries to instantiate this class.
+    """
+
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+    def __init__(self):
+        raise TypeError("The 'EmailStatus' class cannot be instantiated")
+
+    @classmethod
+    def get_all(cls):
+        """Returns all the possible email statuses.
+
+        Returns:
+            tuple: All the email statuses as a tuple.
+        """
+        return (cls.PENDING, cls.SENT, cls.FAILED)
+
+
+class JobStatus:
+    """
+        Static class that holds constants for the status of background jobs.
+
+    Raises:
+        TypeError: if anyone tries to instantiate this class.
+    """
+
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+    def __init__(self):
+        raise TypeError("The 'JobStatus' class cannot be instantiated")
+
+    @classmethod
+    def get_all(cls):
+        """Returns all the possible job statuses.
+
+        Returns:
+            tuple: All the job statuses as a tuple.
+        """
+        return (cls.PENDING, cls.RUNNING, cls.SUCCEEDED, cls.FAILED)
+
+
+class LogEventType:
+    """
+        Static class that holds constants for the kinds of events that are logged for an organization.
+        The constants are the codes stored in organization_logs.event_type, so existing values must never change.
+        LEGACY is for logs whose contents could not be converted when logs became event-coded.
+
+    Raises:
+        TypeError: if anyone tries to instantiate this class.
+    """
+
+    LEGACY = 0
+    ORGANIZATION_CREATED = 1
+    ORGANIZATION_UPDATED = 2
+    REQUEST_SUBMITTED = 3
+    MEMBER_JOINED = 4
+    MEMBER_ROLE_CHANGED = 5
+    MEMBER_LEFT = 6
+    MEMBER_REMOVED = 7
+    OWNERSHIP_TRANSFERRED = 8
+    ITEM_CREATED = 9
+    ITEM_ASSIGNED = 10
+    ASSIGNMENT_UPDATED = 11
+    ITEM_UNASSIGNED = 12
+    ITEM_REMOVED = 13
+    STOCK_TAKEN = 14
+
+    def __init__(self):
+        raise TypeError("The 'LogEventType' class cannot be instantiated")
+
+    @classmethod
+    def get_all(cls):
+        """Returns all the possible log event types.
+
+        Returns:
+            tuple: All the log event types as a tuple.
+        """
+        return (
+            cls.LEGACY,
+            cls.ORGANIZATION_CREATED,
+            cls.ORGANIZATION_UPDATED,
+            cls.REQUEST_SUBMITTED,
+            cls.MEMBER_JOINED,
+            cls.MEMBER_ROLE_CHANGED,
+            cls.MEMBER_LEFT,
+            cls.MEMBER_REMOVED,
+            cls.OWNERSHIP_TRANSFERRED,
+            cls.ITEM_CREATED,
+            cls.ITEM_ASSIGNED,
+            cls.ASSIGNMENT_UPDATED,
+            cls.ITEM_UNASSIGNED,
+            cls.ITEM_REMOVED,
+            cls.STOCK_TAKEN,
+        )
+
+
+class OperationType:
+    """
+        Static class that holds constants for the type of write operation being performed on a model.
+        Validators read the current operation type to decide whether checks that only apply to
+        newly created records (such as duplicate lookups) should be enforced.
+
+    Raises:
+        TypeError: if anyone tries to instantiate this class.
+    """
+
+    CREATE = "CREATE"
+    UPDATE = "UPDATE"
+
+    def __init__(self):
+        raise TypeError("The 'OperationType' class cannot be instantiated")
+
+
+_current_operation = ContextVar("current_operation", default=OperationType.CREATE)
 """
-The index of the stack array that corresponds to the name of the function.
+The operation type of the current request/thread. Defaults to CREATE, so that validation
+is strict for any code that does not explicitly declare an operation.
 """
 
 
-def get_invoked_method_name():
-    """Gets the name of the function/method that another function/method was invoked on.
+def get_operation_type():
+    """Gets the type of write operation that is currently being performed.
 
     Returns:
-        str: the name of the funciton/method.
+        str: one of the OperationType constants.
     """
-    return inspect.stack()[INVOKED_STACK_INDEX][INVOKED_METHOD_NAME_INDEX]
+    return _current_operation.get()
 
 
-def stack_trace():
-    for method in inspect.stack():
-        print(method[INVOKED_METHOD_NAME_INDEX])
+@contextmanager
+def operation_context(operation_type):
+    """Declares the type of write operation for all model validations executed inside of it.
+    Can be used as a with statement or as a decorator for resource methods.
 
+    Args:
+        operation_type (str): one of the OperationType constants.
 
-# For debugging
-def get_model_invoker():
-    return inspect.stack()[MODEL_INVOKER_INDEX][INVOKED_METHOD_NAME_INDEX]
+    Raises:
+        ValueError: if operation_type is not one of the OperationType constants.
+    """
+    if operation_type not in (OperationType.CREATE, OperationType.UPDATE):
+        raise ValueError(f"Invalid operation type: {operation_type}")
+    token = _current_operation.set(operation_type)
+    try:
+        yield
+    finally:
+        _current_operation.reset(token)
 
 
 def print_starting_seed(model_name):
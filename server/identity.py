@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import namedtuple
+from flask import session, g
+from config import db
+from models.user import User
+
+IDENTITY_CACHE_TTL = 30
+"""
+The time, in seconds, that a worker keeps the identity of a user before reading it from the database again.
+This is also the longest time that a user who has just been banned can keep using an existing session.
+"""
+
+Identity = namedtuple("Identity", ["id", "username", "is_banned"])
+"""
+The few attributes of the logged in user that nearly every request needs.
+"""
+
+
+class IdentityCache:
+    """
+    Per-worker cache of the identities of recently active users, each kept for IDENTITY_CACHE_TTL seconds.
+    """
+
+    def __init__(self, ttl=IDENTITY_CACHE_TTL):
+        """Creates a new instance of IdentityCache.
+
+        Args:
+            ttl (int, optional): the number of seconds that an identity is kept. Defaults to IDENTITY_CACHE_TTL.
+        """
+        self.ttl = ttl
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        """Retrieves the cached identity of a user.
+
+        Args:
+            user_id (int): the user id.
+
+        Returns:
+            Identity: the identity, or None if it is not cached or has expired.
+        """
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            self.entries.pop(user_id, None)
+            return None
+
+    def set(self, identity):
+        """Caches the identity of a user.
+
+        Args:
+            identity (Identity): the identity.
+        """
+        with self.lock:
+            self.entries[identity.id] = (time.monotonic() + self.ttl, identity)
+
+    def forget(self, user_id):
+        """Removes the identity of a user from the cache, so that it is read again on its next use.
+
+        Args:
+            user_id (int): the user id.
+        """
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+
+identity_cache = IdentityCache()
+
+
+def get_identity():
+    """Retrieves the identity of the logged in user. It is read from the database at most once per
+    IDENTITY_CACHE_TTL seconds per worker, and at most once per request.
+
+    Returns:
+        Identity: the identity, or None if no user is logged in or the user no longer exists.
+    """
+    if "identity" not in g:
+        user_id = session.get("user_id")
+        identity = identity_cache.get(user_id) if user_id else None
+        if user_id and not identity:
+            row = db.session.execute(
+                db.select(User.id, User.username, User.is_banned).filter(
+                    User.id == user_id
+                )
+            ).first()
+            if row:
+                identity = Identity(*row)
+                identity_cache.set(identity)
+        g.identity = identity
+    return g.identity
+
+
+def get_current_user():
+    """Retrieves the logged in user. The user is queried at most once per request.
+
+    Returns:
+        User: the user, or None if no user is logged in or the user no longer exists.
+    """
+    if "current_user" not in g:
+        user_id = session.get("user_id")
+        user = db.session.get(User, user_id) if user_id else None
+        if user:
+            identity_cache.set(Identity(user.id, user.username, user.is_banned))
+        g.current_user = user
+    return g.current_user
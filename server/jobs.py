@@ -0,0 +1,55 @@
+from sqlalchemy.dialects.postgresql import insert
+from config import db
+from models.job import Job
+from helpers import JobStatus
+
+JOB_HANDLERS = {}
+"""
+Mapping of job names to the functions that run them. Filled in by the register_job decorator.
+"""
+
+RECURRING_JOBS = {}
+"""
+Mapping of the names of recurring jobs to their interval, in seconds.
+"""
+
+
+def register_job(name=None, interval=None):
+    """Decorator that registers a function as a background job, run by the worker.
+
+    Args:
+        name (str, optional): the name of the job. Defaults to the name of the function.
+        interval (int, optional): if set, the job recurs every interval seconds. Defaults to None.
+
+    Returns:
+        function: the decorator.
+    """
+
+    def decorator(func):
+        job_name = name or func.__name__
+        JOB_HANDLERS[job_name] = func
+        if interval:
+            RECURRING_JOBS[job_name] = interval
+        return func
+
+    return decorator
+
+
+def schedule_recurring_jobs():
+    """Makes sure that every registered recurring job has its row in the jobs table.
+    Existing rows are left as they are, so that restarting the worker does not reschedule them.
+    """
+    for name, interval in RECURRING_JOBS.items():
+        db.session.execute(
+            insert(Job)
+            .values(name=name, interval_seconds=interval, status=JobStatus.PENDING)
+            .on_conflict_do_nothing(
+                index_elements=["name"],
+                index_where=Job.interval_seconds.isnot(None),
+            )
+        )
+        # Keep the interval in sync with the code.
+        Job.query.filter(
+            Job.name == name, Job.interval_seconds.isnot(None)
+        ).update({"interval_seconds": interval})
+    db.session.commit()
@@ -0,0 +1,182 @@
+import datetime
+from config import db
+
+LOG_PARTITION_PREFIX = "organization_logs_p"
+""" The prefix of the names of the daily partitions of organization_logs. Followed by the date (YYYYMMDD). """
+
+LOG_PARTITION_DATE_FORMAT = "%Y%m%d"
+""" The date format used in the names of the partitions. """
+
+LOG_PARTITIONS_AHEAD = 7
+""" The number of days, after today, for which partitions are created ahead of time. """
+
+LOG_DEFAULT_PARTITION = "organization_logs_default"
+""" The partition that holds the logs of the days that have no partition of their own (e.g. if the worker was down). """
+
+
+def get_partition_name(day):
+    """Returns the name of the partition that holds the logs of a day.
+
+    Args:
+        day (date): the day.
+
+    Returns:
+        str: the partition name.
+    """
+    return f"{LOG_PARTITION_PREFIX}{day.strftime(LOG_PARTITION_DATE_FORMAT)}"
+
+
+def is_log_table_partitioned():
+    """Checks whether organization_logs is a partitioned table. Deployments that cannot use
+    partitioning keep a regular table, whose old logs are purged in batches instead.
+
+    Returns:
+        bool: True if organization_logs is partitioned, False otherwise.
+    """
+    return bool(
+        db.session.scalar(
+            db.text(
+                """
+                SELECT count(*) FROM pg_partitioned_table
+                JOIN pg_class ON pg_class.oid = pg_partitioned_table.partrelid
+                WHERE pg_class.relname = 'organization_logs'
+                """
+            )
+        )
+    )
+
+
+def get_log_partitions():
+    """Retrieves the days of all the existing daily partitions of organization_logs.
+
+    Returns:
+        list: the days, in ascending order.
+    """
+    names = db.session.scalars(
+        db.text(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = 'organization_logs'
+            """
+        )
+    ).all()
+    return sorted(
+        datetime.datetime.strptime(
+            name[len(LOG_PARTITION_PREFIX) :], LOG_PARTITION_DATE_FORMAT
+        ).date()
+        for name in names
+        if name.startswith(LOG_PARTITION_PREFIX)
+    )
+
+
+def get_default_partition_days():
+    """Retrieves the days of the logs that are in the default partition of organization_logs.
+
+    Returns:
+        set: the days.
+    """
+    return set(
+        db.session.scalars(
+            db.text(f"SELECT DISTINCT occurrence::date FROM {LOG_DEFAULT_PARTITION}")
+        )
+    )
+
+
+def create_log_partition(day, has_default_logs=False):
+    """Creates the daily partition of organization_logs that holds the logs of a day.
+    A partition cannot be created while the default partition holds logs that belong to it,
+    so those logs are moved into the new partition, with the default partition detached meanwhile.
+
+    Args:
+        day (date): the day.
+        has_default_logs (bool, optional): whether the default partition holds logs of the day. Defaults to False.
+    """
+    name = get_partition_name(day)
+    bounds = {"start": day, "end": day + datetime.timedelta(days=1)}
+    if has_default_logs:
+        db.session.execute(
+            db.text(
+                f"ALTER TABLE organization_logs DETACH PARTITION {LOG_DEFAULT_PARTITION}"
+            )
+        )
+    db.session.execute(
+        db.text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF organization_logs "
+            f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+        )
+    )
+    if has_default_logs:
+        db.session.execute(
+            db.text(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {LOG_DEFAULT_PARTITION}
+                    WHERE occurrence >= :start AND occurrence < :end
+                    RETURNING id, event_type, params, occurrence, organization_id
+                )
+                INSERT INTO organization_logs (id, event_type, params, occurrence, organization_id)
+                SELECT * FROM moved
+                """
+            ),
+            bounds,
+        )
+        db.session.execute(
+            db.text(
+                f"ALTER TABLE organization_logs ATTACH PARTITION {LOG_DEFAULT_PARTITION} DEFAULT"
+            )
+        )
+
+
+def create_log_partitions(days_ahead=LOG_PARTITIONS_AHEAD):
+    """Creates the daily partitions of organization_logs from today until days_ahead days from now,
+    and those of the days whose logs were written to the default partition, skipping those that already exist.
+
+    Args:
+        days_ahead (int, optional): the number of days after today to create partitions for. Defaults to LOG_PARTITIONS_AHEAD.
+
+    Returns:
+        list: the names of the partitions that were created.
+    """
+    # Occurrences are set by the database, so days are counted with the database's clock too.
+    today = db.session.scalar(db.select(db.func.current_date()))
+    existing = set(get_log_partitions())
+    default_days = get_default_partition_days()
+    days = {today + datetime.timedelta(days=offset) for offset in range(days_ahead + 1)}
+    created = []
+    for day in sorted((days | default_days) - existing):
+        create_log_partition(day, has_default_logs=day in default_days)
+        # Each partition is committed on its own, so that writers are never blocked for long.
+        db.session.commit()
+        created.append(get_partition_name(day))
+    return created
+
+
+def drop_expired_log_partitions(retention_days):
+    """Detaches and drops every partition of organization_logs whose logs are all at least
+    retention_days old. The cost does not depend on the number of logs in the partitions.
+    Since whole days are dropped, logs are kept for up to one day longer than retention_days.
+
+    Args:
+        retention_days (int): the number of days that a log is kept.
+
+    Returns:
+        list: the names of the partitions that were dropped.
+    """
+    cutoff = db.session.scalar(
+        db.select(db.func.current_date())
+    ) - datetime.timedelta(days=retention_days)
+    dropped = []
+    for day in get_log_partitions():
+        # The partition of a day holds the logs from that day until the next one.
+        if day + datetime.timedelta(days=1) > cutoff:
+            break
+        name = get_partition_name(day)
+        db.session.execute(
+            db.text(f"ALTER TABLE organization_logs DETACH PARTITION {name}")
+        )
+        db.session.execute(db.text(f"DROP TABLE {name}"))
+        db.session.commit()
+        dropped.append(name)
+    return dropped
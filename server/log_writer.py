@@ -0,0 +1,179 @@
+import atexit
+import queue
+import threading
+import time
+from flask import g
+from sqlalchemy.exc import IntegrityError
+from config import app, db
+from models.organization import Organization
+from models.organization_log import OrganizationLog
+from identity import get_identity
+
+LOG_BATCH_SIZE = 100
+""" The number of queued log events that triggers a flush. """
+
+LOG_FLUSH_INTERVAL_MS = 500
+""" The maximum time, in milliseconds, that a log event waits in the queue before it is flushed. """
+
+
+class OrganizationLogWriter:
+    """
+    Writes organization logs in the background. Requests only push their log events onto an
+    in-process queue; a writer thread inserts them with a single multi-row INSERT every
+    batch_size events or every flush_interval_ms milliseconds, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        flask_app,
+        batch_size=LOG_BATCH_SIZE,
+        flush_interval_ms=LOG_FLUSH_INTERVAL_MS,
+    ):
+        """Creates a new instance of OrganizationLogWriter.
+
+        Args:
+            flask_app (Flask): the app whose database the logs are written to.
+            batch_size (int, optional): the number of events that triggers a flush. Defaults to LOG_BATCH_SIZE.
+            flush_interval_ms (int, optional): the maximum time an event is queued. Defaults to LOG_FLUSH_INTERVAL_MS.
+        """
+        self.app = flask_app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.events = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = None
+        # Registered once, however many times the writer is started and stopped.
+        atexit.register(self.stop)
+
+    def start(self):
+        """Starts the writer thread. The writer is stopped (and flushed) on shutdown."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="organization-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stops the writer thread once every queued event has been written."""
+        self._stopped.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join()
+        # Write anything that was queued after the thread exited.
+        self._flush(self._drain())
+
+    def write(self, event_type, organization_id, actor=None, payload=None):
+        """Queues a log event.
+
+        Args:
+            event_type (int): the type of the event (see LogEventType).
+            organization_id (int): the id of the organization that the log belongs to.
+            actor (str, optional): the username of the user who performed the event. Defaults to None.
+            payload (dict, optional): the details of the event. Defaults to None.
+        """
+        self.events.put((event_type, organization_id, actor, payload or {}))
+
+    def _run(self):
+        """Collects queued events into batches and flushes them until the writer is stopped."""
+        while not (self._stopped.is_set() and self.events.empty()):
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.events.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                if self._stopped.is_set():
+                    batch.extend(self._drain())
+                    break
+            self._flush(batch)
+
+    def _drain(self):
+        """Removes every event currently in the queue.
+
+        Returns:
+            list: the removed events.
+        """
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _flush(self, events):
+        """Inserts a batch of events with a single multi-row INSERT. If an organization was deleted
+        after its event was queued, the events of deleted organizations are dropped and the rest are retried.
+
+        Args:
+            events (list): the events.
+        """
+        if not events:
+            return
+        batch = [
+            {
+                "event_type": event_type,
+                "params": OrganizationLog.get_params(payload, actor),
+                "organization_id": organization_id,
+            }
+            for event_type, organization_id, actor, payload in events
+        ]
+        with self.app.app_context():
+            try:
+                try:
+                    db.session.execute(db.insert(OrganizationLog).values(batch))
+                    db.session.commit()
+                except IntegrityError:
+                    db.session.rollback()
+                    existing_ids = set(
+                        db.session.scalars(
+                            db.select(Organization.id).filter(
+                                Organization.id.in_(
+                                    {event["organization_id"] for event in batch}
+                                )
+                            )
+                        )
+                    )
+                    batch = [
+                        event
+                        for event in batch
+                        if event["organization_id"] in existing_ids
+                    ]
+                    if batch:
+                        db.session.execute(db.insert(OrganizationLog).values(batch))
+                        db.session.commit()
+            except Exception as e:
+                # Never let a failed write stop the writer thread.
+                db.session.rollback()
+                print(f"Failed to write {len(batch)} organization logs: {e}", flush=True)
+
+
+log_writer = OrganizationLogWriter(app)
+"""
+The organization log writer of the app.
+"""
+
+
+def log_event(event_type, organization_id, **payload):
+    """Records an event of the current request in the organization's logs. The actor of the
+    event is the logged in user. The event is handed to the log writer once the request's
+    transaction is committed, and is discarded if it is rolled back.
+
+    Args:
+        event_type (int): the type of the event (see LogEventType).
+        organization_id (int): the id of the organization that the event occurred in.
+        payload (any): the details of the event, as keyword arguments.
+    """
+    identity = get_identity()
+    g.setdefault("log_events", []).append(
+        {
+            "event_type": event_type,
+            "organization_id": organization_id,
+            "actor": identity.username if identity else None,
+            "payload": payload,
+        }
+    )
@@ -0,0 +1,86 @@
+import datetime
+from config import app, db
+from models.models import (
+    User,
+    Organization,
+    Item,
+    Membership,
+    Assignment,
+    Request,
+    OrganizationLog,
+)
+from jobs import register_job
+from log_partitions import (
+    is_log_table_partitioned,
+    create_log_partitions,
+    drop_expired_log_partitions,
+)
+from purge import purge_in_batches
+
+LOG_DURATION_LIMIT = 7
+""" The maximum number of days that a log remains in the organization.
+    This should be more than enough time for admins to read through all
+    their logs.
+"""
+
+SCHEDULER_INTERVAL = 86400
+""" The standard interval, in seconds, to execute a background job. """
+
+
+@register_job(interval=SCHEDULER_INTERVAL)
+def delete_old_logs():
+    """
+    Deletes all logs from all organizations that are at least seven days old. If organization_logs
+    is partitioned, the partitions of the upcoming days are created (and those of any logs that were
+    written to the default partition meanwhile), and the daily partitions of old logs are dropped.
+    Otherwise, old logs are deleted in batches.
+
+    Articles of Reference:
+    https://www.geeksforgeeks.org/how-to-make-a-timezone-aware-datetime-object-in-python/
+    https://stackoverflow.com/questions/63693872/flask-how-can-i-delete-data-ranging-back-x-days
+    """
+    with app.app_context():
+        if is_log_table_partitioned():
+            create_log_partitions()
+            drop_expired_log_partitions(LOG_DURATION_LIMIT)
+        else:
+            cutoff = db.func.now() - datetime.timedelta(days=LOG_DURATION_LIMIT)
+            purge_in_batches(
+                OrganizationLog,
+                OrganizationLog.occurrence <= cutoff,
+                description="expired organization logs",
+            )
+        # print("Old logs have been cleared.", flush=True)
+
+
+@register_job(interval=SCHEDULER_INTERVAL)
+def delete_orphaned_records():
+    """
+    Deletes the assignments, requests, and memberships that no longer belong to an existing
+    item, user, or organization (i.e. left behind by past partial failures), in batches.
+    """
+    # Mapping of each model to the (parent model, foreign key) pairs that it must belong to.
+    parents = {
+        Assignment: (
+            (Item, Assignment.item_id),
+            (Organization, Assignment.organization_id),
+        ),
+        Request: ((User, Request.user_id), (Organization, Request.organization_id)),
+        Membership: (
+            (User, Membership.user_id),
+            (Organization, Membership.organization_id),
+        ),
+    }
+    with app.app_context():
+        for model, model_parents in parents.items():
+            # A null foreign key has no matching parent either.
+            purge_in_batches(
+                model,
+                db.or_(
+                    *(
+                        ~db.exists().where(parent.id == foreign_key)
+                        for parent, foreign_key in model_parents
+                    )
+                ),
+                description=f"orphaned {model.__tablename__}",
+            )
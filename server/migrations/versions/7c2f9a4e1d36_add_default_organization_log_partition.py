@@ -0,0 +1,45 @@
+"""Add default organization log partition
+
+Revision ID: 7c2f9a4e1d36
+Revises: 1b6e4c8d2a70
+Create Date: 2026-10-18 19:52:44.183650
+
+"""
+import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2f9a4e1d36'
+down_revision = '1b6e4c8d2a70'
+branch_labels = None
+depends_on = None
+
+# Must match log_partitions.py.
+LOG_PARTITION_PREFIX = 'organization_logs_p'
+LOG_DEFAULT_PARTITION = 'organization_logs_default'
+
+
+def upgrade():
+    # Logs of days without a partition of their own are kept here, instead of failing to be written.
+    op.execute(f'CREATE TABLE {LOG_DEFAULT_PARTITION} PARTITION OF organization_logs DEFAULT')
+
+
+def downgrade():
+    bind = op.get_bind()
+    op.execute(f'ALTER TABLE organization_logs DETACH PARTITION {LOG_DEFAULT_PARTITION}')
+    # Give the logs of the default partition a daily partition of their own, so that they are kept.
+    days = bind.execute(sa.text(f'SELECT DISTINCT occurrence::date FROM {LOG_DEFAULT_PARTITION}')).scalars().all()
+    for day in days:
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {LOG_PARTITION_PREFIX}{day.strftime('%Y%m%d')} PARTITION OF organization_logs "
+            f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + datetime.timedelta(days=1)).isoformat()}')"
+        )
+    op.execute(
+        f"""
+        INSERT INTO organization_logs (id, event_type, params, occurrence, organization_id)
+        SELECT id, event_type, params, occurrence, organization_id FROM {LOG_DEFAULT_PARTITION}
+        """
+    )
+    op.execute(f'DROP TABLE {LOG_DEFAULT_PARTITION}')
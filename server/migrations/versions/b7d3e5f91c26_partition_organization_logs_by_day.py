@@ -0,0 +1,106 @@
+"""Partition organization logs by day
+
+Revision ID: b7d3e5f91c26
+Revises: e2c94d7a1b58
+Create Date: 2026-10-18 15:21:09.337162
+
+"""
+import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3e5f91c26'
+down_revision = 'e2c94d7a1b58'
+branch_labels = None
+depends_on = None
+
+# Must match log_partitions.py.
+LOG_PARTITION_PREFIX = 'organization_logs_p'
+LOG_PARTITIONS_AHEAD = 7
+
+
+def upgrade():
+    bind = op.get_bind()
+    # Move the existing table out of the way, freeing the names of its constraints and indexes.
+    op.execute('ALTER TABLE organization_logs RENAME TO organization_logs_unpartitioned')
+    op.execute('ALTER TABLE organization_logs_unpartitioned RENAME CONSTRAINT pk_organization_logs TO pk_organization_logs_unpartitioned')
+    op.execute('ALTER TABLE organization_logs_unpartitioned DROP CONSTRAINT fk_organization_logs_organization_id_organizations')
+    op.execute('DROP INDEX ix_organization_logs_occurrence')
+    op.execute('DROP INDEX ix_organization_logs_organization_id')
+
+    op.execute(
+        """
+        CREATE TABLE organization_logs (
+            id INTEGER NOT NULL DEFAULT nextval('organization_logs_id_seq'),
+            event_type SMALLINT NOT NULL,
+            params JSONB NOT NULL DEFAULT '{}'::jsonb,
+            occurrence TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            organization_id INTEGER NOT NULL,
+            CONSTRAINT pk_organization_logs PRIMARY KEY (id, occurrence),
+            CONSTRAINT fk_organization_logs_organization_id_organizations
+                FOREIGN KEY (organization_id) REFERENCES organizations (id)
+        ) PARTITION BY RANGE (occurrence)
+        """
+    )
+    op.execute('ALTER SEQUENCE organization_logs_id_seq OWNED BY organization_logs.id')
+    with op.batch_alter_table('organization_logs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_organization_logs_occurrence'), ['occurrence'], unique=False)
+        batch_op.create_index(batch_op.f('ix_organization_logs_organization_id'), ['organization_id'], unique=False)
+
+    # One partition per day, from the oldest log until LOG_PARTITIONS_AHEAD days from now.
+    today = bind.execute(sa.text('SELECT current_date')).scalar()
+    oldest = bind.execute(sa.text('SELECT min(occurrence)::date FROM organization_logs_unpartitioned')).scalar()
+    day = min(oldest or today, today)
+    while day <= today + datetime.timedelta(days=LOG_PARTITIONS_AHEAD):
+        next_day = day + datetime.timedelta(days=1)
+        op.execute(
+            f"CREATE TABLE {LOG_PARTITION_PREFIX}{day.strftime('%Y%m%d')} PARTITION OF organization_logs "
+            f"FOR VALUES FROM ('{day.isoformat()}') TO ('{next_day.isoformat()}')"
+        )
+        day = next_day
+
+    op.execute(
+        """
+        INSERT INTO organization_logs (id, event_type, params, occurrence, organization_id)
+        SELECT id, event_type, params, occurrence, organization_id FROM organization_logs_unpartitioned
+        """
+    )
+    op.execute('DROP TABLE organization_logs_unpartitioned')
+
+
+def downgrade():
+    op.execute('ALTER TABLE organization_logs RENAME TO organization_logs_partitioned')
+    op.execute('ALTER TABLE organization_logs_partitioned RENAME CONSTRAINT pk_organization_logs TO pk_organization_logs_partitioned')
+    op.execute('ALTER TABLE organization_logs_partitioned DROP CONSTRAINT fk_organization_logs_organization_id_organizations')
+    op.execute('DROP INDEX ix_organization_logs_occurrence')
+    op.execute('DROP INDEX ix_organization_logs_organization_id')
+
+    op.execute(
+        """
+        CREATE TABLE organization_logs (
+            id INTEGER NOT NULL DEFAULT nextval('organization_logs_id_seq'),
+            event_type SMALLINT NOT NULL,
+            params JSONB NOT NULL DEFAULT '{}'::jsonb,
+            occurrence TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            organization_id INTEGER NOT NULL,
+            CONSTRAINT pk_organization_logs PRIMARY KEY (id),
+            CONSTRAINT fk_organization_logs_organization_id_organizations
+                FOREIGN KEY (organization_id) REFERENCES organizations (id)
+        )
+        """
+    )
+    op.execute('ALTER SEQUENCE organization_logs_id_seq OWNED BY organization_logs.id')
+    with op.batch_alter_table('organization_logs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_organization_logs_occurrence'), ['occurrence'], unique=False)
+        batch_op.create_index(batch_op.f('ix_organization_logs_organization_id'), ['organization_id'], unique=False)
+
+    op.execute(
+        """
+        INSERT INTO organization_logs (id, event_type, params, occurrence, organization_id)
+        SELECT id, event_type, params, occurrence, organization_id FROM organization_logs_partitioned
+        """
+    )
+    # Dropping the partitioned table drops all of its partitions.
+    op.execute('DROP TABLE organization_logs_partitioned')
@@ -0,0 +1,142 @@
+"""Store logs as event codes
+
+Revision ID: e2c94d7a1b58
+Revises: a61e0b93d7c4
+Create Date: 2026-10-18 14:02:37.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c94d7a1b58'
+down_revision = 'a61e0b93d7c4'
+branch_labels = None
+depends_on = None
+
+# Event codes and the formats of their log lines, as of this revision.
+# Each event is (code, [(line pattern, [parameter name of each group]), ...]).
+LOG_EVENT_FORMATS = [
+    (1, [(r'^User, "(.*)", created a new organization: "(.*)"\.$', ['actor', 'org_name'])]),
+    (2, [(r'^The owner has updated the name/description/logo/banner of this organization$', [])]),
+    (3, [(r'^User, "(.*)", has requested to join this organization\.$', ['username'])]),
+    (4, [(r'''^User,"(.*)', joined this organization\.$''', ['username'])]),
+    (5, [(r'^User,"(.*)" has been (?:demoted|promoted) to (.*) by admin, "(.*)"\.$', ['username', 'role', 'actor'])]),
+    (6, [(r'^User,"(.*)" left this organization\.$', ['actor'])]),
+    (7, [(r'^Admin,"(.*)", removed user,"(.*)", from this organization$', ['actor', 'username'])]),
+    (8, [(r'^Owner, "(.*)", has transferred ownership of this organization to admin, "(.*)", and left\.$', ['actor', 'new_owner'])]),
+    (9, [
+        (r'^An item has been assigned by the seed to this organization$', []),
+        (r'^Name: (.*)$', ['item_name']),
+        (r'^Part #: (.*)$', ['part_number']),
+    ]),
+    (10, [
+        (r'^An item has been assigned by user, "(.*)", to this organization$', ['actor']),
+        (r'^Name: (.*)$', ['item_name']),
+        (r'^Part #: (.*)$', ['part_number']),
+    ]),
+    (11, [(r'^Item assignment updated\.$', [])]),
+    (12, [
+        (r'^An item has been unassigned by admin, "(.*)", from this organization$', ['actor']),
+        (r'^Name: (.*)$', ['item_name']),
+        (r'^Part #: (.*)$', ['part_number']),
+    ]),
+    (13, [
+        (r'^The owner of an item this organization uses has removed it from the system$', []),
+        (r'^Name: (.*)$', ['item_name']),
+        (r'^Part Number: (.*)$', ['part_number']),
+        (r'^Current Quantity: (.*)$', ['current_quantity']),
+        (r'^Enough Threshold: (.*)$', ['enough_threshold']),
+    ]),
+]
+
+LOG_EVENT_CONTENTS = {
+    1: """ARRAY[format('User, "%s", created a new organization: "%s".', params->>'actor', params->>'org_name')]""",
+    2: """ARRAY['The owner has updated the name/description/logo/banner of this organization']""",
+    3: """ARRAY[format('User, "%s", has requested to join this organization.', params->>'username')]""",
+    4: """ARRAY[format('User,"%s'', joined this organization.', params->>'username')]""",
+    5: """ARRAY[CASE WHEN params->>'role' = 'REGULAR'
+        THEN format('User,"%s" has been demoted to REGULAR by admin, "%s".', params->>'username', params->>'actor')
+        ELSE format('User,"%s" has been promoted to %s by admin, "%s".', params->>'username', params->>'role', params->>'actor') END]""",
+    6: """ARRAY[format('User,"%s" left this organization.', params->>'actor')]""",
+    7: """ARRAY[format('Admin,"%s", removed user,"%s", from this organization', params->>'actor', params->>'username')]""",
+    8: """ARRAY[format('Owner, "%s", has transferred ownership of this organization to admin, "%s", and left.', params->>'actor', params->>'new_owner')]""",
+    9: """ARRAY['An item has been assigned by the seed to this organization',
+        format('Name: %s', params->>'item_name'), format('Part #: %s', coalesce(params->>'part_number', 'None'))]""",
+    10: """ARRAY[format('An item has been assigned by user, "%s", to this organization', params->>'actor'),
+        format('Name: %s', params->>'item_name'), format('Part #: %s', coalesce(params->>'part_number', 'None'))]""",
+    11: """ARRAY['Item assignment updated.']""",
+    12: """ARRAY[format('An item has been unassigned by admin, "%s", from this organization', params->>'actor'),
+        format('Name: %s', params->>'item_name'), format('Part #: %s', coalesce(params->>'part_number', 'None'))]""",
+    13: """ARRAY['The owner of an item this organization uses has removed it from the system',
+        format('Name: %s', params->>'item_name'), format('Part Number: %s', coalesce(params->>'part_number', 'None')),
+        format('Current Quantity: %s', params->>'current_quantity'), format('Enough Threshold: %s', params->>'enough_threshold')]""",
+}
+
+
+def upgrade():
+    with op.batch_alter_table('organization_logs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('event_type', sa.SmallInteger(), nullable=True))
+        batch_op.add_column(sa.Column('params', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False))
+
+    # Parse the contents of every existing log back into its event code and parameters.
+    for code, lines in LOG_EVENT_FORMATS:
+        matches = ', '.join(
+            f'regexp_match(contents[{i}], :pattern_{i}) AS m{i}' for i in range(1, len(lines) + 1)
+        )
+        conditions = ' AND '.join(f'parsed.m{i} IS NOT NULL' for i in range(1, len(lines) + 1))
+        params = ', '.join(
+            f"'{name}', parsed.m{i}[{group}]"
+            for i, (_, names) in enumerate(lines, start=1)
+            for group, name in enumerate(names, start=1)
+        )
+        op.execute(
+            sa.text(
+                f"""
+                UPDATE organization_logs SET event_type = :code, params = jsonb_strip_nulls(jsonb_build_object({params}))
+                FROM (
+                    SELECT id, {matches} FROM organization_logs
+                    WHERE event_type IS NULL AND coalesce(array_length(contents, 1), 0) = :line_count
+                ) AS parsed
+                WHERE organization_logs.id = parsed.id AND {conditions}
+                """
+            ).bindparams(
+                code=code,
+                line_count=len(lines),
+                **{f'pattern_{i}': pattern for i, (pattern, _) in enumerate(lines, start=1)},
+            )
+        )
+    # Anything else is kept as is.
+    op.execute(
+        """
+        UPDATE organization_logs SET event_type = 0,
+            params = jsonb_build_object('contents', to_jsonb(coalesce(contents, ARRAY[]::varchar[])))
+        WHERE event_type IS NULL
+        """
+    )
+
+    with op.batch_alter_table('organization_logs', schema=None) as batch_op:
+        batch_op.alter_column('event_type',
+               existing_type=sa.SmallInteger(),
+               nullable=False)
+        batch_op.drop_column('contents')
+
+
+def downgrade():
+    with op.batch_alter_table('organization_logs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('contents', postgresql.ARRAY(sa.VARCHAR()), autoincrement=False, nullable=True))
+
+    for code, contents in LOG_EVENT_CONTENTS.items():
+        op.execute(sa.text(f"UPDATE organization_logs SET contents = {contents} WHERE event_type = :code").bindparams(code=code))
+    op.execute(
+        """
+        UPDATE organization_logs SET contents = ARRAY(SELECT jsonb_array_elements_text(params->'contents'))
+        WHERE event_type = 0
+        """
+    )
+
+    with op.batch_alter_table('organization_logs', schema=None) as batch_op:
+        batch_op.drop_column('params')
+        batch_op.drop_column('event_type')
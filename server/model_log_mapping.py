@@ -1,134 +1,154 @@
-from helpers import RoleType
+from helpers import RoleType, LogEventType
 
+# Each formatter takes the parameters of a log event and the username of the user who
+# performed it (the actor), and returns the contents of the organization log.
+# Logs are stored as an event type and its parameters, and formatted whenever they are read.
 
-def do_nothing(arg1=None, arg2=None):
-    pass
 
+def legacy(payload, actor=None):
+    return payload["contents"]
 
-class ModelLogMap:
-    """
-    Collection of functions that generate template log content messages when
-    certain POST, PATCH, or DELETE requests are made.
-    """
 
-    mappings = {}
+# Organization Formatters
 
-    def __init__(self, model_key, post=do_nothing, patch=do_nothing, delete=do_nothing):
-        """Creates a new instance of ModelLogMap.
 
-        Args:
-            model_key (str): the name of the model. PLEASE END THE KEY WITH '_l'.
-            post (function, optional): the function to execute if the request method was POST. Defaults to do_nothing.
-            patch (function, optional): the function to execute if the request method was PATCH. Defaults to do_nothing.
-            delete (function, optional): the function to execute if the request method was DELETE. Defaults to do_nothing.
-        """
+def organization_created(payload, actor=None):
+    return [f"User, \"{actor}\", created a new organization: \"{payload['org_name']}\"."]
 
-        self.post = post
-        self.patch = patch
-        self.delete = delete
 
-        type(self).mappings[model_key] = self
+def organization_updated(payload=None, actor=None):
+    return [
+        "The owner has updated the name/description/logo/banner of this organization"
+    ]
 
-    def __repr__(self):
-        return (
-            f"<ModelLogMap post={self.post}, patch={self.patch}, delete={self.delete}>"
-        )
 
+# Membership Formatters
 
-# Membership Mapping
 
+def request_submitted(payload, actor=None):
+    return [
+        f"User, \"{payload['username']}\", has requested to join this organization."
+    ]
 
-def membership_post(membership, admin=None):
-    if membership["role"] == RoleType.OWNER:
-        return [
-            f"User, \"{membership['user']['username']}\", created a new organization: \"{membership['organization']['name']}\"."
-        ]
-    else:
-        return [f"User,\"{membership['user']['username']}', joined this organization."]
 
+def member_joined(payload, actor=None):
+    return [f"User,\"{payload['username']}', joined this organization."]
 
-def membership_patch(membership, admin):
-    if membership["role"] == RoleType.REGULAR:
+
+def member_role_changed(payload, actor):
+    if payload["role"] == RoleType.REGULAR:
         return [
-            f"User,\"{membership['user']['username']}\" has been demoted to {RoleType.REGULAR} by admin, \"{admin.username}\"."
+            f"User,\"{payload['username']}\" has been demoted to {RoleType.REGULAR} by admin, \"{actor}\"."
         ]
     else:
         return [
-            f"User,\"{membership['user']['username']}\" has been promoted to {membership['role']} by admin, \"{admin.username}\"."
+            f"User,\"{payload['username']}\" has been promoted to {payload['role']} by admin, \"{actor}\"."
         ]
 
 
-def membership_delete(membership, expeller):
-    if expeller.id == membership["user_id"]:
-        return [f"User,\"{membership['user']['username']}\" left this organization."]
-    else:
-        return [
-            f"Admin,\"{expeller.username}\", removed user,\"{membership['user']['username']}\", from this organization"
-        ]
-
+def member_left(payload=None, actor=None):
+    return [f'User,"{actor}" left this organization.']
 
-membership_map = ModelLogMap(
-    "membership_l", membership_post, membership_patch, membership_delete
-)
 
-# Item Mapping
+def member_removed(payload, actor):
+    return [
+        f"Admin,\"{actor}\", removed user,\"{payload['username']}\", from this organization"
+    ]
 
 
-def item_post(item_response, arg2=None):
+def ownership_transferred(payload, actor):
     return [
-        "An item has been assigned by the seed to this organization",
-        f"Name: {item_response['item']['name']}",
-        f"Part #: {item_response['item'].get('part_number')}",
+        f"Owner, \"{actor}\", has transferred ownership of this organization to admin, \"{payload['new_owner']}\", and left."
     ]
 
 
-item_map = ModelLogMap(model_key="item_l", post=item_post)
-
-# Assignment Mapping
+# Item Formatters
 
 
-def assignment_post(assignment_response, user):
+def item_created(payload, actor=None):
     return [
-        f'An item has been assigned by user, "{user.username}", to this organization',
-        f"Name: {assignment_response['assignment']['item']['name']}",
-        f"Part #: {assignment_response['assignment']['item']['part_number']}",
+        "An item has been assigned by the seed to this organization",
+        f"Name: {payload['item_name']}",
+        f"Part #: {payload['part_number']}",
     ]
 
 
-def assignment_patch(arg1=None, arg=None):
-    # Will require advanced processing at a later date.
-    return ["Item assignment updated."]
-
-
-def assignment_delete(assignment, admin):
+def item_assigned(payload, actor):
     return [
-        f'An item has been unassigned by admin, "{admin.username}", from this organization',
-        f"Name: {assignment['item']['name']}",
-        f"Part #: {assignment['item']['part_number']}",
+        f'An item has been assigned by user, "{actor}", to this organization',
+        f"Name: {payload['item_name']}",
+        f"Part #: {payload['part_number']}",
     ]
 
 
-assignment_map = ModelLogMap(
-    "assignment_l", assignment_post, assignment_patch, assignment_delete
-)
-
-# Organization Mapping
+def assignment_updated(payload=None, actor=None):
+    # Will require advanced processing at a later date.
+    return ["Item assignment updated."]
 
 
-def org_patch(arg1=None, arg2=None):
+def item_unassigned(payload, actor):
     return [
-        "The owner has updated the name/description/logo/banner of this organization"
+        f'An item has been unassigned by admin, "{actor}", from this organization',
+        f"Name: {payload['item_name']}",
+        f"Part #: {payload['part_number']}",
     ]
 
 
-org_map = ModelLogMap(model_key="organization_l", patch=org_patch)
-
-
-# Request Mapping
-def request_post(requester, arg2=None):
+def item_removed(payload, actor=None):
     return [
-        f"User, \"{requester['user']['username']}\", has requested to join this organization."
+        f"The owner of an item this organization uses has removed it from the system",
+        f"Name: {payload['item_name']}",
+        f"Part Number: {payload['part_number']}",
+        f"Current Quantity: {payload['current_quantity']}",
+        f"Enough Threshold: {payload['enough_threshold']}",
     ]
 
 
-request_map = ModelLogMap(model_key="request_l", post=request_post)
+def stock_taken(payload, actor):
+    lines = [
+        f'A stock-take was recorded by user, "{actor}", for this organization',
+        f"Items counted: {payload['items_counted']}",
+    ]
+    for change in payload["changes"]:
+        delta = change["counted"] - change["previous"]
+        lines.append(
+            f"{change['item_name']} (Part #: {change['part_number']}): "
+            f"{change['previous']} -> {change['counted']} ({delta:+d})"
+        )
+    return lines
+
+
+LOG_FORMATTERS = {
+    LogEventType.LEGACY: legacy,
+    LogEventType.ORGANIZATION_CREATED: organization_created,
+    LogEventType.ORGANIZATION_UPDATED: organization_updated,
+    LogEventType.REQUEST_SUBMITTED: request_submitted,
+    LogEventType.MEMBER_JOINED: member_joined,
+    LogEventType.MEMBER_ROLE_CHANGED: member_role_changed,
+    LogEventType.MEMBER_LEFT: member_left,
+    LogEventType.MEMBER_REMOVED: member_removed,
+    LogEventType.OWNERSHIP_TRANSFERRED: ownership_transferred,
+    LogEventType.ITEM_CREATED: item_created,
+    LogEventType.ITEM_ASSIGNED: item_assigned,
+    LogEventType.ASSIGNMENT_UPDATED: assignment_updated,
+    LogEventType.ITEM_UNASSIGNED: item_unassigned,
+    LogEventType.ITEM_REMOVED: item_removed,
+    LogEventType.STOCK_TAKEN: stock_taken,
+}
+"""
+Mapping of each log event type to the function that formats its log contents.
+"""
+
+
+def format_log(event_type, payload, actor=None):
+    """Formats the contents of an organization log from a log event.
+
+    Args:
+        event_type (int): the type of the event (see LogEventType).
+        payload (dict): the details of the event.
+        actor (str, optional): the username of the user who performed the event. Defaults to None.
+
+    Returns:
+        list: the contents of the log.
+    """
+    return LOG_FORMATTERS[event_type](payload, actor)
@@ -0,0 +1,237 @@
+from collections.abc import Iterable
+from datetime import datetime, date, time
+from decimal import Decimal
+from enum import Enum
+from threading import RLock
+import uuid
+from sqlalchemy import inspect as sql_inspect
+from sqlalchemy.orm import RelationshipProperty
+from sqlalchemy_serializer import SerializerMixin
+from sqlalchemy_serializer.serializer import Serializer
+from sqlalchemy_serializer.lib.schema import Schema
+
+SIMPLE_TYPES = (int, str, float, bool, type(None))
+"""
+Types that are returned as is by the serializer.
+"""
+
+_compile_lock = RLock()
+"""
+Guards schema compilation, since compiling mutates the schema tree of a serializer.
+"""
+
+
+class CompiledSerializer:
+    """
+    Flat serializer for one model at one position of a serialization schema.
+
+    The serialize_only/serialize_rules of the model are resolved exactly once, with the same
+    schema logic that sqlalchemy_serializer uses, into a tuple of (key, accessor) pairs.
+    Relationships are handled by nested CompiledSerializers, which are compiled the first time
+    a related record is encountered. Serializing a record is then a single pass over the
+    accessors, with no rule processing.
+    """
+
+    def __init__(self, model, schema, options, key=None):
+        """Creates a new instance of CompiledSerializer.
+
+        Args:
+            model (db.Model): the model that this serializer serializes.
+            schema (Schema): the schema to compile the model against. If key is set, this is the schema of the parent model.
+            options (dict): the formatting options to use (date_format, datetime_format, etc.).
+            key (str, optional): the attribute name of the parent model this serializer is nested under. Defaults to None.
+        """
+        self.model = model
+        self.options = options
+        self._schema = schema
+        self._key = key
+        self._fields = None
+
+    def __repr__(self):
+        return f"<CompiledSerializer {self.model.__name__}, {self._key}>"
+
+    def __call__(self, record):
+        """Serializes a record.
+
+        Args:
+            record (db.Model): the record.
+
+        Returns:
+            dict: the JSON compatible dictionary of the record.
+        """
+        return {key: accessor(record) for key, accessor in self.fields}
+
+    @property
+    def fields(self):
+        """
+        Returns:
+            tuple: the compiled (key, accessor) pairs of this serializer.
+        """
+        if self._fields is None:
+            with _compile_lock:
+                if self._fields is None:
+                    self._fields = self._compile()
+        return self._fields
+
+    def _compile(self):
+        """Resolves the schema of the model into a tuple of (key, accessor) pairs.
+
+        Returns:
+            tuple: the compiled fields.
+        """
+        schema = self._schema.fork(self._key) if self._key else self._schema
+        self._schema = schema
+        self._key = None
+        schema.update(only=self.model.serialize_only, extend=self.model.serialize_rules)
+        mapper = sql_inspect(self.model)
+        keys = schema.keys
+        if schema.is_greedy:
+            # Built and merged as a set, like SerializerMixin.serializable_keys, so that the keys
+            # are iterated, and serialized, in the same order.
+            keys.update({attr.key for attr in mapper.attrs})
+        fields = []
+        for key in keys:
+            if schema.is_included(key):
+                fields.append((key, self._compile_accessor(schema, mapper, key)))
+        return tuple(fields)
+
+    def _compile_accessor(self, schema, mapper, key):
+        """Creates the accessor function for a single attribute.
+
+        Args:
+            schema (Schema): the schema of this model.
+            mapper (Mapper): the mapper of this model.
+            key (str): the attribute name.
+
+        Returns:
+            function: a function that returns the serialized attribute of a record.
+        """
+        prop = mapper.attrs.get(key)
+        if isinstance(prop, RelationshipProperty) and issubclass(
+            prop.mapper.class_, SerializerMixin
+        ):
+            nested = CompiledSerializer(prop.mapper.class_, schema, self.options, key)
+            if prop.uselist:
+                return lambda record: [nested(value) for value in getattr(record, key)]
+
+            def scalar_accessor(record):
+                value = getattr(record, key)
+                return None if value is None else nested(value)
+
+            return scalar_accessor
+        if prop is not None and not isinstance(prop, RelationshipProperty):
+            return lambda record: self.format_value(getattr(record, key))
+        # Anything else (properties, association proxies, etc.) goes through sqlalchemy_serializer.
+        options = self.options
+
+        def fallback_accessor(record):
+            serializer = Serializer(**options)
+            serializer.schema = schema
+            return serializer.fork(value=getattr(record, key), key=key)
+
+        return fallback_accessor
+
+    def format_value(self, value):
+        """Converts a column value into a JSON compatible value, the same way that
+        sqlalchemy_serializer does.
+
+        Args:
+            value (any): the column value.
+
+        Raises:
+            TypeError: if the value cannot be serialized.
+
+        Returns:
+            any: the JSON compatible value.
+        """
+        if isinstance(value, SIMPLE_TYPES):
+            return value
+        if isinstance(value, time):
+            return value.strftime(self.options["time_format"])
+        if isinstance(value, datetime):
+            if tzinfo := self.options["tzinfo"]:
+                value = value.astimezone(tzinfo).replace(tzinfo=None)
+            return value.strftime(self.options["datetime_format"])
+        if isinstance(value, date):
+            return value.strftime(self.options["date_format"])
+        if isinstance(value, Decimal):
+            return self.options["decimal_format"].format(value)
+        if isinstance(value, (bytes, uuid.UUID)):
+            return value.decode() if isinstance(value, bytes) else str(value)
+        if isinstance(value, dict):
+            return {k: self.format_value(v) for k, v in value.items()}
+        if isinstance(value, Iterable):
+            return [self.format_value(v) for v in value]
+        if isinstance(value, Enum):
+            return value.value
+        raise TypeError(f"Unserializable type: {type(value)} value: {value}")
+
+
+_serializers = {}
+"""
+Mapping of (model, only, rules) to the compiled serializer for that combination.
+"""
+
+
+def get_serializer(model, only=(), rules=()):
+    """Returns the compiled serializer of a model for a given set of only/rules,
+    compiling it if it does not exist yet.
+
+    Args:
+        model (db.Model): the model.
+        only (tuple, optional): exclusive schema to replace the default one. Defaults to ().
+        rules (tuple, optional): schema to extend the default one. Defaults to ().
+
+    Returns:
+        CompiledSerializer: the serializer.
+    """
+    key = (model, tuple(only), tuple(rules))
+    if (serializer := _serializers.get(key)) is None:
+        with _compile_lock:
+            if (serializer := _serializers.get(key)) is None:
+                schema = Schema()
+                schema.update(only=key[1], extend=key[2])
+                options = {
+                    "date_format": model.date_format,
+                    "datetime_format": model.datetime_format,
+                    "time_format": model.time_format,
+                    "decimal_format": model.decimal_format,
+                    "tzinfo": model.get_tzinfo(model),
+                    "serialize_types": model.serialize_types,
+                }
+                serializer = _serializers[key] = CompiledSerializer(
+                    model, schema, options
+                )
+    return serializer
+
+
+def compile_serializers(*models):
+    """Compiles the default serializers of the given models. Meant to be called
+    once at startup, after all models have been declared.
+
+    Args:
+        models (db.Model): the models.
+    """
+    for model in models:
+        get_serializer(model).fields
+
+
+class CompiledSerializerMixin(SerializerMixin):
+    """
+    Drop-in replacement for SerializerMixin, whose to_dict uses precompiled serializers.
+    Calls that customize formatting (date formats, time zones, etc.) are delegated to SerializerMixin.
+    """
+
+    def to_dict(self, only=(), rules=(), **formatting):
+        """Returns the model's data in a JSON compatible format.
+
+        Args:
+            only (tuple, optional): exclusive schema to replace the default one. Defaults to ().
+            rules (tuple, optional): schema to extend the default one. Defaults to ().
+
+        Returns:
+            dict: the serialized record.
+        """
+        if any(value is not None for value in formatting.values()) or self.serialize_types:
+            return super().to_dict(only=only, rules=rules, **formatting)
+        return get_serializer(type(self), only, rules)(self)
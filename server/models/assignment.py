@@ -1,10 +1,9 @@
-from sqlalchemy_serializer import SerializerMixin
+from model_serializer import CompiledSerializerMixin
 from config import db
 from sqlalchemy.orm import validates
-from helpers import get_model_invoker
 
 
-class Assignment(db.Model, SerializerMixin):
+class Assignment(db.Model, CompiledSerializerMixin):
     """
     Connects an organization and item together.
     An organization can have many items.
@@ -24,22 +23,25 @@ class Assignment(db.Model, SerializerMixin):
     )
 
     __tablename__ = "assignments"
+    __table_args__ = (db.UniqueConstraint("item_id", "organization_id"),)
     id = db.Column(db.Integer, primary_key=True)
     current_quantity = db.Column(
         db.Integer,
-        db.CheckConstraint("count >= 0", name="check_count_constraint"),
+        db.CheckConstraint("current_quantity >= 0", name="current_quantity"),
         nullable=False,
     )
     enough_threshold = db.Column(
         db.Integer,
-        db.CheckConstraint("count >= 1", name="check_threshold_constraint"),
+        db.CheckConstraint("enough_threshold >= 1", name="enough_threshold"),
         nullable=False,
     )
     added_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
     last_updated = db.Column(db.DateTime, onupdate=db.func.now())
     # Foreign Keys
-    item_id = db.Column(db.Integer, db.ForeignKey("items.id"))
-    organization_id = db.Column(db.Integer, db.ForeignKey("organizations.id"))
+    item_id = db.Column(db.Integer, db.ForeignKey("items.id"), index=True)
+    organization_id = db.Column(
+        db.Integer, db.ForeignKey("organizations.id"), index=True
+    )
     # Relationships Established
     item = db.relationship("Item", back_populates="assignments")
     organization = db.relationship("Organization", back_populates="assignments")
@@ -84,28 +86,3 @@ class Assignment(db.Model, SerializerMixin):
                 f"{key} - Minimum threshold for inventory to be considered enough must be a positive integer."
             )
         return enough_threshold
-
-    @validates("organization_id")
-    def validate_organization_id(self, key, organization_id):
-        """Validates that the organization_id attribute is not already associated with the entered item_id.
-
-        Args:
-            key (str): the attribute name.
-            organization_id (int): the organization_id attribute value.
-
-        Raises:
-            ValueError: if there is already an assignment with the item_id and organization_id pair.
-
-        Returns:
-            int: the organization_id
-        """
-        if assignment := Assignment.query.filter(
-            Assignment.item_id == self.item_id,
-            Assignment.organization_id == organization_id,
-        ).first():
-            print(assignment, flush=True)
-            if get_model_invoker() != "patch":
-                raise ValueError(
-                    f"Item with id {self.item_id} already exists for {key} {organization_id}"
-                )
-        return organization_id
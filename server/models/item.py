@@ -1,12 +1,12 @@
-from sqlalchemy_serializer import SerializerMixin
+from model_serializer import CompiledSerializerMixin
 from sqlalchemy.orm import validates
 from sqlalchemy.ext.associationproxy import association_proxy
 from config import db
 from models.assignment import Assignment
-from helpers import is_non_empty_string, get_model_invoker
+from helpers import is_non_empty_string
 
 
-class Item(db.Model, SerializerMixin):
+class Item(db.Model, CompiledSerializerMixin):
     """
     Item used by people and organizations.
     An item has many assignments.
@@ -36,9 +36,16 @@ class Item(db.Model, SerializerMixin):
     )
 
     __tablename__ = "items"
+    __table_args__ = (
+        # Catalog pages: public items in name order, and each user's own items in name order.
+        db.Index(
+            "ix_items_public_name", "name", "id", postgresql_where=db.text("is_public")
+        ),
+        db.Index("ix_items_user_id_name", "user_id", "name", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String, nullable=False)
+    name = db.Column(db.String, unique=True, nullable=False)
     description = db.Column(db.String)
     image_url = db.Column(db.String)
     part_number = db.Column(db.String)
@@ -75,14 +82,11 @@ class Item(db.Model, SerializerMixin):
 
         Raises:
             ValueError: if name is NOT a non-empty string.
-            ValueError: if name is not unique.
 
         Returns:
             str: the value of name.
         """
+        # Uniqueness is enforced by the uq_items_name constraint.
         if not is_non_empty_string(name):
             raise ValueError(f"{key.title()} must be a non-empty string.")
-        if Item.query.filter_by(name=name).first():
-            if get_model_invoker() != "patch":
-                raise ValueError(f"An item with name, {name}, already exists.")
         return name
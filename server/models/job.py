@@ -0,0 +1,53 @@
+from sqlalchemy.dialects.postgresql import JSONB
+from model_serializer import CompiledSerializerMixin
+from config import db
+from helpers import JobStatus
+
+
+class Job(db.Model, CompiledSerializerMixin):
+    """
+    Background job, run by the worker process (worker.py).
+    Web workers never run jobs; the worker claims due jobs one at a time,
+    runs them, and retries failed ones with backoff.
+    A recurring job has an interval (interval_seconds), and is rescheduled every time that it finishes.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # The worker only ever looks for pending jobs that are due.
+        db.Index(
+            "ix_jobs_pending",
+            "run_at",
+            postgresql_where=db.text("status = 'PENDING'"),
+        ),
+        # There is exactly one row per recurring job.
+        db.Index(
+            "uq_jobs_recurring_name",
+            "name",
+            unique=True,
+            postgresql_where=db.text("interval_seconds IS NOT NULL"),
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String, nullable=False)
+    args = db.Column(
+        JSONB, default=dict, server_default=db.text("'{}'::jsonb"), nullable=False
+    )
+    status = db.Column(
+        db.Enum(*JobStatus.get_all(), name="job_status_enum"),
+        default=JobStatus.PENDING,
+        nullable=False,
+    )
+    interval_seconds = db.Column(db.Integer)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=5, nullable=False)
+    last_error = db.Column(db.String)
+    run_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
+    locked_at = db.Column(db.DateTime)
+    locked_by = db.Column(db.String)
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"<Job {self.id}, {self.name}, {self.status}, {self.attempts}, {self.run_at}, {self.locked_by}>"
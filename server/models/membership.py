@@ -1,10 +1,10 @@
-from sqlalchemy_serializer import SerializerMixin
+from model_serializer import CompiledSerializerMixin
 from config import db
 from sqlalchemy.orm import validates
-from helpers import get_model_invoker, RoleType
+from helpers import get_operation_type, OperationType, RoleType
 
 
-class Membership(db.Model, SerializerMixin):
+class Membership(db.Model, CompiledSerializerMixin):
     """
     Binds users and organizations together.
     A user can belong to many organizations.
@@ -32,6 +32,15 @@ class Membership(db.Model, SerializerMixin):
     )
 
     __tablename__ = "memberships"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "organization_id"),
+        db.Index(
+            "uq_memberships_one_owner",
+            "organization_id",
+            unique=True,
+            postgresql_where=db.text("role = 'OWNER'"),
+        ),
+    )
     id = db.Column(db.Integer, primary_key=True)
     role = db.Column(
         db.Enum("REGULAR", "ADMIN", "OWNER", name="role_enum"), nullable=False
@@ -39,8 +48,10 @@ class Membership(db.Model, SerializerMixin):
     joined_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
     last_updated = db.Column(db.DateTime, onupdate=db.func.now())
     # Foreign Keys
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
-    organization_id = db.Column(db.Integer, db.ForeignKey("organizations.id"))
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), index=True)
+    organization_id = db.Column(
+        db.Integer, db.ForeignKey("organizations.id"), index=True
+    )
     # Relationships Established
     user = db.relationship("User", back_populates="memberships")
     organization = db.relationship("Organization", back_populates="memberships")
@@ -57,24 +68,14 @@ class Membership(db.Model, SerializerMixin):
             role (str): the role attribute value.
 
         Raises:
-            ValueError: if there is already a membership with the given user_id and orgnization_id under membership.
             ValueError: if an invalid role name from the list of roles was entered.
-            ValueError: if a user attempts to assign ownership to an organization when there already is one.
-            ValueError: if a user is already a member of an organization.
+            ValueError: if the first member of an organization is not the owner.
 
         Returns:
             str: the value of role.
         """
-        if Membership.query.filter(
-            Membership.user_id == self.user_id,
-            Membership.organization_id == self.organization_id,
-        ).first():
-            # print(stack_trace())
-            # print(get_model_invoker())
-            if get_model_invoker() != "patch":
-                raise ValueError(
-                    f"User {self.user_id} already belongs to organization {self.organization_id}."
-                )
+        # Duplicate memberships and multiple owners are rejected by the
+        # uq_memberships_user_id and uq_memberships_one_owner constraints.
         # if not is_non_empty_string(role):
         #      raise ValueError(f"{key.title()} must be a non-empty string.")
         role = role.upper()
@@ -84,17 +85,11 @@ class Membership(db.Model, SerializerMixin):
                 f"{key.title()} must be one of the following values: {RoleType.get_all()}"
             )
         if (
-            role == RoleType.OWNER
-            and Membership.query.filter(
-                Membership.organization_id == self.organization_id,
-                Membership.role == RoleType.OWNER,
-            ).first()
-        ):
-            raise ValueError(f"Only one member of an organization can be the owner.")
-        if (
-            not Membership.query.filter(
+            role != RoleType.OWNER
+            and get_operation_type() != OperationType.UPDATE
+            and not Membership.query.filter(
                 Membership.organization_id == self.organization_id
             ).first()
-        ) and (role != RoleType.OWNER):
+        ):
             raise ValueError(f"{key.title()} must be owner for the first member.")
         return role
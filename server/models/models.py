@@ -4,4 +4,11 @@ from models.item import Item
 from models.membership import Membership
 from models.assignment import Assignment
 from models.request import Request
-from models.organization_log import OrganizationLog
\ No newline at end of file
+from models.organization_log import OrganizationLog
+from models.outbox_email import OutboxEmail
+from models.job import Job
+from model_serializer import compile_serializers
+
+compile_serializers(
+    User, Organization, Item, Membership, Assignment, Request, OrganizationLog
+)
@@ -1,4 +1,4 @@
-from sqlalchemy_serializer import SerializerMixin
+from model_serializer import CompiledSerializerMixin
 from sqlalchemy.orm import validates
 from sqlalchemy.ext.associationproxy import association_proxy
 from config import db
@@ -7,7 +7,7 @@ from models.assignment import Assignment
 from helpers import is_non_empty_string
 
 
-class Organization(db.Model, SerializerMixin):
+class Organization(db.Model, CompiledSerializerMixin):
     """
     A group of related users managing a collection of items.
     An organization can have many requests to join.
@@ -27,7 +27,7 @@ class Organization(db.Model, SerializerMixin):
         "-assignments.organization_id" "-items",
         "-requests.user.items",
         "-requests.organization",
-        "-organization_logs.organization",
+        "-organization_logs",
     )
 
     __tablename__ = "organizations"
@@ -79,14 +79,11 @@ class Organization(db.Model, SerializerMixin):
 
         Raises:
             ValueError: if name is NOT a non-empty string.
-            ValueError: if name is not unique.
 
         Returns:
             str: the value of name..
         """
-        if not (
-            is_non_empty_string(name)
-            and Organization.query.filter_by(name=name).first() is None
-        ):
+        # Uniqueness is enforced by the uq_organizations_name constraint.
+        if not is_non_empty_string(name):
             raise ValueError(f"{key.title()} must be a unique, non-empty string.")
         return name
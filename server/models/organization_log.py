@@ -1,22 +1,71 @@
-from sqlalchemy_serializer import SerializerMixin
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from model_serializer import CompiledSerializerMixin
+from model_log_mapping import format_log
 from config import db
 
+LOG_SEARCH_CONFIG = "simple"
+"""
+The text search configuration of log searches. Logs are searched for names rather than
+natural language, so words are neither stemmed nor dropped as stop words.
+"""
 
-class OrganizationLog(db.Model, SerializerMixin):
+LOG_SEARCH_VECTOR_EXPRESSION = (
+    f"jsonb_to_tsvector('{LOG_SEARCH_CONFIG}', params, '[\"string\"]')"
+)
+""" The expression from which the database generates the search_vector of a log. """
+
+
+class OrganizationLog(db.Model, CompiledSerializerMixin):
     """
     Summarized event of everything that occurs within an organization.
     Useful for admins and owners to monitor all activity that occurs
     within the organization. This can help identify anybody who is
     violating rules.
 
+    A log is stored as the code of its event type and the parameters of the event,
+    and its contents are formatted when it is read. The string values of the parameters
+    (usernames, item names, etc.) are indexed for full-text search in search_vector.
+
+    The table is partitioned by day on occurrence (see log_partitions.py), which is why
+    occurrence is part of the primary key.
+
     An organization can have many logs.
     A log belongs to one organization.
     """
 
+    serialize_rules = ("contents", "-params", "-search_vector")
+
     __tablename__ = "organization_logs"
-    id = db.Column(db.Integer, primary_key=True)
-    contents = db.Column(db.ARRAY(db.String))
-    occurrence = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
+    __table_args__ = (
+        # An organization's log feed, newest first (see OrganizationLogs).
+        db.Index(
+            "ix_organization_logs_feed",
+            "organization_id",
+            db.text("occurrence DESC"),
+            "id",
+        ),
+        # Full-text search over the parameters of logs (see OrganizationLogSearch).
+        db.Index(
+            "ix_organization_logs_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        {"postgresql_partition_by": "RANGE (occurrence)"},
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    event_type = db.Column(db.SmallInteger, nullable=False)
+    params = db.Column(JSONB, server_default=db.text("'{}'::jsonb"), nullable=False)
+    search_vector = db.Column(
+        TSVECTOR, db.Computed(LOG_SEARCH_VECTOR_EXPRESSION, persisted=True)
+    )
+    occurrence = db.Column(
+        db.DateTime,
+        server_default=db.func.now(),
+        primary_key=True,
+        nullable=False,
+        index=True,
+    )
     # Foreign Key
     organization_id = db.Column(
         db.Integer, db.ForeignKey("organizations.id"), nullable=False
@@ -25,4 +74,27 @@ class OrganizationLog(db.Model, SerializerMixin):
     organization = db.relationship("Organization", back_populates="organization_logs")
 
     def __repr__(self):
-        return f"<OrganizationLog {self.id}, {self.contents}, {self.occurrence}>"
+        return f"<OrganizationLog {self.id}, {self.event_type}, {self.params}, {self.occurrence}>"
+
+    @property
+    def contents(self):
+        """
+        Returns:
+            list: the lines of the log, formatted from its event type and parameters.
+        """
+        params = dict(self.params or {})
+        actor = params.pop("actor", None)
+        return format_log(self.event_type, params, actor)
+
+    @staticmethod
+    def get_params(payload, actor=None):
+        """Builds the stored parameters of a log event.
+
+        Args:
+            payload (dict): the details of the event.
+            actor (str, optional): the username of the user who performed the event. Defaults to None.
+
+        Returns:
+            dict: the parameters, with the actor included only if there is one.
+        """
+        return {**payload, "actor": actor} if actor else dict(payload)
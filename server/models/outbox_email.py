@@ -0,0 +1,42 @@
+from model_serializer import CompiledSerializerMixin
+from config import db
+from helpers import EmailStatus
+
+
+class OutboxEmail(db.Model, CompiledSerializerMixin):
+    """
+    Email waiting to be sent (or already sent) by the email outbox.
+    Requests only add emails to the outbox; the outbox sender delivers
+    them in the background, retrying failed deliveries with backoff.
+    """
+
+    __tablename__ = "outbox_emails"
+    __table_args__ = (
+        # The outbox sender only ever looks for pending emails that are due.
+        db.Index(
+            "ix_outbox_emails_pending",
+            "next_attempt_at",
+            postgresql_where=db.text("status = 'PENDING'"),
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String, nullable=False)
+    recipients = db.Column(db.ARRAY(db.String), nullable=False)
+    html = db.Column(db.String, nullable=False)
+    sender = db.Column(db.String)
+    status = db.Column(
+        db.Enum(*EmailStatus.get_all(), name="email_status_enum"),
+        default=EmailStatus.PENDING,
+        nullable=False,
+    )
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.String)
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
+    next_attempt_at = db.Column(
+        db.DateTime, server_default=db.func.now(), nullable=False
+    )
+    sent_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"<OutboxEmail {self.id}, {self.subject}, {self.recipients}, {self.status}, {self.attempts}, {self.next_attempt_at}>"
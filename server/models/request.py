@@ -1,10 +1,10 @@
-from sqlalchemy_serializer import SerializerMixin
+from model_serializer import CompiledSerializerMixin
 from config import db
 from sqlalchemy.orm import validates
 
 
 # Requests to join an organization.
-class Request(db.Model, SerializerMixin):
+class Request(db.Model, CompiledSerializerMixin):
     """
     Connects an organization and user together.
     An organization can have many users (requesting to join).
@@ -25,13 +25,16 @@ class Request(db.Model, SerializerMixin):
     )
 
     __tablename__ = "requests"
+    __table_args__ = (db.UniqueConstraint("user_id", "organization_id"),)
     id = db.Column(db.Integer, primary_key=True)
     reason_to_join = db.Column(db.String, default="Reason", nullable=False)
     submitted_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
     # Foreign Keys
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.id"), nullable=False, index=True
+    )
     organization_id = db.Column(
-        db.Integer, db.ForeignKey("organizations.id"), nullable=False
+        db.Integer, db.ForeignKey("organizations.id"), nullable=False, index=True
     )
     # Relationships Established
     user = db.relationship("User", back_populates="requests")
@@ -42,27 +45,19 @@ class Request(db.Model, SerializerMixin):
 
     @validates("organization_id")
     def validate_request(self, key, organization_id):
-        """Validates that there is not an existing request with the declared user_id
-        and organization_id, or that the user is not already part of that organization.
+        """Validates that the user is not already part of that organization.
+        Duplicate requests are rejected by the uq_requests_user_id constraint.
 
         Args:
             key (str): the attribute name
             organization_id (str): the attribute value.
 
         Raises:
-            ValueError: if a request for user_id and organization_id is not already active.
             ValueError: if a user is alreaddy part of that organization.
 
         Returns:
             _type_: _description_
         """
-        if Request.query.filter(
-            Request.user_id == self.user_id, Request.organization_id == organization_id
-        ).first():
-            raise ValueError(
-                f"User of ID {self.user_id} is already in the request queue for organization ID {organization_id}"
-            )
-
         from models.membership import Membership
 
         if Membership.query.filter(
@@ -1,5 +1,5 @@
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy_serializer import SerializerMixin
+from model_serializer import CompiledSerializerMixin
 from sqlalchemy.orm import validates
 from config import db, bcrypt
 from sqlalchemy.ext.associationproxy import association_proxy
@@ -7,7 +7,7 @@ from models.membership import Membership
 from helpers import is_non_empty_string
 
 
-class User(db.Model, SerializerMixin):
+class User(db.Model, CompiledSerializerMixin):
     """
     Person that is physically using Easy Itemizer.
     A user can join organizations, make requests,
@@ -99,15 +99,12 @@ class User(db.Model, SerializerMixin):
 
         Raises:
             ValueError: if username is NOT a non-empty string.
-            ValueError: if username is not unique.
 
         Returns:
             str: the value of name..
         """
-        if not (
-            is_non_empty_string(username)
-            and User.query.filter_by(username=username).first() is None
-        ):
+        # Uniqueness is enforced by the uq_users_username constraint.
+        if not is_non_empty_string(username):
             raise ValueError(f"{key.title()} must be a unique, non-empty string.")
         return username
 
@@ -121,15 +118,13 @@ class User(db.Model, SerializerMixin):
 
         Raises:
             ValueError: if entered input is NOT already a validemail.
-            ValueError: if entered email is already tied to another user.
 
         Returns:
             str: the value of email.
         """
+        # Uniqueness is enforced by the uq_users_email constraint.
         if "@" not in email:
             raise ValueError(f"{key.title()} must be a valid email address.")
-        elif User.query.filter_by(email=email).first():
-            raise ValueError(f"An account with the {key}, {email}, already exists.")
         return email
 
     @hybrid_property
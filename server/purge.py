@@ -0,0 +1,87 @@
+import time
+from config import db
+
+PURGE_BATCH_SIZE = 5000
+""" The maximum number of rows deleted per transaction. """
+
+PURGE_TIME_BUDGET = 60
+""" The maximum time, in seconds, that a single purge keeps deleting batches. """
+
+
+class PurgeProgress:
+    """
+    The progress of a purge. A purge that ran out of time is not complete; since rows are
+    deleted in id order, the next purge with the same criteria resumes where it stopped.
+    """
+
+    def __init__(self, description):
+        """Creates a new instance of PurgeProgress.
+
+        Args:
+            description (str): what is being purged, used for progress reports.
+        """
+        self.description = description
+        self.deleted = 0
+        self.batches = 0
+        self.last_id = None
+        self.is_complete = False
+
+    def __repr__(self):
+        return f"<PurgeProgress {self.description}, {self.deleted}, {self.batches}, {self.last_id}, {self.is_complete}>"
+
+    def report(self):
+        """Prints the progress of the purge."""
+        status = "done" if self.is_complete else "in progress"
+        print(
+            f"Purge of {self.description}: {self.deleted} rows deleted in {self.batches} batches "
+            f"(last id: {self.last_id}, {status}).",
+            flush=True,
+        )
+
+
+def purge_in_batches(
+    model,
+    *criteria,
+    description=None,
+    batch_size=PURGE_BATCH_SIZE,
+    time_budget=PURGE_TIME_BUDGET,
+):
+    """Deletes the rows of a model that match the criteria, in batches of batch_size rows ordered by id.
+    Each batch is deleted and committed in its own transaction, so locks are only held briefly.
+    The purge stops once no rows are left, or once time_budget seconds have passed.
+
+    Args:
+        model (db.Model): the model whose rows are deleted. Must have an id column.
+        criteria (ColumnElement): the filter conditions of the rows to delete.
+        description (str, optional): what is being purged. Defaults to the table name.
+        batch_size (int, optional): the maximum number of rows per batch. Defaults to PURGE_BATCH_SIZE.
+        time_budget (int, optional): the maximum number of seconds to spend. Defaults to PURGE_TIME_BUDGET.
+
+    Returns:
+        PurgeProgress: the progress of the purge.
+    """
+    progress = PurgeProgress(description or model.__tablename__)
+    deadline = time.monotonic() + time_budget
+    while True:
+        ids = db.session.scalars(
+            db.select(model.id).filter(*criteria).order_by(model.id).limit(batch_size)
+        ).all()
+        if not ids:
+            progress.is_complete = True
+            break
+        db.session.execute(
+            db.delete(model)
+            .filter(model.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        progress.deleted += len(ids)
+        progress.batches += 1
+        progress.last_id = ids[-1]
+        progress.is_complete = len(ids) < batch_size
+        progress.report()
+        if progress.is_complete or time.monotonic() >= deadline:
+            break
+    if not progress.batches:
+        progress.report()
+    return progress
@@ -1,11 +1,20 @@
 from flask import request, g
 from flask_restful import Resource
+from sqlalchemy.exc import IntegrityError
 from config import db, api
 from resources.dry_resource import DRYResource
-from models.assignment import Assignment
+from models.models import Assignment, Item, Organization
+from log_writer import log_event
+from helpers import (
+    operation_context,
+    OperationType,
+    LogEventType,
+    get_integrity_error_message,
+)
 
 
 class AssignmentResource(Resource):
+    @operation_context(OperationType.CREATE)
     def post(self):
         """Creates a new instance of Assignment.
         When a new assignment is created, a log will be entered for the organization
@@ -22,8 +31,17 @@ class AssignmentResource(Resource):
                 enough_threshold=request.get_json().get("enough_threshold"),
             )
             db.session.add(new_assignment)
-            db.session.commit()
-            return {"assignment_l": {"assignment": new_assignment.to_dict()}}, 201
+            db.session.flush()
+            log_event(
+                LogEventType.ITEM_ASSIGNED,
+                new_assignment.organization_id,
+                item_name=new_assignment.item.name,
+                part_number=new_assignment.item.part_number,
+            )
+            return {"assignment": new_assignment.to_dict()}, 201
+        except IntegrityError as e:
+            db.session.rollback()
+            return {"message": get_integrity_error_message(e)}, 422
         except ValueError as e:
             print(e)
             return {"message": "422 Unprocessable Entity"}, 422
@@ -39,8 +57,176 @@ class AssignmentById(DRYResource):
     """
 
     def __init__(self):
-        super().__init__(Assignment, "assignment_l")
+        super().__init__(Assignment)
+
+    def log_update(self, record):
+        log_event(LogEventType.ASSIGNMENT_UPDATED, record.organization_id)
+
+    def log_delete(self, record):
+        log_event(
+            LogEventType.ITEM_UNASSIGNED,
+            record.organization_id,
+            item_name=record.item.name,
+            part_number=record.item.part_number,
+        )
+
+
+class AssignmentAdjustment(Resource):
+    """Resource tied to the Assignment model. Used for adding to or subtracting from the quantity of an assigned item.
+
+    Args:
+        Resource (Resource): the RESTful Resource container.
+    """
+
+    def post(self, id):
+        """Adds a delta to the current quantity of an assignment, in a single UPDATE statement.
+        The quantity is read and written by the database, so concurrent adjustments are applied
+        one after the other instead of overwriting each other. The adjustment is refused if it
+        would make the quantity negative.
+
+        Args:
+            id (int): the assignment id.
+
+        Returns:
+            dict: the id, current quantity and last update of the assignment if successfully adjusted,
+            otherwise an error message.
+        """
+        delta = request.get_json().get("delta")
+        if type(delta) is not int:
+            return {"message": "delta - The adjustment must be an integer."}, 422
+        assignment = db.session.scalar(
+            db.update(Assignment)
+            .where(
+                Assignment.id == id,
+                Assignment.current_quantity + delta >= 0,
+            )
+            .values(
+                current_quantity=Assignment.current_quantity + delta,
+                last_updated=db.func.now(),
+            )
+            .returning(Assignment)
+        )
+        if not assignment:
+            if not db.session.get(Assignment, id):
+                return {
+                    "error": f"Assignment record of id, {id}, does not exist. Please try again later."
+                }, 404
+            return {"message": "There are not enough items left to subtract."}, 422
+        log_event(LogEventType.ASSIGNMENT_UPDATED, assignment.organization_id)
+        return (
+            assignment.to_dict(only=("id", "current_quantity", "last_updated")),
+            200,
+        )
+
+
+class StockTake(Resource):
+    """Resource tied to the Assignment model. Used for recording a physical count of an organization's inventory.
+
+    Args:
+        Resource (Resource): the RESTful Resource container.
+    """
+
+    def post(self, id):
+        """Sets the current quantities of an organization's assigned items to the quantities counted during a stock-take.
+        The counted assignments are locked while the differences are computed, and every change is applied by
+        a single UPDATE statement. One log summarizing the changes is entered for the organization.
+
+        Args:
+            id (int): the organization id.
+
+        Request Body:
+            counts (dict): mapping of assignment ids to the counted quantities of their items.
+
+        Returns:
+            dict: the id, current quantity and last update of every changed assignment, if successful,
+            otherwise an error message.
+        """
+        if not db.session.get(Organization, id):
+            return {
+                "error": f"Organization record of id, {id}, does not exist. Please try again later."
+            }, 404
+        try:
+            counts = {
+                int(assignment_id): quantity
+                for assignment_id, quantity in request.get_json().get("counts").items()
+            }
+        except (AttributeError, TypeError, ValueError):
+            return {"message": "counts - Must map assignment ids to quantities."}, 422
+        if not counts:
+            return {"message": "counts - At least one item must be counted."}, 422
+        if any(
+            type(quantity) is not int or quantity < 0 for quantity in counts.values()
+        ):
+            return {
+                "message": "counts - Item counts must be non-negative integers."
+            }, 422
+        rows = db.session.execute(
+            db.select(
+                Assignment.id,
+                Assignment.current_quantity,
+                Item.name,
+                Item.part_number,
+            )
+            .join(Item, Assignment.item_id == Item.id)
+            .filter(Assignment.organization_id == id, Assignment.id.in_(counts))
+            .order_by(Item.name)
+            .with_for_update(of=Assignment)
+        ).all()
+        if missing := counts.keys() - {row.id for row in rows}:
+            return {
+                "message": f"Assignments {sorted(missing)} do not belong to this organization."
+            }, 422
+        changes = [row for row in rows if counts[row.id] != row.current_quantity]
+        assignments = []
+        if changes:
+            counted = db.values(
+                db.column("id", db.Integer),
+                db.column("quantity", db.Integer),
+                name="counted",
+            ).data([(row.id, counts[row.id]) for row in changes])
+            assignments = db.session.execute(
+                db.update(Assignment)
+                .where(Assignment.id == counted.c.id)
+                .values(current_quantity=counted.c.quantity, last_updated=db.func.now())
+                .returning(
+                    Assignment.id, Assignment.current_quantity, Assignment.last_updated
+                )
+            ).all()
+        log_event(
+            LogEventType.STOCK_TAKEN,
+            id,
+            items_counted=len(rows),
+            changes=[
+                {
+                    "item_name": row.name,
+                    "part_number": row.part_number,
+                    "previous": row.current_quantity,
+                    "counted": counts[row.id],
+                }
+                for row in changes
+            ],
+        )
+        return {
+            "assignments": [
+                {
+                    "id": assignment.id,
+                    "current_quantity": assignment.current_quantity,
+                    "last_updated": assignment.last_updated.strftime(
+                        Assignment.datetime_format
+                    ),
+                }
+                for assignment in assignments
+            ]
+        }, 200
 
 
 api.add_resource(AssignmentResource, "/assignments")
 api.add_resource(AssignmentById, "/assignments/<int:id>", endpoint="assignment_by_id")
+api.add_resource(
+    AssignmentAdjustment,
+    "/assignments/<int:id>/adjust",
+    endpoint="assignment_adjustment",
+)
+api.add_resource(
+    StockTake, "/organizations/<int:id>/stock_take", endpoint="stock_take"
+)
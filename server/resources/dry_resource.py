@@ -1,6 +1,8 @@
 from flask import request, g
 from flask_restful import Resource
+from sqlalchemy.exc import IntegrityError
 from config import db
+from helpers import operation_context, OperationType
 
 
 class DRYResource(Resource):
@@ -8,15 +10,31 @@ class DRYResource(Resource):
     Template for RESTful CRUD methods.
     """
 
-    def __init__(self, model, key_name=None):
+    def __init__(self, model):
         """Creates a new instance of RestResourceTemplate.
 
         Args:
             model (db.Model): the model to tie the resource to.
-            key_name (str): the key name to use to create a dict inside a dict. (For logging POST, PATCH, and DELETE requests).
         """
         self.model = model
-        self.key_name = key_name
+
+    def log_update(self, record):
+        """Records the log event of an updated record. Does nothing by default;
+        resources whose updates are logged override this.
+
+        Args:
+            record (db.Model): the updated record.
+        """
+        pass
+
+    def log_delete(self, record):
+        """Records the log event of a deleted record. Does nothing by default;
+        resources whose deletions are logged override this. Called before the record is deleted.
+
+        Args:
+            record (db.Model): the record to be deleted.
+        """
+        pass
 
     def get(self, id=None):
         """
@@ -31,6 +49,7 @@ class DRYResource(Resource):
             records = [record.to_dict() for record in self.model.query.all()]
             return records, 200
 
+    @operation_context(OperationType.UPDATE)
     def patch(self, id):
         """Updates a db.Model record with a given id.
 
@@ -51,14 +70,12 @@ class DRYResource(Resource):
                 # print(f"Attrname: {attr}, Type: {type(json.get(attr))}")
                 # setattr(record, attr, json.get(attr))
             db.session.add(record)
-            db.session.commit()
-            if self.key_name:
-                return_dict = {}
-                return_dict[self.key_name] = record.to_dict()
-                return return_dict, 200
+            db.session.flush()
+            self.log_update(record)
             return record.to_dict(), 200
-        except ValueError as e:
+        except (ValueError, IntegrityError) as e:
             print(e)
+            db.session.rollback()
             return {"error": "Not Modified"}, 304
 
     def delete(self, id):
@@ -71,13 +88,7 @@ class DRYResource(Resource):
             dict: no content or a message saying that the record was deleted.
         """
         record = g.record
-        if self.key_name:
-            serialized_record = record.to_dict()
+        self.log_delete(record)
         db.session.delete(record)
-        db.session.commit()
-        if self.key_name:
-            return_dict = {}
-            # print(record, flush=True)
-            return_dict[self.key_name] = serialized_record
-            return return_dict, 204
+        db.session.flush()
         return {"message": f"{self.model.__name__} successfully deleted."}, 204
@@ -1,9 +1,30 @@
-from flask import request, session, render_template_string, g
+from flask import request, session, g
 from flask_restful import Resource
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from resources.dry_resource import DRYResource
-from config import db, api, send_email
-from models.models import Item, Assignment, User, OrganizationLog
+from config import db, api
+from email_outbox import send_email
+from template_registry import render_html_template
+from models.models import Item, Assignment
+from log_writer import log_event
+from identity import get_current_user
+from etags import check_records_etag, not_modified
+from helpers import (
+    operation_context,
+    OperationType,
+    LogEventType,
+    encode_cursor,
+    decode_cursor,
+    escape_like,
+    get_integrity_error_message,
+)
+
+ITEM_PAGE_SIZE = 60
+""" The default number of items returned per page of the item catalog. """
+
+MAX_ITEM_PAGE_SIZE = 200
+""" The maximum number of items that can be requested per page of the item catalog. """
 
 
 class ItemResource(Resource):
@@ -14,18 +35,78 @@ class ItemResource(Resource):
     """
 
     def get(self):
-        """Returns a list of items, with only certain attributes being serialized.
+        """Returns a page of the items that the current user can see (public items and the user's own items),
+        sorted by name, with only certain attributes being serialized.
+
+        Query Parameters:
+            limit (int, optional): the maximum number of items to return. Defaults to ITEM_PAGE_SIZE.
+            cursor (str, optional): the next_cursor of the previous page. If absent, the first page is returned.
+            mine_only (str, optional): if "true", only the items that the current user added are returned.
+            name (str, optional): if present, only items whose name contains this text (case-insensitive) are returned.
 
         Returns:
-            Response: list of items and their basic information.
+            Response: the page of items and their basic information, along with the cursor of the next page
+            (None if this is the last page). If the client's copy of the page is current, a "not modified" response.
         """
+        user_id = session.get("user_id")
+        limit = max(
+            1,
+            min(request.args.get("limit", ITEM_PAGE_SIZE, type=int), MAX_ITEM_PAGE_SIZE),
+        )
+        filters = []
+        if name := request.args.get("name"):
+            filters.append(Item.name.ilike(f"%{escape_like(name)}%", escape="\\"))
+        if cursor := request.args.get("cursor"):
+            try:
+                item_name, item_id = decode_cursor(cursor, 2)
+                if not (
+                    isinstance(item_name, str)
+                    and isinstance(item_id, int)
+                    and not isinstance(item_id, bool)
+                ):
+                    raise ValueError("Invalid pagination cursor.")
+            except ValueError as e:
+                return {"message": str(e)}, 400
+            filters.append(db.tuple_(Item.name, Item.id) > (item_name, item_id))
+        if request.args.get("mine_only", "").lower() == "true":
+            query = Item.query.filter(Item.user_id == user_id, *filters)
+        else:
+            # Public and private items are queried separately, so that each branch
+            # can be read in name order from its own index.
+            query = Item.query.filter(Item.is_public == True, *filters).union_all(
+                Item.query.filter(
+                    Item.is_public == False, Item.user_id == user_id, *filters
+                )
+            )
+        page = (
+            query.options(joinedload(Item.user))
+            .order_by(Item.name, Item.id)
+            .limit(limit + 1)
+            .all()
+        )
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(page[-1].name, page[-1].id)
+        # The page is versioned by the items on it and their users, which are already loaded,
+        # instead of by every item that the user can see.
+        if check_records_etag(
+            [
+                (
+                    item.id,
+                    item.last_updated or item.created_at,
+                    item.user and (item.user.last_updated or item.user.created_at),
+                )
+                for item in page
+            ],
+            key=(user_id, next_cursor),
+        ):
+            return not_modified()
         items = [
             item.to_dict(only=("id", "name", "part_number", "image_url", "user_id"))
-            for item in Item.query.filter(
-                db.or_(Item.is_public == True, Item.user_id == session.get("user_id"))
-            )
+            for item in page
         ]
-        return items, 200
+        return {"items": items, "next_cursor": next_cursor}, 200
 
 
 class AddItemAndAssignment(Resource):
@@ -36,6 +117,7 @@ class AddItemAndAssignment(Resource):
         Resource (Resource): the Restful Resource container.
     """
 
+    @operation_context(OperationType.CREATE)
     def post(self):
         """Creates a new instance of Item and an Assignment with that Item.
         When an item is created, a log will be entered for the organization tied to the newly created assignment.
@@ -54,7 +136,8 @@ class AddItemAndAssignment(Resource):
                 user_id=session["user_id"],
             )
             db.session.add(new_item)
-            db.session.commit()
+            # Flush to get the new item's id; the item, assignment and log are committed together.
+            db.session.flush()
             # Create assignment to item.
             new_assignment = Assignment(
                 item_id=new_item.id,
@@ -63,13 +146,20 @@ class AddItemAndAssignment(Resource):
                 enough_threshold=request.get_json().get("enough_threshold"),
             )
             db.session.add(new_assignment)
-            db.session.commit()
+            db.session.flush()
+            log_event(
+                LogEventType.ITEM_CREATED,
+                new_assignment.organization_id,
+                item_name=new_item.name,
+                part_number=new_item.part_number,
+            )
             return {
-                "item_l": {
-                    "item": new_item.to_dict(),
-                    "assignment": new_assignment.to_dict(),
-                }
+                "item": new_item.to_dict(),
+                "assignment": new_assignment.to_dict(),
             }, 201
+        except IntegrityError as e:
+            db.session.rollback()
+            return {"message": get_integrity_error_message(e)}, 422
         except Exception as e:
             print(e, flush=True)
             return {"message": str(e)}, 422
@@ -87,46 +177,16 @@ class ItemById(DRYResource):
     def __init__(self):
         super().__init__(Item)
 
-    def delete(self, id):
-        """_summary_
-
-        Args:
-            id (_type_): _description_
-
-        Returns:
-            _type_: _description_
-        """
-        record = g.record
-        assignments = [
-            {
-                "item_name": assignment.item.name,
-                "item_part_number": assignment.item.part_number,
-                "current_quantity": assignment.current_quantity,
-                "enough_threshold": assignment.enough_threshold,
-                "organization_id": assignment.organization_id,
-            }
-            for assignment in Assignment.query.filter_by(item_id=record.id).all()
-        ]
-        db.session.delete(record)
-        db.session.commit()
-        logs = []
-        for assignment in assignments:
-            # print(assignment.id, flush=True)
-            log = OrganizationLog(
-                contents=[
-                    f"The owner of an item this organization uses has removed it from the system",
-                    f"Name: {assignment['item_name']}",
-                    f"Part Number: {assignment['item_part_number']}",
-                    f"Current Quantity: {assignment['current_quantity']}",
-                    f"Enough Threshold: {assignment['enough_threshold']}",
-                ],
-                organization_id=assignment["organization_id"],
+    def log_delete(self, record):
+        for assignment in Assignment.query.filter_by(item_id=record.id).all():
+            log_event(
+                LogEventType.ITEM_REMOVED,
+                assignment.organization_id,
+                item_name=record.name,
+                part_number=record.part_number,
+                current_quantity=assignment.current_quantity,
+                enough_threshold=assignment.enough_threshold,
             )
-            logs.append(log)
-        if len(logs):
-            db.session.add_all(logs)
-            db.session.commit()
-        return {"message": f"{self.model.__name__} successfully deleted."}, 204
 
 
 class ReportItem(Resource):
@@ -148,11 +208,9 @@ class ReportItem(Resource):
             id=request.get_json().get("item_id")
         ).first()
         if item_in_question:
-            user = User.query.filter_by(id=session["user_id"]).first()
-            with open("./html-templates/emails/report_item.html", "r") as file:
-                template_content = file.read()
-            html = render_template_string(
-                template_content,
+            user = get_current_user()
+            html = render_html_template(
+                "emails/report_item.html",
                 first_name=user.first_name,
                 last_name=user.last_name,
                 username=user.username,
@@ -2,8 +2,22 @@ from flask import request, session, g, make_response, send_from_directory
 from flask_restful import Resource
 from config import db, api
 from resources.dry_resource import DRYResource
-from models.models import Membership, OrganizationLog
-from helpers import RoleType
+from models.models import Membership, Organization
+from log_writer import log_event
+from helpers import (
+    RoleType,
+    operation_context,
+    OperationType,
+    LogEventType,
+    encode_cursor,
+    decode_cursor,
+)
+
+MEMBERSHIP_PAGE_SIZE = 30
+""" The default number of memberships returned per page of the current user's memberships. """
+
+MAX_MEMBERSHIP_PAGE_SIZE = 100
+""" The maximum number of memberships that can be requested per page of the current user's memberships. """
 
 
 class MembershipById(DRYResource):
@@ -15,7 +29,25 @@ class MembershipById(DRYResource):
     """
 
     def __init__(self):
-        super().__init__(Membership, "membership_l")
+        super().__init__(Membership)
+
+    def log_update(self, record):
+        log_event(
+            LogEventType.MEMBER_ROLE_CHANGED,
+            record.organization_id,
+            username=record.user.username,
+            role=record.role,
+        )
+
+    def log_delete(self, record):
+        if record.user_id == session.get("user_id"):
+            log_event(LogEventType.MEMBER_LEFT, record.organization_id)
+        else:
+            log_event(
+                LogEventType.MEMBER_REMOVED,
+                record.organization_id,
+                username=record.user.username,
+            )
 
 
 class TransferOwnership(Resource):
@@ -28,6 +60,7 @@ class TransferOwnership(Resource):
         Resource (Resource): the RESTful Resource container.
     """
 
+    @operation_context(OperationType.UPDATE)
     def patch(self, org_id):
         """
         Removes the current member from the organization and assigns
@@ -45,30 +78,98 @@ class TransferOwnership(Resource):
                 Membership.organization_id == org_id,
                 Membership.user_id == session["user_id"],
             ).first()
-            leaving_username = leaving_member.user.username
             db.session.delete(leaving_member)
-            db.session.commit()
+            # The old owner must be deleted before the new one is set (uq_memberships_one_owner).
+            db.session.flush()
             # Update admin's membership role to owner
             new_owner = Membership.query.filter_by(
                 id=request.get_json().get("admin_id")
             ).first()
             new_owner.role = RoleType.OWNER
             db.session.add(new_owner)
-            db.session.commit()
-            log = OrganizationLog(
-                contents=[
-                    f'Owner, "{leaving_username}", has transferred ownership of this organization to admin, "{new_owner.user.username}", and left.'
-                ],
-                organization_id=org_id,
+            db.session.flush()
+            log_event(
+                LogEventType.OWNERSHIP_TRANSFERRED,
+                org_id,
+                new_owner=new_owner.user.username,
             )
-            db.session.add(log)
-            db.session.commit()
+            # Everything is committed in one transaction by commit_transaction, and then logged.
             return {}, 204
         except Exception as e:
+            db.session.rollback()
             return make_response({"message": str(e)}, 403)
 
 
+class CurrentUserMemberships(Resource):
+    """Resource tied to the Membership model. Used for retrieving the current user's memberships one page at a time.
+
+    Args:
+        Resource (Resource): the RESTful Resource container.
+    """
+
+    def get(self):
+        """Returns a page of the current user's memberships, along with the basic information of their organizations,
+        sorted by organization name.
+
+        Query Parameters:
+            limit (int, optional): the maximum number of memberships to return. Defaults to MEMBERSHIP_PAGE_SIZE.
+            cursor (str, optional): the next_cursor of the previous page. If absent, the first page is returned.
+
+        Returns:
+            dict: the page of memberships, along with the cursor of the next page (None if this is the last page).
+        """
+        limit = max(
+            1,
+            min(
+                request.args.get("limit", MEMBERSHIP_PAGE_SIZE, type=int),
+                MAX_MEMBERSHIP_PAGE_SIZE,
+            ),
+        )
+        filters = [Membership.user_id == session["user_id"]]
+        if cursor := request.args.get("cursor"):
+            try:
+                organization_name, membership_id = decode_cursor(cursor, 2)
+                if not (
+                    isinstance(organization_name, str)
+                    and isinstance(membership_id, int)
+                    and not isinstance(membership_id, bool)
+                ):
+                    raise ValueError("Invalid pagination cursor.")
+            except ValueError as e:
+                return {"message": str(e)}, 400
+            filters.append(
+                db.tuple_(Organization.name, Membership.id)
+                > (organization_name, membership_id)
+            )
+        rows = db.session.execute(
+            db.select(Membership, Organization)
+            .join(Organization, Membership.organization_id == Organization.id)
+            .filter(*filters)
+            .order_by(Organization.name, Membership.id)
+            .limit(limit + 1)
+        ).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(
+                rows[-1].Organization.name, rows[-1].Membership.id
+            )
+        memberships = [
+            {
+                **membership.to_dict(
+                    only=("id", "role", "joined_at", "user_id", "organization_id")
+                ),
+                "organization": organization.to_dict(
+                    only=("id", "name", "description", "image_url", "created_at")
+                ),
+            }
+            for membership, organization in rows
+        ]
+        return {"memberships": memberships, "next_cursor": next_cursor}, 200
+
+
 api.add_resource(MembershipById, "/memberships/<int:id>", endpoint="membership_by_id")
 api.add_resource(
     TransferOwnership, "/transfer_ownership/<int:org_id>", endpoint="leave_and_transfer"
 )
+api.add_resource(CurrentUserMemberships, "/current_user/memberships")
@@ -1,16 +1,105 @@
+import datetime
 from flask import (
     request,
     session,
-    render_template_string,
     url_for,
     make_response,
     jsonify,
 )
 from flask_restful import Resource
-from config import db, api, send_email, generate_invitation_token
+from sqlalchemy.exc import IntegrityError
+from config import db, api, generate_invitation_token
+from email_outbox import send_email
+from template_registry import render_html_template
+from log_writer import log_event
+from identity import get_current_user
 from resources.dry_resource import DRYResource
-from models.models import Organization, Membership, User
-from helpers import RoleType
+from models.models import (
+    Organization,
+    Membership,
+    User,
+    Assignment,
+    Item,
+    OrganizationLog,
+)
+from models.organization_log import LOG_SEARCH_CONFIG
+from helpers import (
+    RoleType,
+    LogEventType,
+    operation_context,
+    OperationType,
+    get_integrity_error_message,
+    encode_cursor,
+    decode_cursor,
+)
+
+LOG_PAGE_SIZE = 50
+""" The default number of logs returned per page of an organization's log feed. """
+
+MAX_LOG_PAGE_SIZE = 200
+""" The maximum number of logs that can be requested per page of an organization's log feed. """
+
+LOG_USERNAME_PARAMS = ("actor", "username", "new_owner")
+""" The parameters of a log that hold the username of a user who performed, or was the subject of, the event. """
+
+INVENTORY_BUCKETS = ("out", "low", "good")
+"""
+The inventory status buckets of assigned items, in the order that they are reported.
+An item is out if there are none left, low if there are fewer than its enough threshold,
+and good otherwise.
+"""
+
+
+def get_inventory_summary(org_id):
+    """Retrieves the assigned items of an organization, classified into the inventory status buckets.
+    The classification and sorting are done by the database in a single query.
+
+    Args:
+        org_id (int): the organization id.
+
+    Returns:
+        dict: the number of assigned items, and the sorted assigned items and number of them in each bucket.
+    """
+    bucket = db.case(
+        (Assignment.current_quantity == 0, 0),
+        (Assignment.current_quantity < Assignment.enough_threshold, 1),
+        else_=2,
+    ).label("bucket")
+    rows = db.session.execute(
+        db.select(
+            bucket,
+            Item.name,
+            Item.part_number,
+            Assignment.current_quantity,
+            Assignment.enough_threshold,
+            Assignment.added_at,
+            Assignment.last_updated,
+        )
+        .join(Item, Assignment.item_id == Item.id)
+        .filter(Assignment.organization_id == org_id)
+        .order_by(bucket, Item.name)
+    ).all()
+    buckets = tuple([] for _ in INVENTORY_BUCKETS)
+    for row in rows:
+        buckets[row.bucket].append(
+            {
+                "itemName": row.name,
+                "partNumber": row.part_number,
+                "currentQuantity": row.current_quantity,
+                "enoughThreshold": row.enough_threshold,
+                "addedAt": row.added_at.strftime(Assignment.datetime_format),
+                "lastUpdated": (
+                    row.last_updated.strftime(Assignment.datetime_format)
+                    if row.last_updated
+                    else "N/A"
+                ),
+            }
+        )
+    summary = {"number_of_items": len(rows)}
+    for name, assignments in zip(INVENTORY_BUCKETS, buckets):
+        summary[f"number_of_{name}"] = len(assignments)
+        summary[f"{name}_assignments"] = assignments
+    return summary
 
 
 class OrganizationCreator(Resource):
@@ -20,6 +109,7 @@ class OrganizationCreator(Resource):
         RestResourceTemplate (RestResourceTemplate): simplify RESTFul API building.
     """
 
+    @operation_context(OperationType.CREATE)
     def post(self):
         """
         Creates a new instance of Organization.
@@ -37,7 +127,8 @@ class OrganizationCreator(Resource):
                 banner_url=request.get_json().get("banner_url"),
             )
             db.session.add(new_org)
-            db.session.commit()
+            # Flush to get the new organization's id; the organization, membership and log are committed together.
+            db.session.flush()
             # Create membership as owner
             new_membership = Membership(
                 role=RoleType.OWNER,
@@ -45,8 +136,14 @@ class OrganizationCreator(Resource):
                 organization_id=new_org.id,
             )
             db.session.add(new_membership)
-            db.session.commit()
-            return {"membership_l": new_membership.to_dict()}, 201
+            db.session.flush()
+            log_event(
+                LogEventType.ORGANIZATION_CREATED, new_org.id, org_name=new_org.name
+            )
+            return new_membership.to_dict(), 201
+        except IntegrityError as e:
+            db.session.rollback()
+            return {"message": get_integrity_error_message(e)}, 422
         except ValueError as e:
             print(e)
             return {"message": str(e)}, 422
@@ -60,7 +157,10 @@ class OrganizationById(DRYResource):
     """
 
     def __init__(self):
-        super().__init__(Organization, "organization_l")
+        super().__init__(Organization)
+
+    def log_update(self, record):
+        log_event(LogEventType.ORGANIZATION_UPDATED, record.id)
 
 
 class OrganizationInventoryReport(Resource):
@@ -79,69 +179,19 @@ class OrganizationInventoryReport(Resource):
         org = Organization.query.filter_by(id=request.get_json().get("org_id")).first()
         if org:
             # UPDATE THE TWO LINES BELOW BEFORE FINAL DEPLOYMENT
-            member_emails = [membership.user.email for membership in org.memberships]
+            member_emails = db.session.scalars(
+                db.select(User.email)
+                .join(Membership, Membership.user_id == User.id)
+                .filter(Membership.organization_id == org.id)
+            ).all()
             member_emails.append("support@easyitemizer.com")
 
-            # List of assigned items where there are none left.
-            out_assignments = [
-                {
-                    "itemName": assignment.item.name,
-                    "partNumber": assignment.item.part_number,
-                    "currentQuantity": assignment.current_quantity,
-                    "enoughThreshold": assignment.enough_threshold,
-                    "addedAt": assignment.added_at,
-                    "lastUpdated": assignment.last_updated or "N/A",
-                }
-                for assignment in org.assignments
-                if assignment.current_quantity == 0
-            ]
-            out_assignments.sort(key=lambda e: e["itemName"])
-
-            # List of assigned items where the count is running low.
-            low_assignments = [
-                {
-                    "itemName": assignment.item.name,
-                    "partNumber": assignment.item.part_number,
-                    "currentQuantity": assignment.current_quantity,
-                    "enoughThreshold": assignment.enough_threshold,
-                    "addedAt": assignment.added_at,
-                    "lastUpdated": assignment.last_updated or "N/A",
-                }
-                for assignment in org.assignments
-                if assignment.current_quantity > 0
-                and assignment.current_quantity < assignment.enough_threshold
-            ]
-            low_assignments.sort(key=lambda e: e["itemName"])
-
-            # List of assigned items where there is enough of them.
-            good_assignments = [
-                {
-                    "itemName": assignment.item.name,
-                    "partNumber": assignment.item.part_number,
-                    "currentQuantity": assignment.current_quantity,
-                    "enoughThreshold": assignment.enough_threshold,
-                    "addedAt": assignment.added_at,
-                    "lastUpdated": assignment.last_updated or "N/A",
-                }
-                for assignment in org.assignments
-                if assignment.current_quantity >= assignment.enough_threshold
-            ]
-            good_assignments.sort(key=lambda e: e["itemName"])
-
-            user = User.query.filter_by(id=session["user_id"]).first()
-            with open("./html-templates/emails/inventory_report.html", "r") as file:
-                template_content = file.read()
-            html = render_template_string(
-                template_content,
+            user = get_current_user()
+            html = render_html_template(
+                "emails/inventory_report.html",
                 org_name=org.name,
                 sender=user.username,
-                number_of_items=len(org.assignments),
-                number_of_out=len(out_assignments),
-                number_of_low=len(low_assignments),
-                number_of_good=len(good_assignments),
-                out_assignments=out_assignments,
-                low_assignments=low_assignments,
-                good_assignments=good_assignments,
+                **get_inventory_summary(org.id),
             )
             subject = f"'{org.name}' Inventory Status Report"
             send_email(subject, member_emails, html)
@@ -150,6 +200,200 @@ class OrganizationInventoryReport(Resource):
             return {"message": "404 Not Found"}, 404
 
 
+class OrganizationInventorySummary(Resource):
+    """Resource tied to the Organization model. Used for retrieving the inventory status of an organization.
+
+    Args:
+        Resource (Resource): the RESTful Resource container.
+    """
+
+    def get(self, id):
+        """Retrieves the assigned items of an organization, bucketed by whether they are out, low, or good.
+
+        Args:
+            id (int): the organization id.
+
+        Returns:
+            dict: the inventory summary if the organization exists, otherwise an error message.
+        """
+        if not db.session.get(Organization, id):
+            return {
+                "error": f"Organization record of id, {id}, does not exist. Please try again later."
+            }, 404
+        return get_inventory_summary(id), 200
+
+
+class OrganizationLogs(Resource):
+    """Resource tied to the OrganizationLog model. Used for retrieving an organization's logs one page at a time.
+
+    Args:
+        Resource (Resource): the RESTful Resource container.
+    """
+
+    def get(self, id):
+        """Returns a page of an organization's logs, newest first.
+        The logs are read in order from the ix_organization_logs_feed index, so fetching a page
+        takes the same time no matter how far back it is.
+
+        Args:
+            id (int): the organization id.
+
+        Query Parameters:
+            limit (int, optional): the maximum number of logs to return. Defaults to LOG_PAGE_SIZE.
+            before (str, optional): the next_cursor of the previous page. If absent, the newest logs are returned.
+
+        Returns:
+            dict: the page of logs, along with the cursor of the next (older) page (None if this is the last page),
+            if the organization exists, otherwise an error message.
+        """
+        if not db.session.get(Organization, id):
+            return {
+                "error": f"Organization record of id, {id}, does not exist. Please try again later."
+            }, 404
+        limit = max(
+            1, min(request.args.get("limit", LOG_PAGE_SIZE, type=int), MAX_LOG_PAGE_SIZE)
+        )
+        try:
+            filters = self.get_filters(id)
+        except ValueError as e:
+            return {"message": str(e)}, 400
+        page = (
+            OrganizationLog.query.filter(*filters)
+            .order_by(OrganizationLog.occurrence.desc(), OrganizationLog.id)
+            .limit(limit + 1)
+            .all()
+        )
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(page[-1].occurrence.isoformat(), page[-1].id)
+        logs = [
+            log.to_dict(
+                only=("id", "event_type", "contents", "occurrence", "organization_id")
+            )
+            for log in page
+        ]
+        return {"logs": logs, "next_cursor": next_cursor}, 200
+
+    def get_filters(self, id):
+        """Builds the conditions that the logs of the page must meet, from the query parameters.
+
+        Args:
+            id (int): the organization id.
+
+        Raises:
+            ValueError: if the pagination cursor is malformed.
+
+        Returns:
+            list: the filter conditions.
+        """
+        filters = [OrganizationLog.organization_id == id]
+        if before := request.args.get("before"):
+            try:
+                occurrence, log_id = decode_cursor(before, 2)
+                occurrence = datetime.datetime.fromisoformat(occurrence)
+                if isinstance(log_id, bool) or not isinstance(log_id, int):
+                    raise ValueError
+            except (ValueError, TypeError):
+                raise ValueError("Invalid pagination cursor.")
+            # Matches the (occurrence DESC, id) order of the index.
+            filters.append(
+                db.or_(
+                    OrganizationLog.occurrence < occurrence,
+                    db.and_(
+                        OrganizationLog.occurrence == occurrence,
+                        OrganizationLog.id > log_id,
+                    ),
+                )
+            )
+        return filters
+
+
+class OrganizationLogSearch(OrganizationLogs):
+    """Resource tied to the OrganizationLog model. Used for searching an organization's logs.
+
+    Args:
+        OrganizationLogs (OrganizationLogs): the organization's log feed, which the search results are paged like.
+    """
+
+    def get(self, id):
+        """Returns a page of the organization's logs that match the search, newest first.
+        Text and usernames are looked up in the ix_organization_logs_search_vector index,
+        and date ranges only read the partitions of the days in the range.
+
+        Args:
+            id (int): the organization id.
+
+        Query Parameters:
+            q (str, optional): text that the parameters of the log must contain, in web search syntax
+            (e.g. "widget -bolt" or "\"blue widget\"").
+            username (str, optional): the username of a user who performed, or was the subject of, the logged event.
+            event_type (int, optional): an event type (see LogEventType). Can be given more than once.
+            from (str, optional): an ISO date/time; only logs that occurred at or after it are returned.
+            to (str, optional): an ISO date/time; only logs that occurred before it are returned.
+            limit (int, optional): the maximum number of logs to return. Defaults to LOG_PAGE_SIZE.
+            before (str, optional): the next_cursor of the previous page. If absent, the newest logs are returned.
+
+        Returns:
+            dict: the page of matching logs, along with the cursor of the next (older) page (None if this is the last page),
+            if the organization exists, otherwise an error message.
+        """
+        return super().get(id)
+
+    def get_filters(self, id):
+        """Builds the conditions that the logs of the page must meet, from the query parameters.
+
+        Args:
+            id (int): the organization id.
+
+        Raises:
+            ValueError: if any of the query parameters is malformed.
+
+        Returns:
+            list: the filter conditions.
+        """
+        filters = super().get_filters(id)
+        if text := request.args.get("q"):
+            filters.append(
+                OrganizationLog.search_vector.bool_op("@@")(
+                    db.func.websearch_to_tsquery(LOG_SEARCH_CONFIG, text)
+                )
+            )
+        if username := request.args.get("username"):
+            # The index narrows the logs down to those that mention the username, and the
+            # parameters are then checked for the user's exact role in the event.
+            filters.append(
+                OrganizationLog.search_vector.bool_op("@@")(
+                    db.func.phraseto_tsquery(LOG_SEARCH_CONFIG, username)
+                )
+            )
+            filters.append(
+                db.or_(
+                    *(
+                        OrganizationLog.params[key].astext == username
+                        for key in LOG_USERNAME_PARAMS
+                    )
+                )
+            )
+        if event_types := request.args.getlist("event_type"):
+            if not all(
+                event_type.isdigit() and int(event_type) in LogEventType.get_all()
+                for event_type in event_types
+            ):
+                raise ValueError("Invalid event type.")
+            filters.append(OrganizationLog.event_type.in_(map(int, event_types)))
+        try:
+            if start := request.args.get("from"):
+                start = datetime.datetime.fromisoformat(start)
+                filters.append(OrganizationLog.occurrence >= start)
+            if end := request.args.get("to"):
+                end = datetime.datetime.fromisoformat(end)
+                filters.append(OrganizationLog.occurrence < end)
+        except ValueError:
+            raise ValueError("Invalid date range. Dates must be in ISO format.")
+        return filters
+
+
 class OrganizationLink(Resource):
     """Resource tied to the Organization model. Used for generating invitation links.
 
@@ -180,4 +424,17 @@ api.add_resource(
     OrganizationById, "/organizations/<int:id>", endpoint="organization_by_id"
 )
 api.add_resource(OrganizationInventoryReport, "/status_report")
+api.add_resource(
+    OrganizationInventorySummary,
+    "/organizations/<int:id>/inventory_summary",
+    endpoint="organization_inventory_summary",
+)
+api.add_resource(
+    OrganizationLogs, "/organizations/<int:id>/logs", endpoint="organization_logs"
+)
+api.add_resource(
+    OrganizationLogSearch,
+    "/organizations/<int:id>/logs/search",
+    endpoint="organization_log_search",
+)
 api.add_resource(OrganizationLink, "/organization_links/<string:name>")
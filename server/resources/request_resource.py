@@ -1,9 +1,18 @@
-from flask import request, make_response, render_template_string
+from flask import request, make_response
 from flask_restful import Resource
+from sqlalchemy.exc import IntegrityError
 from config import db, api, home_page, route_prefix, invitation_token
+from template_registry import render_html_template
+from log_writer import log_event
 from resources.dry_resource import DRYResource
 from models.models import Request, Membership, User, Organization
-from helpers import RoleType
+from helpers import (
+    RoleType,
+    LogEventType,
+    operation_context,
+    OperationType,
+    get_integrity_error_message,
+)
 
 
 class AcceptRequest(Resource):
@@ -13,6 +22,7 @@ class AcceptRequest(Resource):
         Resource (Resource): the RESTful Resource container.
     """
 
+    @operation_context(OperationType.CREATE)
     def post(self):
         """Deletes a request from the server. Then, uses the information
         from the request to create a new membership tied to the organization
@@ -31,7 +41,6 @@ class AcceptRequest(Resource):
             org_id = request_to_accept.organization_id
             print(request_to_accept)
             db.session.delete(request_to_accept)
-            db.session.commit()
             # Create a new membership
             print(f"User Id: {user_id}", flush=True)
             print(f"Org Id: {org_id}", flush=True)
@@ -39,9 +48,17 @@ class AcceptRequest(Resource):
                 user_id=user_id, organization_id=org_id, role=RoleType.REGULAR
             )
             db.session.add(new_membership)
-            db.session.commit()
-            # Process as log.
-            return {"membership_l": new_membership.to_dict()}, 201
+            # The request deletion, membership and log are committed together.
+            db.session.flush()
+            log_event(
+                LogEventType.MEMBER_JOINED,
+                org_id,
+                username=new_membership.user.username,
+            )
+            return new_membership.to_dict(), 201
+        except IntegrityError as e:
+            db.session.rollback()
+            return {"message": get_integrity_error_message(e)}, 422
         except Exception as e:
             return {"message": str(e)}, 422
 
@@ -76,15 +93,13 @@ class Invitation(Resource):
         try:
             org_name = invitation_token(token)
             print(org_name, flush=True)
-            with open("./html-templates/static-pages/request_form.html", "r") as file:
-                page = file.read()
-            html = render_template_string(
-                page, org_name=org_name, route_prefix=route_prefix
+            html = render_html_template(
+                "static-pages/request_form.html",
+                org_name=org_name,
+                route_prefix=route_prefix,
             )
         except Exception as e:
-            with open("./html-templates/static-pages/error.html", "r") as file:
-                page = file.read()
-            html = render_template_string(page, home_page=home_page)
+            html = render_html_template("static-pages/error.html", home_page=home_page)
         finally:
             response = make_response(html)
             response.headers["Content-Type"] = "text/html"
@@ -98,6 +113,7 @@ class RequestResource(Resource):
         RestResourceTemplate (RestResourceTemplate): simplify RESTFul API building.
     """
 
+    @operation_context(OperationType.CREATE)
     def post(self):
         """Creates a new instance of Request.
 
@@ -121,9 +137,10 @@ class RequestResource(Resource):
                 reason_to_join=request.get_json().get("reason_to_join"),
             )
             db.session.add(new_request)
-            db.session.commit()
-            return {
-                "request_l": new_request.to_dict(
+            db.session.flush()
+            log_event(LogEventType.REQUEST_SUBMITTED, org.id, username=user.username)
+            return (
+                new_request.to_dict(
                     only=(
                         "id",
                         "user_id",
@@ -133,8 +150,12 @@ class RequestResource(Resource):
                         "submitted_at",
                         "organization.name",
                     )
-                )
-            }, 201
+                ),
+                201,
+            )
+        except IntegrityError as e:
+            db.session.rollback()
+            return make_response({"message": get_integrity_error_message(e)}, 422)
         except Exception as e:
             return make_response({"message": str(e)}, 422)
 
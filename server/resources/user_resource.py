@@ -2,7 +2,6 @@ from flask import (
     request,
     session,
     make_response,
-    render_template_string,
     url_for,
     redirect,
 )
@@ -12,20 +11,79 @@ from config import (
     db,
     api,
     generate_confirmation_token,
-    send_email,
     confirm_token,
     generate_password_reset_link,
     password_reset_token,
     home_page,
     route_prefix,
 )
-from models.models import User
-from helpers import random_alphanumeric_sequence
+from models.models import User, Membership, Organization
+from identity import get_current_user, identity_cache
+from etags import version_of, check_etag, not_modified
+from email_outbox import send_email
+from template_registry import render_html_template
+from helpers import (
+    random_alphanumeric_sequence,
+    operation_context,
+    OperationType,
+    get_integrity_error_message,
+)
+
+SESSION_PROFILE_FIELDS = (
+    "id",
+    "first_name",
+    "last_name",
+    "username",
+    "email",
+    "profile_picture_url",
+    "created_at",
+    "last_updated",
+    "is_verified",
+)
+""" The attributes of a user that are included in its session profile. """
+
+
+def get_session_profile(user):
+    """Builds the session profile of a user: the user's own attributes and a summary of each of the user's
+    memberships. The memberships are read in a single query. The full memberships, items and requests of
+    the user are fetched from their own endpoints when they are needed.
+
+    Args:
+        user (User): the user.
+
+    Returns:
+        dict: the session profile.
+    """
+    profile = user.to_dict(only=SESSION_PROFILE_FIELDS)
+    rows = db.session.execute(
+        db.select(
+            Membership.id,
+            Membership.user_id,
+            Membership.organization_id,
+            Organization.name,
+            Membership.role,
+        )
+        .join(Organization, Membership.organization_id == Organization.id)
+        .filter(Membership.user_id == user.id)
+        .order_by(Organization.name)
+    ).all()
+    profile["memberships"] = [
+        {
+            "id": row.id,
+            "user_id": row.user_id,
+            "organization_id": row.organization_id,
+            "organization_name": row.name,
+            "role": row.role,
+        }
+        for row in rows
+    ]
+    return profile
 
 
 class Signup(Resource):
     """Create a new user."""
 
+    @operation_context(OperationType.CREATE)
     def post(self):
         """Creates a new instance of User.
 
@@ -52,16 +110,15 @@ class Signup(Resource):
             confirm_url = url_for("confirm", token=token, _external=True)
             ## print(os.getcwd(), flush=True)
             # breakpoint()
-            path_to_template = "./html-templates/emails/activate.html"
-            with open(path_to_template, "r") as file:
-                template_content = file.read()
-            html = render_template_string(template_content, confirm_url=confirm_url)
-            # html = html = render_template_string(open("activate.html").read(), confirm_url=confirm_url)
+            html = render_html_template("emails/activate.html", confirm_url=confirm_url)
             subject = "Please Verify Your Email"
             # print("About to send email", flush=True)
             send_email(subject, [new_user.email], html)
             return {"message": "A confirmation email has been sent via email."}, 201
-        except (IntegrityError, ValueError) as e:
+        except IntegrityError as e:
+            db.session.rollback()
+            return {"message": get_integrity_error_message(e)}, 422
+        except ValueError as e:
             # print(e)
             # print("BOO YOU STINK!")
             return {"message": str(e)}, 422
@@ -74,7 +131,7 @@ class Login(Resource):
         """Sets the session's user_id, so that the user has authorization to access appropriate data.
 
         Returns:
-            JSON: the JSONified user object, if entered password is correct; an "Unauthorized" message otherwise.
+            JSON: the user's session profile (see get_session_profile), if entered password is correct; an "Unauthorized" message otherwise.
         """
         login_name = request.get_json().get("username_or_email")
         # print(login_name, flush=True)
@@ -96,7 +153,7 @@ class Login(Resource):
                             "Account with associated username/email is banned."
                         )
                     session["user_id"] = user.id
-                    return user.to_dict(), 200
+                    return get_session_profile(user), 200
             raise ValueError(
                 "Account with entered credentials does not exist. Please try again!"
             )
@@ -154,12 +211,10 @@ class Confirm(Resource):
             db.session.commit()
             title = "Account Verification Complete"
             message = "Your account hass been successfully verified. You may now close this page and log in."
-        with open(
-            "./html-templates/static-pages/activation_complete.html", "r"
-        ) as file:
-            template_content = file.read()
-        html = render_template_string(
-            template_content, page_title=title, page_message=message
+        html = render_html_template(
+            "static-pages/activation_complete.html",
+            page_title=title,
+            page_message=message,
         )
         response = make_response(html)
         response.headers["Content-Type"] = "text/html"
@@ -191,13 +246,11 @@ class ForgotPassword(Resource):
                 raise ValueError(
                     "An account with the entered email does not exist. Please try again."
                 )
-            with open("./html-templates/emails/reset_password_link.html", "r") as file:
-                template_content = file.read()
             salted_email = user.email + "|" + random_alphanumeric_sequence()
             token = generate_password_reset_link(salted_email)
             reset_url = url_for("password_reset_form", token=token, _external=True)
-            html = render_template_string(
-                template_content, reset_password_url=reset_url
+            html = render_html_template(
+                "emails/reset_password_link.html", reset_password_url=reset_url
             )
             subject = "Your Link to Reset Your Easy Itemizer Password"
             send_email(subject, [user.email], html)
@@ -230,18 +283,14 @@ class ResetPasswordForm(Resource):
             user = User.query.filter(User.email == email).first()
             if not user:
                 raise ValueError("User with email not found.")
-            with open(
-                "./html-templates/static-pages/reset_password_form.html", "r"
-            ) as file:
-                page = file.read()
-            html = render_template_string(
-                page, route_prefix=route_prefix, email=user.email
+            html = render_html_template(
+                "static-pages/reset_password_form.html",
+                route_prefix=route_prefix,
+                email=user.email,
             )
         except Exception as e:
             print(e, flush=True)
-            with open("./html-templates/static-pages/error.html", "r") as file:
-                page = file.read()
-            html = render_template_string(page, home_page=home_page)
+            html = render_html_template("static-pages/error.html", home_page=home_page)
         finally:
             response = make_response(html)
             response.headers["Content-Type"] = "text/html"
@@ -289,12 +338,25 @@ class CheckSession(Resource):
         In other words, checks if a user is logged in.
 
         Returns:
-          type (dict): the JSONified user object, if there's an id for the session object, the message "Unauthorized" otherwise.
+          type (dict): the user's session profile (see get_session_profile), if there's an id for the session object, the message "Unauthorized" otherwise.
+          If the client's copy of the session profile is current, a "not modified" response.
         """
-        if user := User.query.filter_by(id=session.get("user_id")).first():
+        user_id = session.get("user_id")
+        if user_id and check_etag(
+            version_of(User, User.id == user_id),
+            version_of(Membership, Membership.user_id == user_id),
+            version_of(
+                Organization,
+                Membership.user_id == user_id,
+                joins=((Membership, Membership.organization_id == Organization.id),),
+            ),
+            key=(user_id,),
+        ):
+            return not_modified()
+        if user := get_current_user():
             if user.is_banned:
                 return redirect("/")
-            return user.to_dict(), 200
+            return get_session_profile(user), 200
         # print("SUPERDUPERDAB", flush=True)
         return {"message": "401 Unauthorized"}, 401
 
@@ -309,6 +371,7 @@ class CurrentUser(Resource):
         Resource (Resource): the RESTful Resource container.
     """
 
+    @operation_context(OperationType.UPDATE)
     def patch(self):
         """Updates the current user's information.
         Note: The user must enter his/her current password in order for this to be successful.
@@ -316,7 +379,7 @@ class CurrentUser(Resource):
         Returns:
             Response: the user's updated data, if update successful, an error message otherwise.
         """
-        user = User.query.filter_by(id=session["user_id"]).first()
+        user = get_current_user()
         json = request.get_json()
         if user.authenticate(json.get("password")):
             try:
@@ -334,7 +397,11 @@ class CurrentUser(Resource):
                     user.password_hash = new_password
                 db.session.add(user)
                 db.session.commit()
-                return user.to_dict(), 200
+                identity_cache.forget(user.id)
+                return get_session_profile(user), 200
+            except IntegrityError as e:
+                db.session.rollback()
+                return make_response({"message": get_integrity_error_message(e)}, 304)
             except Exception as e:
                 return make_response({"message": str(e)}, 304)
         else:
@@ -348,10 +415,11 @@ class CurrentUser(Resource):
         Returns:
             Response: a response with no content if the operation was successful, an error message otherwise.
         """
-        user = User.query.filter_by(id=session["user_id"]).first()
+        user = get_current_user()
         if user.authenticate(request.get_json().get("password")):
             db.session.delete(user)
             db.session.commit()
+            identity_cache.forget(user.id)
             return make_response({"message": "Account deleted"}, 204)
         else:
             return make_response({"message": "Incorrect password entered."}, 403)
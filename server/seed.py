@@ -10,6 +10,7 @@ from helpers import (
     print_progress,
     execute_to_success,
     RoleType,
+    LogEventType,
 )
 import random
 import time
@@ -251,14 +252,16 @@ def seed_relational_models():
             db.session.add(membership)
             if n == 0:
                 log = OrganizationLog(
-                    contents=[
-                        f"{user.username} created a new organization: '{org.name}'!"
-                    ],
+                    event_type=LogEventType.ORGANIZATION_CREATED,
+                    params=OrganizationLog.get_params(
+                        {"org_name": org.name}, user.username
+                    ),
                     organization_id=org.id,
                 )
             else:
                 log = OrganizationLog(
-                    contents=[f"{user.username} has joined '{org.name}'!"],
+                    event_type=LogEventType.MEMBER_JOINED,
+                    params={"username": user.username},
                     organization_id=org.id,
                 )
             db.session.add(log)
@@ -279,11 +282,8 @@ def seed_relational_models():
             )
             db.session.add(assignment)
             log = OrganizationLog(
-                contents=[
-                    "An item has been assigned by the seed to this organization",
-                    f"Name: {item.name}",
-                    f"Part #: {item.part_number}",
-                ],
+                event_type=LogEventType.ITEM_CREATED,
+                params={"item_name": item.name, "part_number": item.part_number},
                 organization_id=org.id,
             )
             db.session.add(log)
@@ -299,9 +299,8 @@ def seed_relational_models():
             )
             db.session.add(request)
             log = OrganizationLog(
-                contents=[
-                    f"User, {user.username}, has requested to join this organization."
-                ],
+                event_type=LogEventType.REQUEST_SUBMITTED,
+                params={"username": user.username},
                 organization_id=org.id,
             )
             db.session.add(log)
@@ -0,0 +1,87 @@
+import os
+from jinja2 import FileSystemLoader
+from config import app
+
+TEMPLATES_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "html-templates"
+)
+"""
+The directory containing the email and static page templates.
+"""
+
+
+class TemplateRegistry:
+    """
+    Loads and compiles every template of a directory once, so that rendering a template
+    never has to read or parse it again. If auto_reload is set, templates that have changed
+    on disk are recompiled the next time that they are rendered.
+    """
+
+    def __init__(self, flask_app, directory, auto_reload=False):
+        """Creates a new instance of TemplateRegistry, and compiles all the templates in the directory.
+
+        Args:
+            flask_app (Flask): the app whose jinja environment (filters, globals, autoescaping) is used.
+            directory (str): the path of the template directory.
+            auto_reload (bool, optional): whether changed templates are recompiled. Defaults to False.
+        """
+        self.app = flask_app
+        self.auto_reload = auto_reload
+        self.environment = flask_app.jinja_env.overlay(
+            loader=FileSystemLoader(directory), auto_reload=auto_reload
+        )
+        self.templates = {
+            name: self.environment.get_template(name)
+            for name in self.environment.list_templates(extensions=["html"])
+        }
+
+    def get_template(self, name):
+        """Retrieves a compiled template.
+
+        Args:
+            name (str): the path of the template, relative to the template directory (i.e. "emails/activate.html").
+
+        Raises:
+            KeyError: if no template exists with the specified name.
+
+        Returns:
+            Template: the compiled template.
+        """
+        if self.auto_reload:
+            # The environment checks whether the file has changed since it was compiled.
+            return self.environment.get_template(name)
+        return self.templates[name]
+
+    def render(self, name, **context):
+        """Renders a template with the given context. Like render_template_string, the
+        context is populated with the app's context processors (g, request, session, etc.).
+
+        Args:
+            name (str): the path of the template, relative to the template directory.
+
+        Returns:
+            str: the rendered template.
+        """
+        template = self.get_template(name)
+        self.app.update_template_context(context)
+        return template.render(context)
+
+
+templates = TemplateRegistry(
+    app, TEMPLATES_DIRECTORY, auto_reload=app.config["TEMPLATES_AUTO_RELOAD"]
+)
+"""
+The registry of all the email and static page templates.
+"""
+
+
+def render_html_template(name, **context):
+    """Renders one of the templates in html-templates.
+
+    Args:
+        name (str): the path of the template, relative to html-templates (i.e. "emails/activate.html").
+
+    Returns:
+        str: the rendered template.
+    """
+    return templates.render(name, **context)
@@ -0,0 +1,117 @@
+import os
+import sys
+import pytest
+
+# The tests run against a real PostgreSQL database, since the app relies on its locking, constraints
+# and partitioning. TEST_DATABASE_URI must point to a database that can be wiped: its public schema is
+# dropped and rebuilt with the migrations at the start of every test session.
+# Run from the server directory: TEST_DATABASE_URI=postgresql://... python -m pytest tests
+
+SERVER_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+""" The server directory, which the app is imported and run from. """
+
+TEST_DATABASE_URI = os.getenv("TEST_DATABASE_URI")
+""" The URI of the database that the tests run against. """
+
+if TEST_DATABASE_URI:
+    os.environ["DATABASE_URI"] = TEST_DATABASE_URI
+    os.environ.setdefault("SECRET_KEY", "test-secret-key")
+    os.environ.setdefault("MAIL_DEFAULT_SENDER", "noreply@easyitemizer.com")
+    os.chdir(SERVER_DIRECTORY)
+    sys.path.insert(0, SERVER_DIRECTORY)
+else:
+    collect_ignore_glob = ["test_*.py"]
+
+
+def pytest_report_header(config):
+    if not TEST_DATABASE_URI:
+        return "TEST_DATABASE_URI is not set, so no test was collected."
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Builds the schema of the test database with the migrations, and provides the app.
+
+    Yields:
+        Flask: the app.
+    """
+    from flask_migrate import upgrade
+    from config import app, db
+    from log_writer import log_writer
+    import app as app_module  # Registers the resources and request hooks.
+
+    with app.app_context():
+        db.session.execute(db.text("DROP SCHEMA public CASCADE"))
+        db.session.execute(db.text("CREATE SCHEMA public"))
+        db.session.commit()
+        upgrade()
+    yield app
+    log_writer.stop()
+
+
+@pytest.fixture(autouse=True)
+def clean_database(app):
+    """Empties every table after each test, and forgets the identities cached during it."""
+    yield
+    from config import db
+    from log_writer import log_writer
+    from identity import identity_cache
+
+    log_writer.stop()
+    with app.app_context():
+        tables = ", ".join(table.name for table in db.metadata.sorted_tables)
+        db.session.execute(db.text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+        db.session.commit()
+    identity_cache.entries.clear()
+    log_writer.start()
+
+
+@pytest.fixture
+def db_session(app):
+    """Provides the database session of an app context that lasts for the whole test.
+
+    Yields:
+        scoped_session: the session.
+    """
+    from config import db
+
+    with app.app_context():
+        yield db.session
+
+
+def make_user(number):
+    """Builds a verified user with a unique username and email.
+
+    Args:
+        number (int): a number unique to the user.
+
+    Returns:
+        User: the user.
+    """
+    from models.models import User
+
+    user = User(
+        first_name=f"First{number}",
+        last_name=f"Last{number}",
+        username=f"user{number}",
+        email=f"user{number}@example.com",
+        is_verified=True,
+    )
+    # Hashing a password is slow, and the tests never log in with one.
+    user._password_hash = "unused"
+    return user
+
+
+def login(client, user_id):
+    """Logs a user in on a test client.
+
+    Args:
+        client (FlaskClient): the test client.
+        user_id (int): the user id.
+
+    Returns:
+        FlaskClient: the test client.
+    """
+    with client.session_transaction() as session:
+        session["user_id"] = user_id
+    return client
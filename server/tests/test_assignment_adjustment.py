@@ -0,0 +1,126 @@
+import threading
+from config import db
+from models.models import Organization, Membership, Item, Assignment
+from helpers import RoleType
+from conftest import make_user, login
+
+THREAD_COUNT = 40
+""" The number of threads that adjust the assignment at the same time. """
+
+
+def create_assignment(db_session, current_quantity):
+    """Creates an organization with one member, and an item assigned to it.
+
+    Args:
+        db_session (scoped_session): the database session.
+        current_quantity (int): the current quantity of the assignment.
+
+    Returns:
+        tuple: the user id and the assignment id.
+    """
+    user = make_user(0)
+    organization = Organization(name="Warehouse")
+    db_session.add_all([user, organization])
+    db_session.flush()
+    item = Item(name="Widget", part_number="W-1", user_id=user.id)
+    db_session.add(item)
+    db_session.flush()
+    assignment = Assignment(
+        item_id=item.id,
+        organization_id=organization.id,
+        current_quantity=current_quantity,
+        enough_threshold=1,
+    )
+    db_session.add_all(
+        [
+            assignment,
+            Membership(
+                user_id=user.id,
+                organization_id=organization.id,
+                role=RoleType.OWNER,
+            ),
+        ]
+    )
+    db_session.commit()
+    return user.id, assignment.id
+
+
+def adjust_concurrently(app, user_id, assignment_id, deltas):
+    """Posts one adjustment per delta to an assignment, each from its own thread, all at once.
+
+    Args:
+        app (Flask): the app.
+        user_id (int): the id of the user who makes the adjustments.
+        assignment_id (int): the assignment id.
+        deltas (list): the deltas.
+
+    Returns:
+        list: the (delta, status code, response body) of each adjustment.
+    """
+    start = threading.Barrier(len(deltas))
+    results = []
+    lock = threading.Lock()
+
+    def adjust(delta):
+        client = login(app.test_client(), user_id)
+        start.wait()
+        response = client.post(
+            f"/assignments/{assignment_id}/adjust", json={"delta": delta}
+        )
+        with lock:
+            results.append((delta, response.status_code, response.json))
+
+    threads = [threading.Thread(target=adjust, args=(delta,)) for delta in deltas]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+    assert len(results) == len(deltas)
+    return results
+
+
+def get_current_quantity(assignment_id):
+    """
+    Returns:
+        int: the current quantity of an assignment, as it is in the database.
+    """
+    db.session.expire_all()
+    return db.session.get(Assignment, assignment_id).current_quantity
+
+
+def test_concurrent_subtractions_never_go_below_zero(app, db_session):
+    user_id, assignment_id = create_assignment(db_session, current_quantity=50)
+
+    results = adjust_concurrently(app, user_id, assignment_id, [-2] * THREAD_COUNT)
+
+    succeeded = [body for _, status, body in results if status == 200]
+    refused = [body for _, status, body in results if status == 422]
+    # 50 items can be subtracted 2 at a time exactly 25 times, whatever the order.
+    assert len(succeeded) == 25
+    assert len(refused) == THREAD_COUNT - 25
+    assert all(
+        body == {"message": "There are not enough items left to subtract."}
+        for body in refused
+    )
+    # Every adjustment saw the quantity left by the previous one.
+    assert sorted(body["current_quantity"] for body in succeeded) == list(
+        range(0, 50, 2)
+    )
+    assert get_current_quantity(assignment_id) == 0
+
+
+def test_concurrent_additions_and_subtractions_are_all_applied(app, db_session):
+    user_id, assignment_id = create_assignment(db_session, current_quantity=0)
+    deltas = [3, -1] * (THREAD_COUNT // 2)
+
+    results = adjust_concurrently(app, user_id, assignment_id, deltas)
+
+    applied = [delta for delta, status, _ in results if status == 200]
+    refused = [delta for delta, status, _ in results if status == 422]
+    # Only subtractions that would have made the quantity negative are refused.
+    assert all(delta < 0 for delta in refused)
+    assert len(applied) + len(refused) == THREAD_COUNT
+    assert all(
+        body["current_quantity"] >= 0 for _, status, body in results if status == 200
+    )
+    assert get_current_quantity(assignment_id) == sum(applied)
@@ -0,0 +1,259 @@
+import smtplib
+import threading
+from contextlib import contextmanager
+import pytest
+from config import db, mail
+from models.outbox_email import OutboxEmail
+from helpers import EmailStatus
+import email_outbox
+from email_outbox import (
+    send_email,
+    send_pending_emails,
+    MAX_SEND_ATTEMPTS,
+    RETRY_BACKOFF_SECONDS,
+)
+
+
+class FakeMailServer:
+    """
+    Stands in for the SMTP server. Records every connection opened to it, and the messages sent over each one.
+    """
+
+    def __init__(
+        self, refuse_connections=False, failing_recipients=(), on_send=None
+    ):
+        """Creates a new instance of FakeMailServer.
+
+        Args:
+            refuse_connections (bool, optional): whether opening a connection fails. Defaults to False.
+            failing_recipients (iterable, optional): the recipients that messages cannot be sent to. Defaults to ().
+            on_send (function, optional): called with each message before it is sent. Defaults to None.
+        """
+        self.refuse_connections = refuse_connections
+        self.failing_recipients = set(failing_recipients)
+        self.on_send = on_send
+        self.connections = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def connect(self):
+        """Opens a connection, like Mail.connect.
+
+        Raises:
+            SMTPConnectError: if connections are refused.
+
+        Yields:
+            FakeConnection: the connection.
+        """
+        if self.refuse_connections:
+            raise smtplib.SMTPConnectError(421, "Service not available")
+        messages = []
+        with self.lock:
+            self.connections.append(messages)
+        yield FakeConnection(self, messages)
+
+    @property
+    def sent_subjects(self):
+        """
+        Returns:
+            list: the subjects of all the messages sent, over all the connections.
+        """
+        return [
+            message.subject for messages in self.connections for message in messages
+        ]
+
+
+class FakeConnection:
+    """
+    A connection to the FakeMailServer.
+    """
+
+    def __init__(self, server, messages):
+        self.server = server
+        self.messages = messages
+
+    def send(self, message):
+        """Sends a message, like Connection.send.
+
+        Raises:
+            SMTPRecipientsRefused: if a recipient of the message is one of the server's failing recipients.
+        """
+        if self.server.on_send:
+            self.server.on_send(message)
+        refused = self.server.failing_recipients.intersection(message.recipients)
+        if refused:
+            raise smtplib.SMTPRecipientsRefused(
+                {recipient: (550, b"Mailbox unavailable") for recipient in refused}
+            )
+        self.messages.append(message)
+
+
+@pytest.fixture
+def mail_server(monkeypatch):
+    """Replaces the SMTP server of the app with a FakeMailServer.
+
+    Returns:
+        function: builds the FakeMailServer, with the given options.
+    """
+
+    def use_mail_server(**options):
+        server = FakeMailServer(**options)
+        monkeypatch.setattr(mail, "connect", server.connect)
+        return server
+
+    return use_mail_server
+
+
+def enqueue_emails(count, recipient="member@example.com"):
+    """Adds emails to the outbox, and commits them.
+
+    Args:
+        count (int): the number of emails.
+        recipient (str, optional): the recipient of the emails. Defaults to "member@example.com".
+    """
+    for number in range(count):
+        send_email(f"Email {number}", [recipient], f"<p>Email {number}</p>")
+    db.session.commit()
+
+
+def get_emails():
+    """
+    Returns:
+        list: all the emails of the outbox, as they are in the database, ordered by id.
+    """
+    db.session.expire_all()
+    return OutboxEmail.query.order_by(OutboxEmail.id).all()
+
+
+def seconds_until_next_attempt(email):
+    """
+    Returns:
+        float: the number of seconds from now until the next delivery attempt of an email.
+    """
+    return db.session.scalar(
+        db.select(
+            db.func.extract("epoch", OutboxEmail.next_attempt_at - db.func.now())
+        ).filter(OutboxEmail.id == email.id)
+    )
+
+
+def make_due(email):
+    """Makes the next delivery attempt of an email due now."""
+    OutboxEmail.query.filter(OutboxEmail.id == email.id).update(
+        {"next_attempt_at": db.func.now()}
+    )
+    db.session.commit()
+
+
+def test_batch_is_sent_over_one_connection(db_session, mail_server):
+    server = mail_server()
+    enqueue_emails(3)
+
+    assert send_pending_emails() == 3
+
+    assert len(server.connections) == 1
+    assert server.sent_subjects == ["Email 0", "Email 1", "Email 2"]
+    assert all(email.status == EmailStatus.SENT for email in get_emails())
+    assert all(email.sent_at for email in get_emails())
+
+
+def test_failed_email_is_retried_with_backoff(db_session, mail_server):
+    server = mail_server(failing_recipients=["bounce@example.com"])
+    enqueue_emails(1, recipient="bounce@example.com")
+    enqueue_emails(1)
+
+    assert send_pending_emails() == 1
+    failed, sent = get_emails()
+    assert sent.status == EmailStatus.SENT
+    assert failed.status == EmailStatus.PENDING
+    assert failed.attempts == 1
+    assert "bounce@example.com" in failed.last_error
+    assert (
+        RETRY_BACKOFF_SECONDS - 5
+        < seconds_until_next_attempt(failed)
+        <= RETRY_BACKOFF_SECONDS
+    )
+
+    # The email is not retried before its backoff is over.
+    assert send_pending_emails() == 0
+    assert get_emails()[0].attempts == 1
+
+    # The delay doubles after every attempt.
+    make_due(failed)
+    send_pending_emails()
+    failed = get_emails()[0]
+    assert failed.attempts == 2
+    assert (
+        2 * RETRY_BACKOFF_SECONDS - 5
+        < seconds_until_next_attempt(failed)
+        <= 2 * RETRY_BACKOFF_SECONDS
+    )
+
+    # Once the recipient accepts it, the email is sent.
+    server.failing_recipients.clear()
+    make_due(failed)
+    assert send_pending_emails() == 1
+    assert get_emails()[0].status == EmailStatus.SENT
+    assert server.sent_subjects == ["Email 0", "Email 0"]
+
+
+def test_email_fails_after_max_send_attempts(db_session, mail_server):
+    server = mail_server(refuse_connections=True)
+    enqueue_emails(1)
+    email = get_emails()[0]
+
+    for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+        assert send_pending_emails() == 0
+        email = get_emails()[0]
+        assert email.attempts == attempt
+        make_due(email)
+
+    assert email.status == EmailStatus.FAILED
+    assert "Service not available" in email.last_error
+
+    # A failed email is never attempted again.
+    server.refuse_connections = False
+    assert send_pending_emails() == 0
+    assert get_emails()[0].attempts == MAX_SEND_ATTEMPTS
+    assert server.connections == []
+
+
+def test_concurrent_senders_never_send_an_email_twice(
+    db_session, mail_server, monkeypatch
+):
+    monkeypatch.setattr(email_outbox, "OUTBOX_BATCH_SIZE", 2)
+    batch_locked = threading.Event()
+    release = threading.Event()
+
+    def hold_first_sender(message):
+        # The first sender waits, with its batch locked, until the second one is done.
+        if threading.current_thread() is first_sender:
+            batch_locked.set()
+            release.wait(timeout=30)
+
+    server = mail_server(on_send=hold_first_sender)
+    enqueue_emails(4)
+    results = {}
+    first_sender = threading.Thread(
+        target=lambda: results.setdefault("first", send_pending_emails())
+    )
+    second_sender = threading.Thread(
+        target=lambda: results.setdefault("second", send_pending_emails())
+    )
+    first_sender.start()
+    try:
+        assert batch_locked.wait(timeout=10)
+        second_sender.start()
+        second_sender.join(timeout=10)
+        # The second sender skips the locked emails, instead of waiting for them.
+        second_finished_first = not second_sender.is_alive()
+    finally:
+        release.set()
+        first_sender.join(timeout=10)
+        second_sender.join(timeout=10)
+
+    assert second_finished_first
+    assert results == {"first": 2, "second": 2}
+    assert len(server.connections) == 2
+    assert sorted(server.sent_subjects) == ["Email 0", "Email 1", "Email 2", "Email 3"]
+    assert all(email.status == EmailStatus.SENT for email in get_emails())
@@ -0,0 +1,76 @@
+from sqlalchemy import event
+from config import db
+from models.models import Item
+from conftest import make_user, login
+
+
+def get_items(client, url, etag=None):
+    """Sends a GET request for a page of the item catalog, and records the SQL statements executed to serve it.
+
+    Args:
+        client (FlaskClient): the test client.
+        url (str): the url.
+        etag (str, optional): the entity tag of the client's copy of the page. Defaults to None.
+
+    Returns:
+        tuple: the response, and the statements.
+    """
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    headers = {"If-None-Match": f'W/"{etag}"'} if etag else {}
+    event.listen(db.engine, "before_cursor_execute", record_statement)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record_statement)
+    return response, statements
+
+
+def test_page_etag_depends_only_on_the_items_of_the_page(app, db_session):
+    user = make_user(0)
+    db_session.add(user)
+    db_session.flush()
+    items = [
+        Item(name=f"Item {number}", part_number=f"P{number}", user_id=user.id)
+        for number in range(4)
+    ]
+    db_session.add_all(items)
+    db_session.commit()
+    client = login(app.test_client(), user.id)
+    client.get("/items?limit=2")
+
+    response, statements = get_items(client, "/items?limit=2")
+    etag, _ = response.get_etag()
+    assert response.status_code == 200
+    assert [item["name"] for item in response.json["items"]] == ["Item 0", "Item 1"]
+    # The page is versioned without scanning every item that the user can see.
+    assert len(statements) == 1
+    assert "count(" not in statements[0].lower()
+
+    response, _ = get_items(client, "/items?limit=2", etag)
+    assert response.status_code == 304
+
+    # Changing an item on another page keeps the page current.
+    items[3].part_number = "Q3"
+    db_session.commit()
+    response, _ = get_items(client, "/items?limit=2", etag)
+    assert response.status_code == 304
+
+    # Changing an item of the page does not.
+    items[1].part_number = "Q1"
+    db_session.commit()
+    response, _ = get_items(client, "/items?limit=2", etag)
+    assert response.status_code == 200
+    assert response.json["items"][1]["part_number"] == "Q1"
+    assert response.get_etag()[0] != etag
+
+    # Nor does changing the user who added an item of the page.
+    user.first_name = "Renamed"
+    db_session.commit()
+    etag, _ = response.get_etag()
+    response, _ = get_items(client, "/items?limit=2", etag)
+    assert response.status_code == 200
+    assert response.json["items"][0]["user"]["first_name"] == "Renamed"
@@ -0,0 +1,66 @@
+import datetime
+from config import db
+from models.models import Organization, OrganizationLog
+from helpers import LogEventType
+from log_writer import log_writer
+from log_partitions import (
+    LOG_DEFAULT_PARTITION,
+    get_partition_name,
+    get_log_partitions,
+    create_log_partitions,
+    drop_expired_log_partitions,
+)
+
+
+def count_logs(table):
+    """
+    Returns:
+        int: the number of logs in a partition of organization_logs.
+    """
+    return db.session.scalar(db.text(f"SELECT count(*) FROM {table}"))
+
+
+def drop_partition(day):
+    """Drops the partition of a day, as if it had never been created."""
+    name = get_partition_name(day)
+    db.session.execute(db.text(f"ALTER TABLE organization_logs DETACH PARTITION {name}"))
+    db.session.execute(db.text(f"DROP TABLE {name}"))
+    db.session.commit()
+
+
+def test_logs_without_a_partition_are_kept_and_moved_to_their_partition(db_session):
+    organization = Organization(name="Warehouse")
+    db_session.add(organization)
+    db_session.commit()
+    today = db_session.scalar(db.select(db.func.current_date()))
+    drop_partition(today)
+    last_month = today - datetime.timedelta(days=30)
+
+    # The worker was down, so today's partition was never created.
+    log_writer.write(LogEventType.ORGANIZATION_UPDATED, organization.id, actor="owner")
+    log_writer.stop()
+    db_session.execute(
+        db.insert(OrganizationLog).values(
+            event_type=LogEventType.ASSIGNMENT_UPDATED,
+            organization_id=organization.id,
+            occurrence=last_month,
+        )
+    )
+    db_session.commit()
+    assert count_logs(LOG_DEFAULT_PARTITION) == 2
+
+    created = create_log_partitions()
+
+    assert get_partition_name(today) in created
+    assert get_partition_name(last_month) in created
+    assert today in get_log_partitions()
+    assert count_logs(LOG_DEFAULT_PARTITION) == 0
+    assert count_logs(get_partition_name(today)) == 1
+    assert count_logs(get_partition_name(last_month)) == 1
+    log = OrganizationLog.query.filter(OrganizationLog.occurrence >= today).one()
+    assert log.event_type == LogEventType.ORGANIZATION_UPDATED
+    assert log.params == {"actor": "owner"}
+
+    # The logs that were moved out of the default partition expire like any other.
+    assert get_partition_name(last_month) in drop_expired_log_partitions(7)
+    assert OrganizationLog.query.count() == 1
@@ -0,0 +1,14 @@
+import atexit
+from log_writer import OrganizationLogWriter
+
+
+def test_shutdown_hook_is_registered_once(app, monkeypatch):
+    hooks = []
+    monkeypatch.setattr(atexit, "register", hooks.append)
+    writer = OrganizationLogWriter(app)
+
+    for _ in range(3):
+        writer.start()
+        writer.stop()
+
+    assert hooks == [writer.stop]
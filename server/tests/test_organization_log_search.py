@@ -0,0 +1,169 @@
+import datetime
+import pytest
+from config import db
+from models.models import Organization, OrganizationLog
+from helpers import LogEventType
+from conftest import make_user, login
+
+NOW = datetime.datetime(2026, 10, 10, 12)
+""" The occurrence of the newest searched log. Each of the other logs occurred a day before the previous one. """
+
+LOGS = [
+    (
+        LogEventType.ITEM_ASSIGNED,
+        {"actor": "alice", "item_name": "Blue Widget", "part_number": "W-1"},
+    ),
+    (
+        LogEventType.ITEM_ASSIGNED,
+        {"actor": "bob", "item_name": "Red Bolt", "part_number": "B-1"},
+    ),
+    (
+        LogEventType.MEMBER_ROLE_CHANGED,
+        {"actor": "bob", "username": "alice", "role": "ADMIN"},
+    ),
+    (LogEventType.OWNERSHIP_TRANSFERRED, {"actor": "carol", "new_owner": "bob"}),
+    (
+        LogEventType.ITEM_ASSIGNED,
+        {"actor": "carol", "item_name": "Blue Bolt", "part_number": "B-2"},
+    ),
+    # Mentions alice, but not as a user.
+    (
+        LogEventType.ITEM_CREATED,
+        {"actor": "carol", "item_name": "alice", "part_number": "A-1"},
+    ),
+]
+""" The event type and parameters of the searched logs, newest first. """
+
+
+def day(number):
+    """
+    Returns:
+        str: the ISO date/time a number of days before NOW.
+    """
+    return (NOW - datetime.timedelta(days=number)).isoformat()
+
+
+@pytest.fixture
+def search(app, db_session):
+    """Creates an organization with the logs of LOGS, and another organization whose log matches every search.
+
+    Returns:
+        function: searches the organization's logs with a query string, and returns the response
+        along with the index in LOGS of each log of the page.
+    """
+    owner = make_user(0)
+    organization, other_organization = Organization(name="Warehouse"), Organization(
+        name="Depot"
+    )
+    db_session.add_all([owner, organization, other_organization])
+    db_session.flush()
+    log_ids = db_session.scalars(
+        db.insert(OrganizationLog)
+        .values(
+            [
+                {
+                    "event_type": event_type,
+                    "params": params,
+                    "occurrence": NOW - datetime.timedelta(days=number),
+                    "organization_id": organization.id,
+                }
+                for number, (event_type, params) in enumerate(LOGS)
+            ]
+        )
+        .returning(OrganizationLog.id)
+    ).all()
+    db_session.execute(
+        db.insert(OrganizationLog).values(
+            event_type=LogEventType.ITEM_ASSIGNED,
+            params=LOGS[0][1],
+            occurrence=NOW,
+            organization_id=other_organization.id,
+        )
+    )
+    db_session.commit()
+    client = login(app.test_client(), owner.id)
+
+    def search_logs(query_string):
+        response = client.get(
+            f"/organizations/{organization.id}/logs/search", query_string=query_string
+        )
+        if response.status_code != 200:
+            return response, None
+        return response, [log_ids.index(log["id"]) for log in response.json["logs"]]
+
+    return search_logs
+
+
+@pytest.mark.parametrize(
+    "query_string, expected",
+    [
+        ({"q": "widget"}, [0]),
+        ({"q": "blue"}, [0, 4]),
+        ({"q": '"blue widget"'}, [0]),
+        ({"q": "blue -widget"}, [4]),
+        ({"username": "alice"}, [0, 2]),
+        ({"username": "bob"}, [1, 2, 3]),
+        ({"event_type": LogEventType.ITEM_ASSIGNED}, [0, 1, 4]),
+        (
+            {
+                "event_type": [
+                    LogEventType.ITEM_ASSIGNED,
+                    LogEventType.OWNERSHIP_TRANSFERRED,
+                ]
+            },
+            [0, 1, 3, 4],
+        ),
+        # From is inclusive and to is exclusive.
+        ({"from": day(3), "to": day(0)}, [1, 2, 3]),
+        ({"from": day(5)}, [0, 1, 2, 3, 4, 5]),
+        ({"q": "bolt", "username": "carol"}, [4]),
+        ({"username": "bob", "event_type": LogEventType.ITEM_ASSIGNED}, [1]),
+        ({"q": "bolt", "from": day(3)}, [1]),
+        ({"q": "nothing"}, []),
+    ],
+)
+def test_search_filters_the_organization_logs(search, query_string, expected):
+    response, logs = search(query_string)
+
+    assert response.status_code == 200
+    assert logs == expected
+    assert response.json["next_cursor"] is None
+
+
+@pytest.mark.parametrize(
+    "query_string, message",
+    [
+        ({"event_type": "assigned"}, "Invalid event type."),
+        ({"event_type": 99}, "Invalid event type."),
+        ({"from": "yesterday"}, "Invalid date range. Dates must be in ISO format."),
+    ],
+)
+def test_invalid_search_is_rejected(search, query_string, message):
+    response, _ = search(query_string)
+
+    assert response.status_code == 400
+    assert response.json == {"message": message}
+
+
+@pytest.mark.parametrize(
+    "query_string, expected",
+    [
+        ({"username": "bob"}, [1, 2, 3]),
+        ({"from": day(5)}, [0, 1, 2, 3, 4, 5]),
+    ],
+)
+def test_search_results_are_paged_with_cursors(search, query_string, expected):
+    pages = []
+    cursor = None
+
+    while True:
+        response, logs = search(
+            {**query_string, "limit": 2, **({"before": cursor} if cursor else {})}
+        )
+        assert response.status_code == 200
+        pages.append(logs)
+        if not (cursor := response.json["next_cursor"]):
+            break
+
+    assert [log for page in pages for log in page] == expected
+    assert all(len(page) == 2 for page in pages[:-1])
@@ -0,0 +1,114 @@
+from sqlalchemy import event
+from config import db
+from models.models import Organization, Membership, Item, Assignment, Request
+from helpers import RoleType
+from conftest import make_user, login
+
+
+def create_organization(name, owner, size, first_user_number):
+    """Creates an organization with size members, size assigned items (each added by a different
+    user) and size pending requests, besides its owner.
+
+    Args:
+        name (str): the name of the organization.
+        owner (User): the owner of the organization.
+        size (int): the number of members, assigned items and requests.
+        first_user_number (int): the number of the first user created for the organization.
+
+    Returns:
+        int: the organization id.
+    """
+    organization = Organization(name=name)
+    db.session.add(organization)
+    db.session.flush()
+    db.session.add(
+        Membership(
+            user_id=owner.id, organization_id=organization.id, role=RoleType.OWNER
+        )
+    )
+    users = [make_user(first_user_number + number) for number in range(3 * size)]
+    db.session.add_all(users)
+    db.session.flush()
+    members, item_owners, requesters = (
+        users[:size],
+        users[size : 2 * size],
+        users[2 * size :],
+    )
+    items = [
+        Item(name=f"{name} Item {number}", part_number=f"P{number}", user_id=user.id)
+        for number, user in enumerate(item_owners)
+    ]
+    db.session.add_all(items)
+    db.session.flush()
+    db.session.add_all(
+        [
+            Membership(
+                user_id=user.id,
+                organization_id=organization.id,
+                role=RoleType.REGULAR,
+            )
+            for user in members
+        ]
+        + [
+            Assignment(
+                item_id=item.id,
+                organization_id=organization.id,
+                current_quantity=number,
+                enough_threshold=1,
+            )
+            for number, item in enumerate(items)
+        ]
+        + [
+            Request(user_id=user.id, organization_id=organization.id)
+            for user in requesters
+        ]
+    )
+    db.session.commit()
+    return organization.id
+
+
+def count_queries(client, url):
+    """Counts the SQL statements executed while serving a GET request.
+
+    Args:
+        client (FlaskClient): the test client.
+        url (str): the url.
+
+    Returns:
+        tuple: the response, and the number of statements.
+    """
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record_statement)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record_statement)
+    return response, len(statements)
+
+
+def test_organization_query_count_does_not_depend_on_its_size(app, db_session):
+    owner = make_user(0)
+    db_session.add(owner)
+    db_session.commit()
+    small_id = create_organization("Small", owner, 1, first_user_number=1)
+    large_id = create_organization("Large", owner, 40, first_user_number=100)
+    client = login(app.test_client(), owner.id)
+    # The first request of a session also loads the identity of the user.
+    client.get(f"/organizations/{small_id}")
+
+    small_response, small_count = count_queries(client, f"/organizations/{small_id}")
+    large_response, large_count = count_queries(client, f"/organizations/{large_id}")
+
+    assert small_response.status_code == 200
+    assert large_response.status_code == 200
+    assert len(small_response.json["assignments"]) == 1
+    assert len(large_response.json["assignments"]) == 40
+    assert len(large_response.json["memberships"]) == 41
+    assert len(large_response.json["requests"]) == 40
+    assert all(a["item"]["user"] for a in large_response.json["assignments"])
+    assert small_count == large_count
+    assert large_count <= 6
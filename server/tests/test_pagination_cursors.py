@@ -0,0 +1,77 @@
+import pytest
+from models.models import Organization, Membership, Item
+from helpers import RoleType, encode_cursor
+from conftest import make_user, login
+
+TAMPERED_CURSORS = [
+    "not a cursor",
+    encode_cursor("2026-01-01T00:00:00"),
+    encode_cursor("2026-01-01T00:00:00", "x"),
+    encode_cursor("2026-01-01T00:00:00", None),
+    encode_cursor("2026-01-01T00:00:00", True),
+    encode_cursor("2026-01-01T00:00:00", [1]),
+    encode_cursor(5, 1),
+    encode_cursor(None, 1),
+]
+"""
+Cursors that a client could send instead of a next_cursor: undecodable, of the wrong size, or with
+sort key values of the wrong types.
+"""
+
+
+@pytest.fixture
+def pages(app, db_session):
+    """Creates an organization, with two items and a log feed, and a user with two memberships.
+
+    Returns:
+        tuple: a client logged in as the user, and the url of each paginated endpoint, with the name of its cursor parameter.
+    """
+    user = make_user(0)
+    organizations = [Organization(name="Depot"), Organization(name="Warehouse")]
+    db_session.add_all([user, *organizations])
+    db_session.flush()
+    db_session.add_all(
+        [
+            Item(name=f"Item {number}", part_number=f"P{number}", user_id=user.id)
+            for number in range(2)
+        ]
+        + [
+            Membership(
+                user_id=user.id, organization_id=organization.id, role=RoleType.OWNER
+            )
+            for organization in organizations
+        ]
+    )
+    db_session.commit()
+    client = login(app.test_client(), user.id)
+    return client, {
+        "items": "/items?limit=1&cursor=",
+        "memberships": "/current_user/memberships?limit=1&cursor=",
+        "logs": f"/organizations/{organizations[0].id}/logs?before=",
+    }
+
+
+@pytest.mark.parametrize("endpoint", ["items", "memberships", "logs"])
+@pytest.mark.parametrize("cursor", TAMPERED_CURSORS)
+def test_tampered_cursor_is_rejected(pages, endpoint, cursor):
+    client, urls = pages
+
+    response = client.get(urls[endpoint] + cursor)
+
+    assert response.status_code == 400
+    assert response.json == {"message": "Invalid pagination cursor."}
+
+
+@pytest.mark.parametrize(
+    "endpoint, records",
+    [("items", "items"), ("memberships", "memberships")],
+)
+def test_next_cursor_is_accepted(pages, endpoint, records):
+    client, urls = pages
+
+    first_page = client.get(urls[endpoint])
+    second_page = client.get(urls[endpoint] + first_page.json["next_cursor"])
+
+    assert second_page.status_code == 200
+    assert len(second_page.json[records]) == 1
+    assert second_page.json[records] != first_page.json[records]
@@ -0,0 +1,154 @@
+from sqlalchemy import event
+from config import db
+from models.models import (
+    Organization,
+    Membership,
+    Item,
+    Assignment,
+    Request,
+    OutboxEmail,
+)
+from helpers import RoleType
+from purge import purge_in_batches
+from maintenance import delete_orphaned_records
+from conftest import make_user
+
+
+def add_emails(db_session, subjects):
+    """Adds an outbox email for each subject, and commits them."""
+    db_session.add_all(
+        [
+            OutboxEmail(subject=subject, recipients=["a@example.com"], html="")
+            for subject in subjects
+        ]
+    )
+    db_session.commit()
+
+
+def get_subjects():
+    """
+    Returns:
+        list: the subjects of the emails left, in id order.
+    """
+    db.session.expire_all()
+    return [email.subject for email in OutboxEmail.query.order_by(OutboxEmail.id)]
+
+
+def count_deleted_rows():
+    """Records the number of rows deleted by each DELETE statement on outbox_emails, until stopped.
+
+    Returns:
+        tuple: the list that the counts are appended to, and a function that stops recording.
+    """
+    counts = []
+
+    def record_delete(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM outbox_emails"):
+            counts.append(cursor.rowcount)
+
+    event.listen(db.engine, "after_cursor_execute", record_delete)
+    return counts, lambda: event.remove(
+        db.engine, "after_cursor_execute", record_delete
+    )
+
+
+def test_purge_deletes_matching_rows_in_batches(app, db_session):
+    add_emails(db_session, [f"{kind} {n}" for n in range(12) for kind in ("old", "new")])
+    deleted_counts, stop_recording = count_deleted_rows()
+
+    try:
+        progress = purge_in_batches(
+            OutboxEmail, OutboxEmail.subject.startswith("old"), batch_size=5
+        )
+    finally:
+        stop_recording()
+
+    assert deleted_counts == [5, 5, 2]
+    assert progress.is_complete
+    assert (progress.deleted, progress.batches) == (12, 3)
+    assert get_subjects() == [f"new {n}" for n in range(12)]
+
+
+def test_purge_stops_at_time_budget_and_resumes(app, db_session):
+    add_emails(db_session, [f"old {n}" for n in range(12)] + ["new"])
+
+    # No time is left after the first batch.
+    progress = purge_in_batches(
+        OutboxEmail, OutboxEmail.subject.startswith("old"), batch_size=5, time_budget=0
+    )
+    assert not progress.is_complete
+    assert (progress.deleted, progress.batches) == (5, 1)
+    assert get_subjects() == [f"old {n}" for n in range(5, 12)] + ["new"]
+
+    # The next purge resumes with the rows that are left.
+    progress = purge_in_batches(
+        OutboxEmail, OutboxEmail.subject.startswith("old"), batch_size=5
+    )
+    assert progress.is_complete
+    assert progress.deleted == 7
+    assert get_subjects() == ["new"]
+
+
+def test_delete_orphaned_records_keeps_valid_records(app, db_session):
+    owner, requester = make_user(0), make_user(1)
+    organization = Organization(name="Warehouse")
+    db_session.add_all([owner, requester, organization])
+    db_session.flush()
+    item = Item(name="Widget", part_number="W-1", user_id=owner.id)
+    db_session.add(item)
+    db_session.add(
+        Membership(
+            user_id=owner.id, organization_id=organization.id, role=RoleType.OWNER
+        )
+    )
+    db_session.flush()
+    valid = [
+        Assignment(
+            item_id=item.id,
+            organization_id=organization.id,
+            current_quantity=1,
+            enough_threshold=1,
+        ),
+        Request(user_id=requester.id, organization_id=organization.id),
+    ]
+    db_session.add_all(valid)
+    db_session.flush()
+    # Rows left behind by past partial failures: null foreign keys, and foreign keys to deleted rows,
+    # which can only exist in a database that was written before its constraints were added.
+    db_session.execute(db.text("SET LOCAL session_replication_role = replica"))
+    db_session.execute(
+        db.text(
+            """
+            INSERT INTO assignments (current_quantity, enough_threshold, item_id, organization_id)
+            VALUES (1, 1, NULL, :organization_id), (1, 1, :item_id, 999999);
+            INSERT INTO memberships (role, user_id, organization_id)
+            VALUES ('REGULAR', NULL, :organization_id), ('REGULAR', 999999, :organization_id);
+            INSERT INTO requests (reason_to_join, user_id, organization_id)
+            VALUES ('Reason', 999999, :organization_id), ('Reason', :user_id, 999999);
+            """
+        ),
+        {
+            "organization_id": organization.id,
+            "item_id": item.id,
+            "user_id": requester.id,
+        },
+    )
+    db_session.commit()
+    valid_ids = {
+        Assignment: {valid[0].id},
+        Request: {valid[1].id},
+        Membership: {
+            db_session.scalar(
+                db.select(Membership.id).filter(Membership.user_id == owner.id)
+            )
+        },
+    }
+
+    for model, ids in valid_ids.items():
+        assert db_session.scalar(db.select(db.func.count(model.id))) == len(ids) + 2
+
+    delete_orphaned_records()
+
+    db_session.expire_all()
+    for model, ids in valid_ids.items():
+        assert set(db_session.scalars(db.select(model.id))) == ids
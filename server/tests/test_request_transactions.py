@@ -0,0 +1,150 @@
+import threading
+import pytest
+from sqlalchemy import event
+from config import db
+from models.models import Organization, Membership, Item, Assignment, Request
+from helpers import RoleType
+from conftest import make_user, login
+
+
+def create_organization(db_session):
+    """Creates an organization with an owner and an admin, an item assigned to it, and a pending request.
+
+    Returns:
+        dict: the ids of the records.
+    """
+    owner, admin, requester = make_user(0), make_user(1), make_user(2)
+    organization = Organization(name="Warehouse")
+    db_session.add_all([owner, admin, requester, organization])
+    db_session.flush()
+    item = Item(name="Widget", part_number="W-1", user_id=owner.id)
+    db_session.add(item)
+    db_session.add(
+        Membership(
+            user_id=owner.id, organization_id=organization.id, role=RoleType.OWNER
+        )
+    )
+    db_session.flush()
+    admin_membership = Membership(
+        user_id=admin.id, organization_id=organization.id, role=RoleType.ADMIN
+    )
+    pending_request = Request(user_id=requester.id, organization_id=organization.id)
+    db_session.add_all(
+        [
+            admin_membership,
+            pending_request,
+            Assignment(
+                item_id=item.id,
+                organization_id=organization.id,
+                current_quantity=5,
+                enough_threshold=1,
+            ),
+        ]
+    )
+    db_session.commit()
+    return {
+        "owner": owner.id,
+        "organization": organization.id,
+        "item": item.id,
+        "admin_membership": admin_membership.id,
+        "request": pending_request.id,
+    }
+
+
+def count_commits(send_request):
+    """Counts the transactions committed while serving a request. Only the commits of the current
+    thread are counted, and not those of the log writer.
+
+    Args:
+        send_request (function): sends the request, and returns its response.
+
+    Returns:
+        tuple: the response, and the number of commits.
+    """
+    commits = []
+    thread_id = threading.get_ident()
+
+    def record_commit(connection):
+        if threading.get_ident() == thread_id:
+            commits.append(connection)
+
+    event.listen(db.engine, "commit", record_commit)
+    try:
+        response = send_request()
+    finally:
+        event.remove(db.engine, "commit", record_commit)
+    return response, len(commits)
+
+
+WRITE_REQUESTS = {
+    "AddItemAndAssignment.post": lambda client, ids: client.post(
+        "/add_new_item",
+        json={
+            "name": "Gadget",
+            "part_number": "G-1",
+            "is_public": True,
+            "organization_id": ids["organization"],
+            "current_quantity": 3,
+            "enough_threshold": 1,
+        },
+    ),
+    "OrganizationCreator.post": lambda client, ids: client.post(
+        "/organizations", json={"name": "Depot"}
+    ),
+    "AcceptRequest.post": lambda client, ids: client.post(
+        "/accept_request", json={"request_id": ids["request"]}
+    ),
+    "TransferOwnership.patch": lambda client, ids: client.patch(
+        f"/transfer_ownership/{ids['organization']}",
+        json={"admin_id": ids["admin_membership"]},
+    ),
+    "ItemById.delete": lambda client, ids: client.delete(f"/items/{ids['item']}"),
+}
+"""
+Mapping of the write endpoints that make several changes to functions that send a request to them.
+"""
+
+
+@pytest.mark.parametrize("endpoint", WRITE_REQUESTS)
+def test_write_request_is_committed_once(app, db_session, endpoint):
+    ids = create_organization(db_session)
+    client = login(app.test_client(), ids["owner"])
+
+    response, commits = count_commits(lambda: WRITE_REQUESTS[endpoint](client, ids))
+
+    assert 200 <= response.status_code < 300, response.json
+    assert commits == 1
+
+
+@pytest.mark.parametrize(
+    "assignment",
+    [
+        # Rejected by a validator.
+        {"current_quantity": -1, "enough_threshold": 1},
+        # Rejected by the database.
+        {"organization_id": 0, "current_quantity": 1, "enough_threshold": 1},
+    ],
+    ids=["invalid-quantity", "missing-organization"],
+)
+def test_failed_assignment_leaves_no_item_behind(app, db_session, assignment):
+    ids = create_organization(db_session)
+    client = login(app.test_client(), ids["owner"])
+
+    response, commits = count_commits(
+        lambda: client.post(
+            "/add_new_item",
+            json={
+                "name": "Gadget",
+                "part_number": "G-1",
+                "is_public": True,
+                "organization_id": ids["organization"],
+                **assignment,
+            },
+        )
+    )
+
+    assert response.status_code == 422
+    assert commits == 0
+    db.session.expire_all()
+    assert Item.query.filter_by(name="Gadget").first() is None
+    assert Assignment.query.count() == 1
@@ -0,0 +1,142 @@
+import pytest
+from sqlalchemy_serializer import SerializerMixin
+from config import app, db
+from models.models import (
+    User,
+    Organization,
+    Membership,
+    Item,
+    Assignment,
+    Request,
+    OrganizationLog,
+    OutboxEmail,
+    Job,
+)
+from helpers import RoleType, LogEventType
+from resources.user_resource import SESSION_PROFILE_FIELDS
+from conftest import make_user
+
+SERIALIZATION_CASES = [
+    (User, (), ()),
+    (User, SESSION_PROFILE_FIELDS, ()),
+    (User, (), ("-memberships", "items.id")),
+    (Organization, (), ()),
+    (Organization, ("id", "name", "description", "image_url", "created_at"), ()),
+    (Organization, (), ("-requests", "-memberships.user.email")),
+    (Membership, (), ()),
+    (Membership, ("id", "role", "joined_at", "user_id", "organization_id"), ()),
+    (Membership, ("id", "user.username", "organization.name"), ()),
+    (Item, (), ()),
+    (Item, ("id", "name", "part_number", "image_url", "user_id"), ()),
+    (Item, (), ("-user.email", "assignments.current_quantity")),
+    (Assignment, (), ()),
+    (Assignment, ("id", "current_quantity", "last_updated"), ()),
+    (Assignment, (), ("-item.user", "organization.name")),
+    (Request, (), ()),
+    (
+        Request,
+        (
+            "id",
+            "user_id",
+            "user.username",
+            "organization_id",
+            "reason_to_join",
+            "submitted_at",
+            "organization.name",
+        ),
+        (),
+    ),
+    (OrganizationLog, (), ()),
+    (
+        OrganizationLog,
+        ("id", "event_type", "contents", "occurrence", "organization_id"),
+        (),
+    ),
+    (OutboxEmail, (), ()),
+    (Job, (), ()),
+]
+"""
+The (model, only, rules) combinations that are compared: the default serialization of every model,
+those that the resources request, and nested rules.
+"""
+
+
+@pytest.fixture
+def records(db_session):
+    """Creates an organization with an owner, a member, an item added by each, their assignments,
+    a pending request and a log, along with an outbox email and a job.
+
+    Returns:
+        dict: the first record of each model.
+    """
+    owner, member, requester = make_user(0), make_user(1), make_user(2)
+    organization = Organization(name="Warehouse", description="Main warehouse")
+    db_session.add_all([owner, member, requester, organization])
+    db_session.flush()
+    items = [
+        Item(name="Widget", part_number="W-1", user_id=owner.id),
+        Item(name="Gadget", part_number="G-1", is_public=False, user_id=member.id),
+    ]
+    db_session.add_all(items)
+    db_session.add(
+        Membership(
+            user_id=owner.id, organization_id=organization.id, role=RoleType.OWNER
+        )
+    )
+    db_session.flush()
+    db_session.add_all(
+        [
+            Membership(
+                user_id=member.id,
+                organization_id=organization.id,
+                role=RoleType.REGULAR,
+            ),
+            Request(user_id=requester.id, organization_id=organization.id),
+            OrganizationLog(
+                event_type=LogEventType.ITEM_CREATED,
+                params=OrganizationLog.get_params(
+                    {"item_name": "Widget", "part_number": "W-1"}, owner.username
+                ),
+                organization_id=organization.id,
+            ),
+            OutboxEmail(
+                subject="Welcome", recipients=[owner.email], html="<p>Welcome</p>"
+            ),
+            Job(name="delete_old_logs"),
+        ]
+        + [
+            Assignment(
+                item_id=item.id,
+                organization_id=organization.id,
+                current_quantity=5,
+                enough_threshold=2,
+            )
+            for item in items
+        ]
+    )
+    db_session.commit()
+    db_session.expire_all()
+    return {
+        model: model.query.order_by(model.id).first()
+        for model, _, _ in SERIALIZATION_CASES
+    }
+
+
+@pytest.mark.parametrize(
+    "model, only, rules",
+    SERIALIZATION_CASES,
+    ids=[
+        f"{model.__name__}-{'only' if only else 'rules' if rules else 'default'}"
+        for model, only, rules in SERIALIZATION_CASES
+    ],
+)
+def test_compiled_serializer_matches_serializer_mixin(records, model, only, rules):
+    record = records[model]
+
+    compiled = record.to_dict(only=only, rules=rules)
+    expected = SerializerMixin.to_dict(record, only=only, rules=rules)
+
+    assert compiled == expected
+    # The responses are byte for byte the same, key order included.
+    assert list(compiled) == list(expected)
+    assert app.json.dumps(compiled) == app.json.dumps(expected)
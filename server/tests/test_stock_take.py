@@ -0,0 +1,232 @@
+import pytest
+from sqlalchemy import event
+from config import db
+from models.models import Organization, Membership, Item, Assignment, OrganizationLog
+from helpers import RoleType, LogEventType
+from log_writer import log_writer
+from conftest import make_user, login
+
+QUANTITIES = {"Bolt": 5, "Nut": 3, "Washer": 7}
+""" The current quantities of the items assigned to the counted organization, by item name. """
+
+
+@pytest.fixture
+def stock(app, db_session):
+    """Creates an organization with the items of QUANTITIES assigned to it, and another organization
+    with an item of its own.
+
+    Returns:
+        tuple: a client logged in as the organization's owner, the organization id, the assignment ids
+        by item name, and the id of the other organization's assignment.
+    """
+    owner, other_owner = make_user(0), make_user(1)
+    organization, other_organization = Organization(name="Warehouse"), Organization(
+        name="Depot"
+    )
+    db_session.add_all([owner, other_owner, organization, other_organization])
+    db_session.flush()
+    items = {
+        name: Item(name=name, part_number=f"{name[0]}-1", user_id=owner.id)
+        for name in [*QUANTITIES, "Screw"]
+    }
+    db_session.add_all(items.values())
+    db_session.add_all(
+        [
+            Membership(
+                user_id=owner.id, organization_id=organization.id, role=RoleType.OWNER
+            ),
+            Membership(
+                user_id=other_owner.id,
+                organization_id=other_organization.id,
+                role=RoleType.OWNER,
+            ),
+        ]
+    )
+    db_session.flush()
+    assignments = {
+        name: Assignment(
+            item_id=items[name].id,
+            organization_id=organization.id,
+            current_quantity=quantity,
+            enough_threshold=1,
+        )
+        for name, quantity in QUANTITIES.items()
+    }
+    other_assignment = Assignment(
+        item_id=items["Screw"].id,
+        organization_id=other_organization.id,
+        current_quantity=4,
+        enough_threshold=1,
+    )
+    db_session.add_all([*assignments.values(), other_assignment])
+    db_session.commit()
+    client = login(app.test_client(), owner.id)
+    return (
+        client,
+        organization.id,
+        {name: assignment.id for name, assignment in assignments.items()},
+        other_assignment.id,
+    )
+
+
+def get_assignments():
+    """
+    Returns:
+        dict: the (current quantity, last update) of every assignment, by id.
+    """
+    db.session.expire_all()
+    return {
+        assignment.id: (assignment.current_quantity, assignment.last_updated)
+        for assignment in Assignment.query
+    }
+
+
+def get_logs():
+    """Writes the queued logs, then reads them.
+
+    Returns:
+        list: the logs.
+    """
+    log_writer.stop()
+    db.session.expire_all()
+    return OrganizationLog.query.all()
+
+
+def count_updates(send_request):
+    """Counts the UPDATE statements on assignments executed while serving a request.
+
+    Args:
+        send_request (function): sends the request, and returns its response.
+
+    Returns:
+        tuple: the response, and the number of statements.
+    """
+    updates = []
+
+    def record_update(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE assignments"):
+            updates.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record_update)
+    try:
+        response = send_request()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record_update)
+    return response, len(updates)
+
+
+def test_stock_take_updates_only_changed_assignments(stock):
+    client, organization_id, ids, _ = stock
+    before = get_assignments()
+
+    response, updates = count_updates(
+        lambda: client.post(
+            f"/organizations/{organization_id}/stock_take",
+            json={
+                "counts": {
+                    ids["Bolt"]: 5,
+                    ids["Nut"]: 1,
+                    ids["Washer"]: 9,
+                }
+            },
+        )
+    )
+
+    assert response.status_code == 200
+    assert updates == 1
+    assert {
+        assignment["id"]: assignment["current_quantity"]
+        for assignment in response.json["assignments"]
+    } == {ids["Nut"]: 1, ids["Washer"]: 9}
+    after = get_assignments()
+    assert after[ids["Bolt"]] == before[ids["Bolt"]] == (5, None)
+    assert after[ids["Nut"]][0] == 1 and after[ids["Nut"]][1]
+    assert after[ids["Washer"]][0] == 9 and after[ids["Washer"]][1]
+
+    (log,) = get_logs()
+    assert (log.event_type, log.organization_id) == (
+        LogEventType.STOCK_TAKEN,
+        organization_id,
+    )
+    assert log.params == {
+        "actor": "user0",
+        "items_counted": 3,
+        "changes": [
+            {"item_name": "Nut", "part_number": "N-1", "previous": 3, "counted": 1},
+            {
+                "item_name": "Washer",
+                "part_number": "W-1",
+                "previous": 7,
+                "counted": 9,
+            },
+        ],
+    }
+    assert log.contents[2:] == [
+        "Nut (Part #: N-1): 3 -> 1 (-2)",
+        "Washer (Part #: W-1): 7 -> 9 (+2)",
+    ]
+
+
+def test_stock_take_without_changes_is_logged_without_an_update(stock):
+    client, organization_id, ids, _ = stock
+    before = get_assignments()
+
+    response, updates = count_updates(
+        lambda: client.post(
+            f"/organizations/{organization_id}/stock_take",
+            json={
+                "counts": {ids[name]: quantity for name, quantity in QUANTITIES.items()}
+            },
+        )
+    )
+
+    assert response.status_code == 200
+    assert response.json == {"assignments": []}
+    assert updates == 0
+    assert get_assignments() == before
+    (log,) = get_logs()
+    assert (log.params["items_counted"], log.params["changes"]) == (3, [])
+
+
+@pytest.mark.parametrize(
+    "get_counts, message",
+    [
+        (
+            lambda ids, other_id: {ids["Nut"]: 1, ids["Washer"]: -1},
+            "counts - Item counts must be non-negative integers.",
+        ),
+        (
+            lambda ids, other_id: {ids["Nut"]: 1.5},
+            "counts - Item counts must be non-negative integers.",
+        ),
+        (
+            lambda ids, other_id: {ids["Nut"]: 1, other_id: 0},
+            "Assignments [{other_id}] do not belong to this organization.",
+        ),
+        (
+            lambda ids, other_id: {ids["Nut"]: 1, 999999: 0},
+            "Assignments [999999] do not belong to this organization.",
+        ),
+        (lambda ids, other_id: {}, "counts - At least one item must be counted."),
+    ],
+    ids=[
+        "negative",
+        "not-an-integer",
+        "other-organization",
+        "missing",
+        "empty",
+    ],
+)
+def test_rejected_stock_take_changes_nothing(stock, get_counts, message):
+    client, organization_id, ids, other_id = stock
+    before = get_assignments()
+
+    response = client.post(
+        f"/organizations/{organization_id}/stock_take",
+        json={"counts": get_counts(ids, other_id)},
+    )
+
+    assert response.status_code == 422
+    assert response.json == {"message": message.format(other_id=other_id)}
+    assert get_assignments() == before
+    assert get_logs() == []
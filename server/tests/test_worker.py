@@ -0,0 +1,207 @@
+import datetime
+import threading
+import pytest
+from config import db
+from models.job import Job
+from helpers import JobStatus
+import jobs
+from jobs import schedule_recurring_jobs
+from worker import Worker, JOB_RETRY_BACKOFF_SECONDS, JOB_LOCK_TIMEOUT
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    """Registers the jobs that the tests run: "succeed", which records its arguments, and "fail",
+    which always raises.
+
+    Returns:
+        list: the arguments of every run of "succeed".
+    """
+    runs = []
+
+    def fail():
+        raise RuntimeError("Handler failed")
+
+    monkeypatch.setitem(jobs.JOB_HANDLERS, "succeed", lambda **args: runs.append(args))
+    monkeypatch.setitem(jobs.JOB_HANDLERS, "fail", fail)
+    return runs
+
+
+def make_worker(name):
+    """
+    Returns:
+        Worker: a worker with a given name, since the workers of a test share a host and process.
+    """
+    worker = Worker()
+    worker.name = name
+    return worker
+
+
+def add_jobs(db_session, *jobs_to_add):
+    """Adds jobs to the jobs table, and commits them.
+
+    Returns:
+        list: the ids of the jobs.
+    """
+    db_session.add_all(jobs_to_add)
+    db_session.commit()
+    return [job.id for job in jobs_to_add]
+
+
+def get_job(id):
+    """
+    Returns:
+        Job: a job, as it is in the database.
+    """
+    db.session.expire_all()
+    return db.session.get(Job, id)
+
+
+def seconds_until_due(id):
+    """
+    Returns:
+        float: the number of seconds from now until a job is due.
+    """
+    return db.session.scalar(
+        db.select(db.func.extract("epoch", Job.run_at - db.func.now())).filter(
+            Job.id == id
+        )
+    )
+
+
+def make_due(id):
+    """Makes a job due now."""
+    Job.query.filter(Job.id == id).update({"run_at": db.func.now()})
+    db.session.commit()
+
+
+def test_claim_skips_jobs_locked_by_another_worker(app, db_session):
+    first_id, second_id = add_jobs(db_session, Job(name="succeed"), Job(name="succeed"))
+
+    claimed = {}
+
+    def claim():
+        with app.app_context():
+            job = make_worker("second").claim_job()
+            claimed["job"] = (job.id, job.status, job.attempts, job.locked_by)
+
+    # Another worker is in the middle of claiming the first job.
+    with db.engine.connect() as connection, connection.begin():
+        connection.execute(
+            db.select(Job.id).filter(Job.id == first_id).with_for_update()
+        )
+        claimer = threading.Thread(target=claim)
+        claimer.start()
+        claimer.join(timeout=10)
+        # The claim skips the locked job, instead of waiting for it.
+        claimed_while_locked = not claimer.is_alive()
+    claimer.join(timeout=10)
+
+    assert claimed_while_locked
+    assert claimed["job"] == (second_id, JobStatus.RUNNING, 1, "second")
+    assert get_job(first_id).status == JobStatus.PENDING
+
+
+def test_concurrent_workers_never_claim_a_job_twice(app, db_session, handlers):
+    job_ids = add_jobs(
+        db_session, *(Job(name="succeed", args={"n": n}) for n in range(30))
+    )
+    claims = {}
+    lock = threading.Lock()
+    start = threading.Barrier(3)
+
+    def work(name):
+        worker = make_worker(name)
+        with app.app_context():
+            start.wait()
+            while job := worker.claim_job():
+                with lock:
+                    claims.setdefault(job.id, []).append(name)
+                worker.run_job(job)
+
+    threads = [threading.Thread(target=work, args=(f"worker{n}",)) for n in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert sorted(claims) == job_ids
+    assert all(len(names) == 1 for names in claims.values())
+    assert sorted(run["n"] for run in handlers) == list(range(30))
+    db.session.expire_all()
+    assert {job.status for job in Job.query} == {JobStatus.SUCCEEDED}
+
+
+def test_failed_job_is_retried_with_backoff_until_max_attempts(
+    app, db_session, handlers
+):
+    (id,) = add_jobs(db_session, Job(name="fail", max_attempts=3))
+    worker = make_worker("worker")
+
+    for attempt in (1, 2):
+        worker.run_job(worker.claim_job())
+        job = get_job(id)
+        assert (job.status, job.attempts) == (JobStatus.PENDING, attempt)
+        assert job.last_error == "Handler failed"
+        assert job.locked_by is None
+        # The delay doubles after every attempt.
+        delay = JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+        assert delay - 5 < seconds_until_due(id) <= delay
+        # The job is not retried before its backoff is over.
+        assert worker.claim_job() is None
+        make_due(id)
+
+    worker.run_job(worker.claim_job())
+    job = get_job(id)
+    assert (job.status, job.attempts) == (JobStatus.FAILED, 3)
+    assert job.finished_at
+    make_due(id)
+    assert worker.claim_job() is None
+
+
+def test_recurring_job_stays_pending(app, db_session, handlers, monkeypatch):
+    monkeypatch.setattr(jobs, "RECURRING_JOBS", {"succeed": 3600, "fail": 600})
+    worker = make_worker("worker")
+
+    # Scheduling again, as every worker does when it starts, adds no row.
+    schedule_recurring_jobs()
+    monkeypatch.setitem(jobs.RECURRING_JOBS, "succeed", 7200)
+    schedule_recurring_jobs()
+    db.session.expire_all()
+    recurring = {job.name: job for job in Job.query}
+    assert sorted(recurring) == ["fail", "succeed"]
+    assert recurring["succeed"].interval_seconds == 7200
+
+    # A successful run is due again after its interval.
+    worker.run_job(worker.claim_job())
+    job = get_job(recurring["succeed"].id)
+    assert (job.status, job.attempts, job.finished_at) == (JobStatus.PENDING, 0, None)
+    assert 7200 - 5 < seconds_until_due(job.id) <= 7200
+
+    # A recurring job that keeps failing is never given up on.
+    id = recurring["fail"].id
+    for _ in range(get_job(id).max_attempts):
+        make_due(id)
+        worker.run_job(worker.claim_job())
+    job = get_job(id)
+    assert (job.status, job.attempts) == (JobStatus.PENDING, 0)
+    assert 600 - 5 < seconds_until_due(id) <= 600
+
+
+def test_abandoned_jobs_are_released(app, db_session):
+    abandoned_id, running_id = add_jobs(
+        db_session,
+        Job(name="succeed", status=JobStatus.RUNNING, attempts=1, locked_by="crashed"),
+        Job(name="succeed", status=JobStatus.RUNNING, attempts=1, locked_by="alive"),
+    )
+    Job.query.filter(Job.id == abandoned_id).update(
+        {"locked_at": db.func.now() - datetime.timedelta(seconds=JOB_LOCK_TIMEOUT + 60)}
+    )
+    Job.query.filter(Job.id == running_id).update({"locked_at": db.func.now()})
+    db_session.commit()
+
+    make_worker("worker").release_abandoned_jobs()
+
+    abandoned, running = get_job(abandoned_id), get_job(running_id)
+    assert (abandoned.status, abandoned.locked_by) == (JobStatus.PENDING, None)
+    assert (running.status, running.locked_by) == (JobStatus.RUNNING, "alive")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+import datetime
+import os
+import signal
+import socket
+import time
+from config import app, db
+from models.job import Job
+from helpers import JobStatus
+from jobs import JOB_HANDLERS, schedule_recurring_jobs
+
+# Modules whose jobs are registered with the worker.
+import email_outbox
+import maintenance
+
+# Background worker. Runs the jobs of the jobs table, so that web workers never do.
+# Run from the server directory, like the web app: python worker.py
+# Any number of workers can run at once; each job is only ever claimed by one of them.
+
+WORKER_POLL_INTERVAL = 1
+""" The time, in seconds, that the worker waits before checking again when no job is due. """
+
+JOB_LOCK_TIMEOUT = 3600
+""" The time, in seconds, after which a running job is considered abandoned (i.e. its worker crashed) and is retried. """
+
+JOB_RELEASE_INTERVAL = 60
+""" The interval, in seconds, at which abandoned jobs are looked for. """
+
+JOB_RETRY_BACKOFF_SECONDS = 30
+""" The delay before the first retry of a failed job. The delay doubles after every attempt. """
+
+
+class Worker:
+    """
+    Claims due jobs from the jobs table one at a time, and runs them.
+    Jobs are claimed with FOR UPDATE SKIP LOCKED, so concurrent workers never run the same job.
+    """
+
+    def __init__(self):
+        """Creates a new instance of Worker."""
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.is_running = False
+        self.last_release = 0
+
+    def stop(self, *args):
+        """Stops the worker once its current job is finished."""
+        self.is_running = False
+
+    def run(self):
+        """Runs jobs until the worker is stopped."""
+        self.is_running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        with app.app_context():
+            schedule_recurring_jobs()
+            print(f"Worker {self.name} started.", flush=True)
+            while self.is_running:
+                if time.monotonic() - self.last_release >= JOB_RELEASE_INTERVAL:
+                    self.release_abandoned_jobs()
+                    self.last_release = time.monotonic()
+                if job := self.claim_job():
+                    self.run_job(job)
+                else:
+                    time.sleep(WORKER_POLL_INTERVAL)
+            print(f"Worker {self.name} stopped.", flush=True)
+
+    def claim_job(self):
+        """Locks the next due job, and marks it as running by this worker.
+
+        Returns:
+            Job: the claimed job, or None if no job is due.
+        """
+        job = (
+            Job.query.filter(
+                Job.status == JobStatus.PENDING, Job.run_at <= db.func.now()
+            )
+            .order_by(Job.run_at, Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job:
+            job.status = JobStatus.RUNNING
+            job.attempts += 1
+            job.locked_at = db.func.now()
+            job.locked_by = self.name
+        db.session.commit()
+        return job
+
+    def run_job(self, job):
+        """Runs a claimed job, and records its outcome. A failed job is retried with exponential
+        backoff, until it has been attempted max_attempts times.
+
+        Args:
+            job (Job): the job.
+        """
+        try:
+            handler = JOB_HANDLERS[job.name]
+            handler(**job.args)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Job {job.id} ({job.name}) failed: {e}", flush=True)
+            job.last_error = str(e)
+            if job.attempts < job.max_attempts:
+                delay = JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+                self.reschedule(job, delay)
+            elif job.interval_seconds:
+                # Recurring jobs are never given up on; they run again at their next interval.
+                self.reschedule(job, job.interval_seconds, reset_attempts=True)
+            else:
+                self.finish(job, JobStatus.FAILED)
+        else:
+            job.last_error = None
+            if job.interval_seconds:
+                self.reschedule(job, job.interval_seconds, reset_attempts=True)
+            else:
+                self.finish(job, JobStatus.SUCCEEDED)
+        db.session.commit()
+
+    def reschedule(self, job, delay, reset_attempts=False):
+        """Releases a job, to be run again after a delay.
+
+        Args:
+            job (Job): the job.
+            delay (int): the number of seconds after which the job is due.
+            reset_attempts (bool, optional): whether to reset the number of attempts. Defaults to False.
+        """
+        job.status = JobStatus.PENDING
+        job.run_at = db.func.now() + datetime.timedelta(seconds=delay)
+        job.locked_at = None
+        job.locked_by = None
+        if reset_attempts:
+            job.attempts = 0
+
+    def finish(self, job, status):
+        """Marks a job as finished.
+
+        Args:
+            job (Job): the job.
+            status (str): the final status of the job (SUCCEEDED or FAILED).
+        """
+        job.status = status
+        job.finished_at = db.func.now()
+        job.locked_at = None
+        job.locked_by = None
+
+    def release_abandoned_jobs(self):
+        """Makes the jobs that have been running for longer than JOB_LOCK_TIMEOUT due again,
+        since the worker that claimed them has most likely crashed."""
+        Job.query.filter(
+            Job.status == JobStatus.RUNNING,
+            Job.locked_at
+            <= db.func.now() - datetime.timedelta(seconds=JOB_LOCK_TIMEOUT),
+        ).update(
+            {"status": JobStatus.PENDING, "locked_at": None, "locked_by": None},
+            synchronize_session=False,
+        )
+        db.session.commit()
+
+
+if __name__ == "__main__":
+    Worker().run()